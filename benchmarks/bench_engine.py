@@ -0,0 +1,69 @@
+"""Engine throughput: moves, whole random games and listener overhead."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from tictactoe.domain import BitboardTicTacToe, GameState, TicTacToe
+
+ENGINES = {"list": TicTacToe, "bitboard": BitboardTicTacToe}
+RANDOM_GAMES = 100
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_make_move(benchmark, engine, draw_moves):
+    """Nine moves of a drawn game, then a reset."""
+
+    game = ENGINES[engine]()
+
+    def play():
+        game.reset()
+        for move in draw_moves:
+            game.make_move(move)
+
+    benchmark(play)
+    assert game.state == GameState.DRAW
+    benchmark.extra_info["moves_per_round"] = len(draw_moves)
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_random_games(benchmark, engine):
+    """Complete uniformly random games, choosing among the empty cells."""
+
+    game = ENGINES[engine]()
+    rng = random.Random(0)
+
+    def play():
+        for _ in range(RANDOM_GAMES):
+            game.reset()
+            while game.state == GameState.PLAYING:
+                empty = [cell for cell, mark in enumerate(game.board) if mark is None]
+                game.make_move(rng.choice(empty))
+
+    benchmark(play)
+    benchmark.extra_info["games_per_round"] = RANDOM_GAMES
+
+
+@pytest.mark.parametrize("listeners", [0, 1, 4])
+def test_snapshot_listeners(benchmark, listeners, draw_moves):
+    """A drawn game with listeners that read the pushed and current snapshot."""
+
+    game = TicTacToe()
+    seen = []
+
+    def reader(snapshot):
+        seen.append((snapshot.board, game.snapshot))
+
+    for _ in range(listeners):
+        game.add_listener(reader)
+
+    def play():
+        seen.clear()
+        game.reset()
+        for move in draw_moves:
+            game.make_move(move)
+
+    benchmark(play)
+    assert len(seen) == listeners * (len(draw_moves) + 1)
@@ -0,0 +1,58 @@
+"""Render cost of the GUI views, driven through the headless widget shim."""
+
+from __future__ import annotations
+
+from tictactoe.domain import TicTacToe
+from tictactoe.ui.gui import headless
+from tictactoe.ui.gui.headless_view import HeadlessGameView
+from tictactoe.ui.gui.view import GameView
+
+
+def _snapshots(moves):
+    game = TicTacToe()
+    snapshots = [game.snapshot]
+    for move in moves:
+        game.make_move(move)
+        snapshots.append(game.snapshot)
+    return snapshots
+
+
+def _view_kwargs(root=None):
+    return {
+        "ctk_module": headless,
+        "root": root,
+        "on_cell_click": lambda position: None,
+        "on_reset": lambda: None,
+    }
+
+
+def test_headless_view_render(benchmark, draw_moves):
+    """Render every position of a drawn game, then the empty board again."""
+
+    view = HeadlessGameView(**_view_kwargs())
+    view.build()
+    snapshots = _snapshots(draw_moves)
+
+    def render():
+        for snapshot in snapshots:
+            view.render(snapshot)
+        view.render(snapshots[0])
+
+    benchmark(render)
+    assert view.cell_text(0) == ""
+
+
+def test_game_view_render(benchmark, draw_moves):
+    """The same sequence through the CustomTkinter view on shim widgets."""
+
+    view = GameView(**_view_kwargs(headless.CTk()))
+    view.build()
+    snapshots = _snapshots(draw_moves)
+
+    def render():
+        for snapshot in snapshots:
+            view.render(snapshot)
+        view.render(snapshots[0])
+
+    benchmark(render)
+    assert view.cell_text(4) == ""
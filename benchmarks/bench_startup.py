@@ -0,0 +1,58 @@
+"""Cold start: a fresh CLI replaying one short script, and import budgets.
+
+The import budgets are wall-clock limits (``STARTUP_BUDGETS_MS``), so they
+live here rather than in the correctness suite, where a slow CI runner
+could fail them.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import tictactoe
+from tictactoe.__main__ import FRONTENDS
+from tictactoe.startup import profile_frontend
+
+_SRC_ROOT = str(Path(tictactoe.__file__).resolve().parent.parent)
+
+
+def _environment():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [_SRC_ROOT, env.get("PYTHONPATH")])
+    )
+    return env
+
+
+def _run(*args):
+    subprocess.run(
+        [sys.executable, "-m", "tictactoe", *args],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        env=_environment(),
+    )
+
+
+def test_cli_cold_start(benchmark):
+    benchmark.pedantic(
+        _run, args=("cli", "--script", "0,4,8", "--quiet"), rounds=15, warmup_rounds=2
+    )
+
+
+def test_list_frontends_cold_start(benchmark):
+    benchmark.pedantic(_run, args=("--list-frontends",), rounds=15, warmup_rounds=2)
+
+
+@pytest.mark.parametrize("frontend", ["list", *sorted(FRONTENDS)])
+def test_frontend_imports_within_budget(frontend):
+    profile = profile_frontend(frontend)
+    slowest = ", ".join(f"{name} {own}us" for name, own in profile.slowest(5))
+    assert profile.within_budget, (
+        f"{frontend} imports took {profile.total_ms:.1f} ms "
+        f"(budget {profile.budget_ms:.0f} ms); slowest: {slowest}"
+    )
@@ -0,0 +1,21 @@
+"""Shared fixtures for the performance suite.
+
+Everything here runs headless: the GUI benchmarks use the CustomTkinter shim,
+so no display or Tk runtime is needed.
+"""
+
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("TICTACTOE_HEADLESS", "1")
+
+import pytest
+
+# A full game that ends in a draw, so every move is legal and scanned for wins.
+DRAW = (4, 0, 2, 6, 3, 5, 1, 7, 8)
+
+
+@pytest.fixture
+def draw_moves():
+    return DRAW
@@ -7,12 +7,28 @@ import importlib
 import os
 import sys
 from dataclasses import dataclass, field
-from typing import Callable, Mapping, MutableMapping, Optional, Sequence, cast
-
-FrontendRunner = Callable[[], Optional[int]]
+from functools import partial
+from typing import (
+    Callable,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+FrontendRunner = Callable[..., Optional[int]]
 
 _FRONTEND_ENV_VAR = "TICTACTOE_UI"
+# Imported only when set, so uninstrumented runs never load the metrics module.
+_METRICS_ENV_VAR = "TICTACTOE_METRICS"
 _DEFAULT_FRONTEND = "gui"
+# Kept in sync with tictactoe.profiling.MODES, which is imported only when used.
+_PROFILE_MODES = ("cpu", "alloc")
+# Launcher options whose next argument is a value, never a frontend name.
+_VALUE_OPTIONS = ("--ui", "--frontend", "--profile-output")
 
 
 @dataclass(frozen=True)
@@ -22,6 +38,7 @@ class FrontendSpec:
     target: str
     description: str
     env_overrides: Mapping[str, str] = field(default_factory=dict)
+    accepts_args: bool = False
 
     def load(self) -> FrontendRunner:
         """Import and return the callable referenced by *target*."""
@@ -49,6 +66,32 @@ FRONTENDS: MutableMapping[str, FrontendSpec] = {
     "cli": FrontendSpec(
         target="tictactoe.ui.cli.main:main",
         description="Simple console interface",
+        accepts_args=True,
+    ),
+    "serve-cli": FrontendSpec(
+        target="tictactoe.ui.cli.daemon:main",
+        description="Resident daemon running CLI script jobs on warm engines",
+        accepts_args=True,
+    ),
+    "cli-client": FrontendSpec(
+        target="tictactoe.ui.cli.client:main",
+        description="Send CLI --script/--batch jobs to a serve-cli daemon",
+        accepts_args=True,
+    ),
+    "analyze": FrontendSpec(
+        target="tictactoe.analysis:main",
+        description="Grade recorded games against perfect play",
+        accepts_args=True,
+    ),
+    "server": FrontendSpec(
+        target="tictactoe.server:main",
+        description="asyncio TCP game server (line-delimited JSON)",
+        accepts_args=True,
+    ),
+    "tournament": FrontendSpec(
+        target="tictactoe.tournament:main",
+        description="Multi-process tournament between AI strategies",
+        accepts_args=True,
     ),
 }
 
@@ -58,7 +101,12 @@ def _build_parser() -> argparse.ArgumentParser:
         description=(
             "Launch the Tic Tac Toe template using the desired user interface "
             "(GUI, headless GUI, or CLI)."
-        )
+        ),
+        epilog=(
+            "A frontend name may also be given as the first argument "
+            "(e.g. 'tournament --games 50'); the remaining arguments are "
+            "passed to that frontend."
+        ),
     )
     parser.add_argument(
         "--ui",
@@ -75,19 +123,56 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="List the available frontends without launching the app.",
     )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cpu",
+        choices=_PROFILE_MODES,
+        help=(
+            "Run the frontend under cProfile (cpu, the default) or tracemalloc "
+            "(alloc) and write a report when it exits."
+        ),
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="PATH",
+        help="Where to write the profile (default: tictactoe.pstats or "
+        "tictactoe-alloc.txt).",
+    )
     return parser
 
 
 def _print_available_frontends() -> None:
     for name in sorted(FRONTENDS.keys()):
         spec = FRONTENDS[name]
-        print(f"{name:<9} - {spec.description}")
+        print(f"{name:<10} - {spec.description}")
 
 
 def _normalize_choice(raw_choice: str) -> str:
     return raw_choice.strip().lower()
 
 
+def _split_frontend(
+    arguments: Sequence[str],
+) -> Tuple[List[str], Optional[str], List[str]]:
+    """Split *arguments* at a frontend given by name rather than ``--ui``.
+
+    Returns the launcher options before the name, the name (``None`` if there
+    is none) and the arguments after it, which belong to the frontend.
+    """
+
+    for index, argument in enumerate(arguments):
+        previous = arguments[index - 1] if index else ""
+        if argument.startswith("-") or previous in _VALUE_OPTIONS:
+            continue
+        if previous == "--profile" and argument in _PROFILE_MODES:
+            continue
+        if _normalize_choice(argument) in FRONTENDS:
+            return list(arguments[:index]), argument, list(arguments[index + 1 :])
+        break
+    return list(arguments), None, []
+
+
 def _determine_frontend(cli_choice: Optional[str]) -> FrontendSpec:
     choice = cli_choice or os.environ.get(_FRONTEND_ENV_VAR) or _DEFAULT_FRONTEND
     normalized = _normalize_choice(choice)
@@ -108,16 +193,41 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     """Entry point for launching the requested frontend."""
 
     parser = _build_parser()
-    args = parser.parse_args(argv)
+    arguments = list(sys.argv[1:] if argv is None else argv)
+    launcher, name, forwarded = _split_frontend(arguments)
+    if name is not None:
+        args = parser.parse_args(launcher)
+        args.ui = name
+    else:
+        args, forwarded = parser.parse_known_args(arguments)
 
     if args.list_frontends:
         _print_available_frontends()
         return 0
 
     frontend = _determine_frontend(args.ui)
+    if forwarded and not frontend.accepts_args:
+        parser.error(f"unrecognized arguments: {' '.join(forwarded)}")
     _apply_env_overrides(frontend.env_overrides)
+    if os.environ.get(_METRICS_ENV_VAR):
+        from tictactoe import metrics
+
+        try:
+            metrics.configure_from_env()
+        except (OSError, ValueError) as exc:
+            raise SystemExit(f"{_METRICS_ENV_VAR}: {exc}") from exc
     runner = frontend.load()
-    result = runner()
+    call: Callable[[], Optional[int]]
+    if frontend.accepts_args:
+        call = partial(runner, forwarded)
+    else:
+        call = runner
+    if args.profile:
+        from tictactoe import profiling
+
+        result = profiling.run(call, args.profile, args.profile_output)
+    else:
+        result = call()
     return int(result) if isinstance(result, int) else 0
 
 
@@ -0,0 +1,50 @@
+"""Computer opponents that play over the domain engine.
+
+Exports are resolved on first access, so a frontend that only needs
+``ComputerPlayer`` does not pay for importing every search strategy.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:  # pragma: no cover - eager imports for type checkers only
+    from .mcts import MCTSResult, MCTSSearcher
+    from .negamax import NegamaxSearcher, SearchResult
+    from .player import ComputerPlayer, MoveStrategy, default_strategy
+    from .simple import GreedyStrategy, RandomStrategy
+    from .symmetry import Canonical, CanonicalCache, canonicalize
+    from .table import GameValue, PerfectPlayTable, load_default_table
+
+_EXPORTS = {
+    "MCTSSearcher": "mcts",
+    "MCTSResult": "mcts",
+    "NegamaxSearcher": "negamax",
+    "SearchResult": "negamax",
+    "ComputerPlayer": "player",
+    "MoveStrategy": "player",
+    "default_strategy": "player",
+    "RandomStrategy": "simple",
+    "GreedyStrategy": "simple",
+    "Canonical": "symmetry",
+    "CanonicalCache": "symmetry",
+    "canonicalize": "symmetry",
+    "GameValue": "table",
+    "PerfectPlayTable": "table",
+    "load_default_table": "table",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *_EXPORTS})
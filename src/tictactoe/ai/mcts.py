@@ -0,0 +1,234 @@
+"""Monte Carlo Tree Search (UCT) player for boards too large to solve."""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from tictactoe.domain.logic import GameState, Player, TicTacToe
+
+if TYPE_CHECKING:  # pragma: no cover - imports for annotations only
+    from concurrent.futures import Executor
+
+# Per-move statistics returned by a worker: move -> (visits, wins).
+MoveStats = Dict[int, Tuple[int, float]]
+
+
+@dataclass(frozen=True)
+class MCTSResult:
+    """Merged statistics for the root of one search."""
+
+    move: int
+    visits: Dict[int, int]
+    win_rate: float
+    iterations: int
+    elapsed: float
+    workers: int
+
+    @property
+    def iterations_per_second(self) -> float:
+        """Return search throughput across all workers."""
+
+        return self.iterations / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class _Node:
+    __slots__ = ("move", "parent", "player", "children", "untried", "visits", "wins")
+
+    def __init__(
+        self,
+        move: int,
+        parent: Optional["_Node"],
+        player: Optional[Player],
+        untried: List[int],
+    ) -> None:
+        self.move = move
+        self.parent = parent
+        # The player who made ``move``; wins are counted from their side.
+        self.player = player
+        self.children: List[_Node] = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+
+    def select_child(self, exploration: float) -> "_Node":
+        log_visits = math.log(self.visits)
+        return max(
+            self.children,
+            key=lambda child: child.wins / child.visits
+            + exploration * math.sqrt(log_visits / child.visits),
+        )
+
+
+def _empty_cells(game: TicTacToe) -> List[int]:
+    return [position for position, cell in enumerate(game.board) if cell is None]
+
+
+def _run_tree(
+    game: TicTacToe,
+    iterations: Optional[int],
+    time_budget: Optional[float],
+    exploration: float,
+    seed: Optional[int],
+) -> Tuple[MoveStats, int]:
+    """Grow one UCT tree from *game* and return root statistics.
+
+    Each iteration descends by UCT, expands one child and finishes the game
+    with uniformly random moves, all on a single private copy of *game* that
+    is rewound with ``undo_move`` afterwards.
+    """
+
+    rng = random.Random(seed)
+    root_moves = _empty_cells(game)
+    rng.shuffle(root_moves)
+    root = _Node(-1, None, None, root_moves)
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+
+    position = game.copy()
+    completed = 0
+    while iterations is None or completed < iterations:
+        if deadline is not None and completed and time.perf_counter() >= deadline:
+            break
+
+        played = 0
+        node = root
+        while not node.untried and node.children:
+            node = node.select_child(exploration)
+            position.make_move(node.move)
+            played += 1
+
+        if node.untried and position.state == GameState.PLAYING:
+            move = node.untried.pop()
+            mover = position.current_player
+            position.make_move(move)
+            played += 1
+            untried = _empty_cells(position)
+            rng.shuffle(untried)
+            child = _Node(move, node, mover, untried)
+            node.children.append(child)
+            node = child
+
+        empties = _empty_cells(position)
+        while position.state == GameState.PLAYING:
+            index = rng.randrange(len(empties))
+            empties[index], empties[-1] = empties[-1], empties[index]
+            position.make_move(empties.pop())
+            played += 1
+
+        winner = position.get_winner()
+        for _ in range(played):
+            position.undo_move()
+        walker: Optional[_Node] = node
+        while walker is not None:
+            walker.visits += 1
+            if winner is None:
+                walker.wins += 0.5
+            elif walker.player == winner:
+                walker.wins += 1.0
+            walker = walker.parent
+        completed += 1
+
+    stats = {child.move: (child.visits, child.wins) for child in root.children}
+    return stats, completed
+
+
+class MCTSSearcher:
+    """UCT searcher with an iteration or wall-clock budget.
+
+    With ``workers > 1`` the search uses root parallelization: every worker
+    process grows an independent tree from the same root (seeded
+    ``seed + worker``) and the per-move visit counts are summed before the most
+    visited move is chosen.
+
+    Args:
+        iterations: Playouts per worker (defaults to 1,000 when no time budget).
+        time_budget: Seconds each worker may search.
+        exploration: UCT exploration constant.
+        seed: Base seed for reproducible searches.
+        workers: Number of independent trees to grow in parallel.
+        executor: Executor to reuse for parallel searches; by default a
+            ``ProcessPoolExecutor`` is created per search.
+    """
+
+    def __init__(
+        self,
+        *,
+        iterations: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        exploration: float = math.sqrt(2),
+        seed: Optional[int] = None,
+        workers: int = 1,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+        if iterations is None and time_budget is None:
+            iterations = 1_000
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.seed = seed
+        self.workers = workers
+        self.executor = executor
+
+    def choose_move(self, game: TicTacToe) -> int:
+        """Return the most visited move for the player to move in *game*."""
+
+        return self.search(game).move
+
+    def search(self, game: TicTacToe) -> MCTSResult:
+        """Run the configured searches and merge their root statistics."""
+
+        if game.state != GameState.PLAYING:
+            raise ValueError("Cannot search a finished game.")
+
+        started = time.perf_counter()
+        root = game.copy()
+        seeds = [
+            None if self.seed is None else self.seed + worker
+            for worker in range(self.workers)
+        ]
+        args = (self.iterations, self.time_budget, self.exploration)
+
+        if self.workers == 1:
+            outcomes = [_run_tree(root, *args, seeds[0])]
+        elif self.executor is not None:
+            outcomes = self._run_parallel(self.executor, root, args, seeds)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                outcomes = self._run_parallel(executor, root, args, seeds)
+
+        visits: Dict[int, int] = {}
+        wins: Dict[int, float] = {}
+        iterations = 0
+        for stats, completed in outcomes:
+            iterations += completed
+            for move, (move_visits, move_wins) in stats.items():
+                visits[move] = visits.get(move, 0) + move_visits
+                wins[move] = wins.get(move, 0.0) + move_wins
+
+        # Ties go to the lowest cell index so merged results are deterministic.
+        best = min(visits, key=lambda move: (-visits[move], move))
+        return MCTSResult(
+            move=best,
+            visits=visits,
+            win_rate=wins[best] / visits[best],
+            iterations=iterations,
+            elapsed=time.perf_counter() - started,
+            workers=self.workers,
+        )
+
+    @staticmethod
+    def _run_parallel(
+        executor: Executor,
+        root: TicTacToe,
+        args: Tuple[Optional[int], Optional[float], float],
+        seeds: List[Optional[int]],
+    ) -> List[Tuple[MoveStats, int]]:
+        futures = [executor.submit(_run_tree, root, *args, seed) for seed in seeds]
+        return [future.result() for future in futures]
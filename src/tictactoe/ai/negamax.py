@@ -0,0 +1,453 @@
+"""Negamax search with alpha-beta pruning and a transposition table."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from tictactoe.ai.symmetry import inverse_transforms, transforms
+from tictactoe.ai.zobrist import zobrist_keys
+from tictactoe.domain.logic import GameState, LineIndex, Player, TicTacToe, line_index
+
+WIN_SCORE = 1_000_000_000
+# Scores beyond the threshold are forced wins; the gap leaves room for the
+# distance-to-win adjustment and keeps heuristic scores well below it.
+_WIN_THRESHOLD = WIN_SCORE - 1_000_000
+_INFINITY = WIN_SCORE + 1
+
+_EXACT = 0
+_LOWER = 1
+_UPPER = 2
+
+# Heuristic weight of an open line holding ``n`` marks of a single player.
+_LINE_WEIGHT_BASE = 8
+
+# Boards larger than this only consider cells near existing marks.
+_FULL_WIDTH_MAX_SIZE = 4
+
+_BUDGET_CHECK_INTERVAL = 256
+
+TableEntry = Tuple[int, int, int, int]
+
+
+class _RootResult(NamedTuple):
+    move: int
+    score: int
+    depth: int
+    complete: bool
+
+
+class _BudgetExceeded(Exception):
+    """Raised internally to unwind the search when the budget runs out."""
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    """Outcome of a search from the perspective of the player to move."""
+
+    move: int
+    score: int
+    depth: int
+    nodes: int
+    elapsed: float
+    complete: bool
+
+    @property
+    def is_win(self) -> bool:
+        """Return True when the player to move can force a win."""
+
+        return self.score >= _WIN_THRESHOLD
+
+    @property
+    def is_loss(self) -> bool:
+        """Return True when the opponent can force a win."""
+
+        return self.score <= -_WIN_THRESHOLD
+
+
+@lru_cache(maxsize=None)
+def move_order(size: int, win_length: int) -> Tuple[int, ...]:
+    """Return cells sorted by how promising they are to play.
+
+    Cells on more winning lines come first (centre, then corners on 3x3), and
+    ties are broken by distance to the centre of the board.
+    """
+
+    index = line_index(size, win_length)
+    centre = (size - 1) / 2
+
+    def priority(cell: int) -> Tuple[int, float, int]:
+        row, column = divmod(cell, size)
+        distance = (row - centre) ** 2 + (column - centre) ** 2
+        return (-len(index.cell_lines[cell]), distance, cell)
+
+    return tuple(sorted(range(index.cell_count), key=priority))
+
+
+@lru_cache(maxsize=None)
+def _neighbours(size: int, radius: int) -> Tuple[Tuple[int, ...], ...]:
+    result = []
+    for cell in range(size * size):
+        row, column = divmod(cell, size)
+        result.append(
+            tuple(
+                other_row * size + other_column
+                for other_row in range(
+                    max(0, row - radius), min(size, row + radius + 1)
+                )
+                for other_column in range(
+                    max(0, column - radius), min(size, column + radius + 1)
+                )
+                if (other_row, other_column) != (row, column)
+            )
+        )
+    return tuple(result)
+
+
+class NegamaxSearcher:
+    """Alpha-beta negamax searcher over :class:`TicTacToe` positions.
+
+    The searcher copies the position into flat integer arrays and plays moves
+    in place, maintaining the same per-line counters as the engine plus an
+    incremental Zobrist hash and heuristic score. Results are stored in a
+    transposition table that persists between calls, so consecutive moves of
+    the same game reuse earlier work.
+
+    With *symmetry* enabled the searcher tracks the hash of all eight
+    rotations/reflections of the board and files each position under the
+    smallest one, so symmetric positions share a single table entry (best
+    moves are stored in that canonical orientation and mapped back on probe).
+
+    Args:
+        max_depth: Maximum search depth in plies (``None`` searches to the
+            end; ``0`` returns the first candidate move unsearched).
+        node_budget: Stop after visiting roughly this many nodes.
+        time_budget: Stop after roughly this many seconds.
+        max_table_entries: Transposition table size before it is cleared.
+        radius: On boards larger than 4x4, only cells within this Chebyshev
+            distance of an existing mark are searched.
+        symmetry: Share table entries between symmetric positions.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_depth: Optional[int] = None,
+        node_budget: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        max_table_entries: int = 1_000_000,
+        radius: int = 2,
+        symmetry: bool = True,
+    ) -> None:
+        if max_depth is not None and max_depth < 0:
+            raise ValueError("max_depth must not be negative.")
+        self.max_depth = max_depth
+        self.node_budget = node_budget
+        self.time_budget = time_budget
+        self.max_table_entries = max_table_entries
+        self.radius = radius
+        self.symmetry = symmetry
+
+        self._table: Dict[int, TableEntry] = {}
+        self._config: Optional[Tuple[int, int]] = None
+        self._nodes = 0
+        self._deadline: Optional[float] = None
+        self._node_limit: Optional[int] = None
+
+        self._index: LineIndex = line_index()
+        self._board: List[int] = []
+        self._counts: Tuple[List[int], List[int]] = ([], [])
+        self._near: List[int] = []
+        self._keys: Tuple[Tuple[Tuple[int, int], ...], ...] = ()
+        self._transforms: Tuple[Tuple[int, ...], ...] = ()
+        self._inverses: Tuple[Tuple[int, ...], ...] = ()
+        self._order: Tuple[int, ...] = ()
+        self._neighbour_cells: Tuple[Tuple[int, ...], ...] = ()
+        self._weights: Tuple[int, ...] = ()
+        self._restrict = False
+        self._hashes: List[int] = []
+        self._score = 0
+        self._empty = 0
+        self._side = 0
+
+    @property
+    def table_size(self) -> int:
+        """Return the number of positions stored in the transposition table."""
+
+        return len(self._table)
+
+    def clear(self) -> None:
+        """Drop every cached position."""
+
+        self._table.clear()
+
+    def choose_move(self, game: TicTacToe) -> int:
+        """Return the best move for the player to move in *game*."""
+
+        return self.search(game).move
+
+    def search(self, game: TicTacToe) -> SearchResult:
+        """Search *game* by iterative deepening within the configured budget."""
+
+        if game.state != GameState.PLAYING:
+            raise ValueError("Cannot search a finished game.")
+
+        started = time.perf_counter()
+        self._load(game)
+        self._nodes = 0
+        self._deadline = (
+            started + self.time_budget if self.time_budget is not None else None
+        )
+        self._node_limit = self.node_budget
+
+        full_depth = self._empty
+        max_depth = full_depth if self.max_depth is None else self.max_depth
+        max_depth = min(max_depth, full_depth)
+        best = _RootResult(self._candidate_moves(-1)[0], 0, 0, False)
+        for depth in range(1, max_depth + 1):
+            try:
+                best = self._search_root(depth)
+            except _BudgetExceeded:
+                break
+            exhaustive = depth == full_depth and not self._restrict
+            if abs(best.score) >= _WIN_THRESHOLD or exhaustive:
+                best = best._replace(complete=True)
+                break
+
+        return SearchResult(
+            move=best.move,
+            score=best.score,
+            depth=best.depth,
+            nodes=self._nodes,
+            elapsed=time.perf_counter() - started,
+            complete=best.complete,
+        )
+
+    # ------------------------------------------------------------------
+    # Position bookkeeping
+    # ------------------------------------------------------------------
+    def _load(self, game: TicTacToe) -> None:
+        config = (game.size, game.win_length)
+        if config != self._config:
+            self._config = config
+            self._table.clear()
+            self._index = line_index(*config)
+            keys = zobrist_keys(self._index.cell_count)
+            count = 8 if self.symmetry else 1
+            self._transforms = transforms(game.size)[:count]
+            self._inverses = inverse_transforms(game.size)[:count]
+            # _keys[t][cell] hashes a mark on *cell* as seen through transform t.
+            self._keys = tuple(
+                tuple(keys[target] for target in permutation)
+                for permutation in self._transforms
+            )
+            self._order = move_order(*config)
+            self._neighbour_cells = _neighbours(game.size, self.radius)
+            self._weights = tuple(
+                _LINE_WEIGHT_BASE**count for count in range(game.win_length + 1)
+            )
+            self._restrict = game.size > _FULL_WIDTH_MAX_SIZE
+
+        line_count = len(self._index.lines)
+        self._board = [0] * self._index.cell_count
+        self._counts = ([0] * line_count, [0] * line_count)
+        self._near = [0] * self._index.cell_count
+        self._hashes = [0] * len(self._keys)
+        self._score = 0
+        self._empty = self._index.cell_count
+        for position, cell in enumerate(game.board):
+            if cell is not None:
+                self._side = 0 if cell is Player.X else 1
+                self._play(position)
+        self._side = 0 if game.current_player is Player.X else 1
+
+    def _line_value(self, mine: int, theirs: int) -> int:
+        if theirs == 0:
+            return self._weights[mine]
+        if mine == 0:
+            return -self._weights[theirs]
+        return 0
+
+    def _play(self, position: int) -> bool:
+        """Place the side-to-move's mark and return True if it wins."""
+
+        side = self._side
+        mine = self._counts[side]
+        theirs = self._counts[1 - side]
+        win_length = self._index.win_length
+        # ``_score`` is kept from X's point of view.
+        sign = 1 if side == 0 else -1
+        won = False
+        for line in self._index.cell_lines[position]:
+            before = self._line_value(mine[line], theirs[line])
+            mine[line] += 1
+            if mine[line] == win_length:
+                won = True
+            self._score += sign * (self._line_value(mine[line], theirs[line]) - before)
+        self._board[position] = side + 1
+        hashes = self._hashes
+        for transform, keys in enumerate(self._keys):
+            hashes[transform] ^= keys[position][side]
+        self._empty -= 1
+        for neighbour in self._neighbour_cells[position]:
+            self._near[neighbour] += 1
+        self._side = 1 - side
+        return won
+
+    def _unplay(self, position: int) -> None:
+        side = 1 - self._side
+        mine = self._counts[side]
+        theirs = self._counts[1 - side]
+        sign = 1 if side == 0 else -1
+        for line in self._index.cell_lines[position]:
+            before = self._line_value(mine[line], theirs[line])
+            mine[line] -= 1
+            self._score += sign * (self._line_value(mine[line], theirs[line]) - before)
+        self._board[position] = 0
+        hashes = self._hashes
+        for transform, keys in enumerate(self._keys):
+            hashes[transform] ^= keys[position][side]
+        self._empty += 1
+        for neighbour in self._neighbour_cells[position]:
+            self._near[neighbour] -= 1
+        self._side = side
+
+    def _candidate_moves(self, first: int) -> List[int]:
+        board = self._board
+        if self._restrict and self._empty < len(board):
+            near = self._near
+            moves = [cell for cell in self._order if not board[cell] and near[cell]]
+        else:
+            moves = [cell for cell in self._order if not board[cell]]
+        if first >= 0 and first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+    def _search_root(self, depth: int) -> _RootResult:
+        alpha = -_INFINITY
+        beta = _INFINITY
+        key, transform = self._table_key()
+        entry = self._table.get(key)
+        moves = self._candidate_moves(self._from_canonical(entry, transform))
+        best_move = moves[0]
+        best_score = -_INFINITY
+        for move in moves:
+            score = self._score_move(move, depth, -beta, -alpha, 0)
+            if score > best_score:
+                best_score = score
+                best_move = move
+            alpha = max(alpha, best_score)
+        self._store(depth, best_score, _EXACT, best_move, 0)
+        return _RootResult(best_move, best_score, depth, False)
+
+    def _score_move(
+        self, move: int, depth: int, child_alpha: int, child_beta: int, ply: int
+    ) -> int:
+        """Play *move*, score it for the mover and take it back.
+
+        *child_alpha*/*child_beta* are the window for the reply position.
+        """
+
+        if self._play(move):
+            score = WIN_SCORE - ply - 1
+        elif self._empty == 0:
+            score = 0
+        else:
+            score = -self._negamax(depth - 1, child_alpha, child_beta, ply + 1)
+        self._unplay(move)
+        return score
+
+    def _negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self._nodes += 1
+        if self._nodes % _BUDGET_CHECK_INTERVAL == 0:
+            self._check_budget()
+
+        original_alpha = alpha
+        key, transform = self._table_key()
+        entry = self._table.get(key)
+        table_move = self._from_canonical(entry, transform)
+        if entry is not None:
+            entry_depth, entry_score, entry_flag, _ = entry
+            if entry_depth >= depth:
+                score = self._from_table(entry_score, ply)
+                if entry_flag == _EXACT:
+                    return score
+                if entry_flag == _LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        if depth == 0:
+            return self._score if self._side == 0 else -self._score
+
+        best_score = -_INFINITY
+        best_move = -1
+        for move in self._candidate_moves(table_move):
+            score = self._score_move(move, depth, -beta, -alpha, ply)
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if best_score <= original_alpha:
+            flag = _UPPER
+        elif best_score >= beta:
+            flag = _LOWER
+        else:
+            flag = _EXACT
+        self._store(depth, best_score, flag, best_move, ply)
+        return best_score
+
+    def _store(self, depth: int, score: int, flag: int, move: int, ply: int) -> None:
+        if len(self._table) >= self.max_table_entries:
+            self._table.clear()
+        key, transform = self._table_key()
+        canonical_move = self._transforms[transform][move] if move >= 0 else move
+        self._table[key] = (depth, self._to_table(score, ply), flag, canonical_move)
+
+    def _table_key(self) -> Tuple[int, int]:
+        """Return the canonical hash and the transform that produces it."""
+
+        hashes = self._hashes
+        key = min(hashes)
+        return key, hashes.index(key)
+
+    def _from_canonical(self, entry: Optional[TableEntry], transform: int) -> int:
+        if entry is None or entry[3] < 0:
+            return -1
+        return self._inverses[transform][entry[3]]
+
+    @staticmethod
+    def _to_table(score: int, ply: int) -> int:
+        # Win scores encode the distance from the root; store them relative to
+        # the node instead so the entry stays valid at any ply.
+        if score >= _WIN_THRESHOLD:
+            return score + ply
+        if score <= -_WIN_THRESHOLD:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _from_table(score: int, ply: int) -> int:
+        if score >= _WIN_THRESHOLD:
+            return score - ply
+        if score <= -_WIN_THRESHOLD:
+            return score + ply
+        return score
+
+    def _check_budget(self) -> None:
+        if self._node_limit is not None and self._nodes >= self._node_limit:
+            raise _BudgetExceeded
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise _BudgetExceeded
@@ -0,0 +1,57 @@
+"""Glue for seating a move strategy at the board as X or O."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Protocol
+
+from tictactoe.ai.negamax import NegamaxSearcher
+from tictactoe.ai.table import load_default_table
+from tictactoe.domain.logic import GameState, Player, TicTacToe
+
+
+class MoveStrategy(Protocol):
+    """Anything that can pick a legal move for the player to move."""
+
+    def choose_move(self, game: TicTacToe) -> int: ...
+
+
+@dataclass(frozen=True)
+class ComputerPlayer:
+    """A strategy playing one side of the board."""
+
+    player: Player
+    strategy: MoveStrategy
+
+    def wants_move(self, game: TicTacToe) -> bool:
+        """Return True when it is this player's turn in a running game."""
+
+        return game.state == GameState.PLAYING and game.current_player == self.player
+
+    def play(self, game: TicTacToe) -> int:
+        """Choose and play a move, returning the chosen position."""
+
+        position = self.strategy.choose_move(game)
+        if not game.make_move(position):
+            raise RuntimeError(f"Strategy chose illegal move {position}.")
+        return position
+
+
+def default_strategy(
+    size: int = 3,
+    win_length: Optional[int] = None,
+    *,
+    max_depth: Optional[int] = None,
+    time_budget: Optional[float] = None,
+) -> MoveStrategy:
+    """Return the strongest cheap strategy for a board configuration.
+
+    Full-strength 3x3 play is answered from the bundled perfect-play table when
+    it is available; everything else falls back to a budgeted negamax search.
+    """
+
+    if size == 3 and win_length in (None, 3) and max_depth is None:
+        table = load_default_table()
+        if table is not None:
+            return table
+    return NegamaxSearcher(max_depth=max_depth, time_budget=time_budget)
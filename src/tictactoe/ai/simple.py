@@ -0,0 +1,75 @@
+"""Lightweight baseline strategies for tournaments and testing."""
+
+from __future__ import annotations
+
+import random
+from typing import List, Optional
+
+from tictactoe.ai.negamax import move_order
+from tictactoe.domain.logic import (
+    BoardTuple,
+    GameState,
+    Player,
+    TicTacToe,
+    line_index,
+)
+
+
+def _empty_cells(game: TicTacToe) -> List[int]:
+    return [position for position, cell in enumerate(game.board) if cell is None]
+
+
+class RandomStrategy:
+    """Play a uniformly random empty cell."""
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self._rng = random.Random(seed)
+
+    def choose_move(self, game: TicTacToe) -> int:
+        if game.state != GameState.PLAYING:
+            raise ValueError("Cannot choose a move in a finished game.")
+        return self._rng.choice(_empty_cells(game))
+
+
+class GreedyStrategy:
+    """Win if possible, otherwise block, otherwise take the best-placed cell.
+
+    Only one ply is considered, so forks are neither played nor prevented.
+    """
+
+    def choose_move(self, game: TicTacToe) -> int:
+        if game.state != GameState.PLAYING:
+            raise ValueError("Cannot choose a move in a finished game.")
+        board = game.board
+        me = game.current_player
+        opponent = Player.O if me == Player.X else Player.X
+        for player in (me, opponent):
+            position = _completing_cell(game, board, player)
+            if position is not None:
+                return position
+        for position in move_order(game.size, game.win_length):
+            if board[position] is None:
+                return position
+        raise ValueError("No empty cells left.")  # pragma: no cover - PLAYING
+
+
+def _completing_cell(
+    game: TicTacToe, board: BoardTuple, player: Player
+) -> Optional[int]:
+    """Return an empty cell that gives *player* a full line, if any."""
+
+    index = line_index(game.size, game.win_length)
+    for line in index.lines:
+        empty = None
+        for position in line:
+            cell = board[position]
+            if cell is None:
+                if empty is not None:
+                    break
+                empty = position
+            elif cell != player:
+                break
+        else:
+            if empty is not None:
+                return empty
+    return None
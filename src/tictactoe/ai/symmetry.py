@@ -0,0 +1,212 @@
+"""Board symmetries (the dihedral group D4) and a canonical-position cache."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from math import isqrt
+from typing import Callable, Generic, Optional, Tuple, TypeVar
+
+from tictactoe.domain.logic import BoardTuple, Player
+
+Permutation = Tuple[int, ...]
+
+IDENTITY = 0
+TRANSFORM_NAMES: Tuple[str, ...] = (
+    "identity",
+    "rotate 90",
+    "rotate 180",
+    "rotate 270",
+    "mirror left-right",
+    "mirror top-bottom",
+    "transpose",
+    "anti-transpose",
+)
+
+_CELL_CODES = {None: 0, Player.X: 1, Player.O: 2}
+
+V = TypeVar("V")
+
+
+@lru_cache(maxsize=None)
+def transforms(size: int) -> Tuple[Permutation, ...]:
+    """Return the eight D4 permutations for a ``size`` x ``size`` board.
+
+    ``transforms(size)[t][cell]`` is where *cell* lands under transform ``t``;
+    the order matches :data:`TRANSFORM_NAMES`.
+    """
+
+    last = size - 1
+    mappings: Tuple[Callable[[int, int], Tuple[int, int]], ...] = (
+        lambda row, column: (row, column),
+        lambda row, column: (column, last - row),
+        lambda row, column: (last - row, last - column),
+        lambda row, column: (last - column, row),
+        lambda row, column: (row, last - column),
+        lambda row, column: (last - row, column),
+        lambda row, column: (column, row),
+        lambda row, column: (last - column, last - row),
+    )
+    permutations = []
+    for mapping in mappings:
+        permutation = []
+        for cell in range(size * size):
+            row, column = mapping(*divmod(cell, size))
+            permutation.append(row * size + column)
+        permutations.append(tuple(permutation))
+    return tuple(permutations)
+
+
+@lru_cache(maxsize=None)
+def inverse_transforms(size: int) -> Tuple[Permutation, ...]:
+    """Return the inverse of every permutation in :func:`transforms`."""
+
+    inverses = []
+    for permutation in transforms(size):
+        inverse = [0] * len(permutation)
+        for cell, target in enumerate(permutation):
+            inverse[target] = cell
+        inverses.append(tuple(inverse))
+    return tuple(inverses)
+
+
+def apply_transform(board: BoardTuple, transform: int) -> BoardTuple:
+    """Return *board* with every mark moved by *transform*."""
+
+    permutation = transforms(isqrt(len(board)))[transform]
+    result: list = [None] * len(board)
+    for cell, value in enumerate(board):
+        result[permutation[cell]] = value
+    return tuple(result)
+
+
+def board_key(board: BoardTuple) -> int:
+    """Encode *board* as a base-3 integer (empty=0, X=1, O=2, cell 0 lowest)."""
+
+    key = 0
+    for cell in reversed(board):
+        key = key * 3 + _CELL_CODES[cell]
+    return key
+
+
+@dataclass(frozen=True)
+class Canonical:
+    """Minimal representative of a board's symmetry class."""
+
+    board: BoardTuple
+    key: int
+    transform: int
+
+    def to_canonical(self, position: int) -> int:
+        """Map a cell of the original board onto the canonical board."""
+
+        return transforms(isqrt(len(self.board)))[self.transform][position]
+
+    def from_canonical(self, position: int) -> int:
+        """Map a cell of the canonical board back onto the original board."""
+
+        return inverse_transforms(isqrt(len(self.board)))[self.transform][position]
+
+
+def canonicalize(board: BoardTuple) -> Canonical:
+    """Return the symmetric variant of *board* with the smallest base-3 key.
+
+    The returned transform maps the original board onto the canonical one, so
+    data stored for the canonical position (best moves, evaluations) can be
+    translated back with :meth:`Canonical.from_canonical`.
+    """
+
+    size = isqrt(len(board))
+    codes = [_CELL_CODES[cell] for cell in board]
+    best_key = -1
+    best_transform = IDENTITY
+    for transform, permutation in enumerate(transforms(size)):
+        moved = [0] * len(codes)
+        for cell, code in enumerate(codes):
+            moved[permutation[cell]] = code
+        key = 0
+        for code in reversed(moved):
+            key = key * 3 + code
+        if best_key < 0 or key < best_key:
+            best_key = key
+            best_transform = transform
+    return Canonical(
+        board=apply_transform(board, best_transform),
+        key=best_key,
+        transform=best_transform,
+    )
+
+
+class CanonicalCache(Generic[V]):
+    """Size-bounded LRU mapping from canonical positions to values.
+
+    All eight symmetric variants of a position share one entry, so callers
+    should store symmetry-invariant values (game values, scores) or values
+    expressed in canonical coordinates (see :class:`Canonical`).
+    """
+
+    def __init__(self, maxsize: int = 100_000) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Tuple[int, int], V] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, board: object) -> bool:
+        return isinstance(board, tuple) and self._key(board) in self._entries
+
+    def get(self, board: BoardTuple, default: Optional[V] = None) -> Optional[V]:
+        """Return the value stored for *board* or any of its symmetries."""
+
+        key = self._key(board)
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, board: BoardTuple, value: V) -> None:
+        """Store *value* for the symmetry class of *board*."""
+
+        key = self._key(board)
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get_or_compute(self, board: BoardTuple, compute: Callable[[Canonical], V]) -> V:
+        """Return the cached value or compute it from the canonical position."""
+
+        canonical = canonicalize(board)
+        key = (len(board), canonical.key)
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = compute(canonical)
+            self._entries[key] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return value
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(board: BoardTuple) -> Tuple[int, int]:
+        return (len(board), canonicalize(board).key)
@@ -0,0 +1,276 @@
+"""Precomputed perfect-play table for the classic 3x3 board.
+
+Every position is addressed by its base-3 key (see
+:func:`tictactoe.ai.symmetry.board_key`), so the table is a flat array of
+``3**9`` little-endian ``uint16`` entries behind a small header::
+
+    bits 0-8   mask of best moves
+    bits 9-10  game value for the side to move (0 = not a reachable position,
+               1 = loss, 2 = draw, 3 = win)
+    bits 11-14 plies until the game ends under perfect play
+
+The side to move is derived from the mark count (X moves when counts are
+equal), so a finished game is scored for the player who would move next.
+
+Build the asset with ``python -m tictactoe.ai.table``; at runtime the file is
+memory-mapped and each lookup is a single unpack at a computed offset.
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import struct
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from tictactoe.ai.negamax import move_order
+from tictactoe.ai.symmetry import board_key
+from tictactoe.domain.logic import WIN_LINES, BoardTuple, GameState, TicTacToe
+from tictactoe.resources import ASSETS_DIR, locate_asset
+
+ASSET_NAME = "perfect_play.bin"
+
+_MAGIC = b"TTTP"
+_VERSION = 1
+_SIZE = 3
+_CELLS = _SIZE * _SIZE
+_ENTRY_COUNT = 3**_CELLS
+# magic, format version, board size, reserved, entry count
+_HEADER = struct.Struct("<4sBBHI")
+_ENTRY = struct.Struct("<H")
+
+_MOVE_BITS = (1 << _CELLS) - 1
+_VALUE_SHIFT = 9
+_DISTANCE_SHIFT = 11
+# Scores are ``_MAX_SCORE - distance`` for wins and the negation for losses.
+_MAX_SCORE = _CELLS + 1
+
+
+class GameValue(IntEnum):
+    """Game-theoretic value of a position for the side to move."""
+
+    LOSS = -1
+    DRAW = 0
+    WIN = 1
+
+
+# Value code stored in an entry -> game value (code 0 marks unreachable boards).
+_VALUES: Tuple[Optional[GameValue], ...] = (
+    None,
+    GameValue.LOSS,
+    GameValue.DRAW,
+    GameValue.WIN,
+)
+
+
+@dataclass(frozen=True)
+class SolvedPosition:
+    """Table entry decoded for one position."""
+
+    value: GameValue
+    distance: int
+    best_moves: Tuple[int, ...]
+
+
+class TableFormatError(ValueError):
+    """Raised when a table file is missing, truncated or of another version."""
+
+
+def _winner(codes: Sequence[int]) -> int:
+    for a, b, c in WIN_LINES:
+        if codes[a] and codes[a] == codes[b] == codes[c]:
+            return codes[a]
+    return 0
+
+
+def _solve(codes: List[int], scores: Dict[int, int], moves: Dict[int, int]) -> int:
+    """Return the negamax score of *codes* and record every reachable child."""
+
+    key = 0
+    for code in reversed(codes):
+        key = key * 3 + code
+    if key in scores:
+        return scores[key]
+
+    filled = sum(1 for code in codes if code)
+    if _winner(codes):
+        # The previous move won, so the side to move has lost.
+        score = -_MAX_SCORE
+    elif filled == _CELLS:
+        score = 0
+    else:
+        side = 1 if filled % 2 == 0 else 2
+        child_scores = {}
+        for position in range(_CELLS):
+            if codes[position]:
+                continue
+            codes[position] = side
+            child = -_solve(codes, scores, moves)
+            codes[position] = 0
+            # Every ply moves a decided result one step closer to zero.
+            if child > 0:
+                child -= 1
+            elif child < 0:
+                child += 1
+            child_scores[position] = child
+        score = max(child_scores.values())
+        moves[key] = sum(
+            1 << position for position, child in child_scores.items() if child == score
+        )
+
+    scores[key] = score
+    return score
+
+
+def build_table() -> bytes:
+    """Solve every reachable 3x3 position and return the encoded table."""
+
+    scores: Dict[int, int] = {}
+    moves: Dict[int, int] = {}
+    _solve([0] * _CELLS, scores, moves)
+
+    entries = [0] * _ENTRY_COUNT
+    for key, score in scores.items():
+        if score > 0:
+            value, distance = GameValue.WIN, _MAX_SCORE - score
+        elif score < 0:
+            value, distance = GameValue.LOSS, _MAX_SCORE + score
+        else:
+            value, distance = GameValue.DRAW, 0
+        entries[key] = (
+            moves.get(key, 0)
+            | (value + 2) << _VALUE_SHIFT
+            | distance << _DISTANCE_SHIFT
+        )
+
+    header = _HEADER.pack(_MAGIC, _VERSION, _SIZE, 0, _ENTRY_COUNT)
+    return header + struct.pack(f"<{_ENTRY_COUNT}H", *entries)
+
+
+def write_table(path: Path) -> int:
+    """Write the encoded table to *path* and return its size in bytes."""
+
+    data = build_table()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return len(data)
+
+
+class PerfectPlayTable:
+    """Memory-mapped view over a table produced by :func:`build_table`.
+
+    The table doubles as a move strategy (``choose_move``) for 3x3 games.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as handle:
+            try:
+                self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:  # empty file
+                raise TableFormatError(f"{path} is empty") from exc
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise TableFormatError(f"{path} is too small to be a table")
+        magic, version, size, _, count = _HEADER.unpack_from(self._map, 0)
+        expected_length = _HEADER.size + count * _ENTRY.size
+        if (
+            magic != _MAGIC
+            or version != _VERSION
+            or size != _SIZE
+            or count != _ENTRY_COUNT
+            or len(self._map) != expected_length
+        ):
+            self.close()
+            raise TableFormatError(f"{path} is not a version {_VERSION} table")
+
+    def close(self) -> None:
+        """Release the memory map."""
+
+        self._map.close()
+
+    def __enter__(self) -> "PerfectPlayTable":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def lookup(self, board: BoardTuple) -> Optional[SolvedPosition]:
+        """Return the solved entry for *board*, or None if it is unreachable."""
+
+        if len(board) != _CELLS:
+            raise ValueError("The perfect-play table only covers 3x3 boards.")
+        offset = _HEADER.size + board_key(board) * _ENTRY.size
+        (entry,) = _ENTRY.unpack_from(self._map, offset)
+        value_code = entry >> _VALUE_SHIFT & 0b11
+        if not value_code:
+            return None
+        mask = entry & _MOVE_BITS
+        return SolvedPosition(
+            value=GameValue(value_code - 2),
+            distance=entry >> _DISTANCE_SHIFT & 0b1111,
+            best_moves=tuple(
+                position for position in range(_CELLS) if mask >> position & 1
+            ),
+        )
+
+    def value(self, board: BoardTuple) -> Optional[GameValue]:
+        """Return only the game value of *board* (cheaper than :meth:`lookup`)."""
+
+        if len(board) != _CELLS:
+            raise ValueError("The perfect-play table only covers 3x3 boards.")
+        offset = _HEADER.size + board_key(board) * _ENTRY.size
+        entry: int = _ENTRY.unpack_from(self._map, offset)[0]
+        return _VALUES[entry >> _VALUE_SHIFT & 0b11]
+
+    def choose_move(self, game: TicTacToe) -> int:
+        """Return a best move, preferring the centre and corners on ties."""
+
+        if game.state != GameState.PLAYING:
+            raise ValueError("Cannot choose a move in a finished game.")
+        solved = self.lookup(game.board)
+        if solved is None or not solved.best_moves:
+            raise ValueError("Position is not covered by the perfect-play table.")
+        for position in move_order(_SIZE, _SIZE):
+            if position in solved.best_moves:
+                return position
+        return solved.best_moves[0]  # pragma: no cover - move_order covers all
+
+
+@lru_cache(maxsize=None)
+def load_default_table() -> Optional[PerfectPlayTable]:
+    """Map the bundled table once per process, or return None if absent."""
+
+    path = locate_asset(ASSET_NAME)
+    if path is None:
+        return None
+    try:
+        return PerfectPlayTable(path)
+    except (OSError, TableFormatError):
+        return None
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Build the perfect-play table asset."""
+
+    parser = argparse.ArgumentParser(
+        description="Solve every 3x3 position and write the perfect-play table."
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=ASSETS_DIR / ASSET_NAME,
+        help="Destination file (default: the package assets directory).",
+    )
+    args = parser.parse_args(argv)
+    size = write_table(args.output)
+    print(f"Wrote {size} bytes to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
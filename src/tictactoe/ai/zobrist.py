@@ -0,0 +1,34 @@
+"""Zobrist hashing for board positions."""
+
+from __future__ import annotations
+
+import random
+from functools import lru_cache
+from typing import Tuple
+
+from tictactoe.domain.logic import BoardTuple, Player
+
+_SEED = 0x7A7A_7E5E
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(cell_count: int) -> Tuple[Tuple[int, int], ...]:
+    """Return one random 64-bit ``(x_key, o_key)`` pair per cell.
+
+    Keys are generated from a fixed seed so hashes are stable between runs and
+    processes, and are cached per board size.
+    """
+
+    rng = random.Random(_SEED + cell_count)
+    return tuple((rng.getrandbits(64), rng.getrandbits(64)) for _ in range(cell_count))
+
+
+def zobrist_hash(board: BoardTuple) -> int:
+    """Return the Zobrist hash of *board*."""
+
+    keys = zobrist_keys(len(board))
+    value = 0
+    for position, cell in enumerate(board):
+        if cell is not None:
+            value ^= keys[position][0 if cell is Player.X else 1]
+    return value
@@ -0,0 +1,449 @@
+"""Annotate recorded games against the solved game value.
+
+Every move is graded by comparing the game-theoretic value of the position
+for the player to move before the move with the value they are left with
+after it:
+
+* **best** keeps the value (a won position stays won, a draw stays a draw);
+* **inaccurate** turns a win into a draw;
+* **blunder** turns a win or a draw into a loss.
+
+Values come from a :class:`PositionEvaluator`, which answers 3x3 positions
+from the bundled perfect-play table and memoizes searched values for other
+boards in a :class:`~tictactoe.ai.symmetry.CanonicalCache`. One evaluator is
+kept per process and board configuration, so all games analysed by a worker
+share it. Larger boards cannot be solved outright: each position gets a
+time-budgeted search (``--search-time``), and a search that runs out of time
+without proving a win or loss counts the position as a draw, so grades on
+those boards are approximate.
+
+Run ``python -m tictactoe analyze games.txt`` (one ``0,4,8`` script per
+line, or a binary file from :mod:`tictactoe.records`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from tictactoe.ai import (
+    CanonicalCache,
+    GameValue,
+    NegamaxSearcher,
+    PerfectPlayTable,
+    load_default_table,
+)
+from tictactoe.domain.logic import GameState, Player, TicTacToe
+from tictactoe.records import (
+    RecordReader,
+    format_script,
+    is_record_file,
+    parse_script,
+)
+
+# A game as read from the input: its 1-based number and either parsed moves
+# or the raw script line (parsed in the worker so errors are reported there).
+GameInput = Tuple[int, Union[str, Tuple[int, ...]]]
+
+
+class MoveQuality(Enum):
+    """Grade of a single move."""
+
+    BEST = "best"
+    INACCURATE = "inaccurate"
+    BLUNDER = "blunder"
+
+
+_MARKS = {MoveQuality.BEST: "", MoveQuality.INACCURATE: "?", MoveQuality.BLUNDER: "??"}
+
+
+class PositionEvaluator:
+    """Memoized game-theoretic value of positions for the side to move."""
+
+    def __init__(
+        self,
+        size: int = 3,
+        win_length: Optional[int] = None,
+        *,
+        cache_size: int = 1_000_000,
+        use_table: bool = True,
+        time_budget: Optional[float] = None,
+    ) -> None:
+        self.size = size
+        self.win_length = win_length
+        self.time_budget = time_budget
+        self._table: Optional[PerfectPlayTable] = None
+        if use_table and size == 3 and win_length in (None, 3):
+            self._table = load_default_table()
+        self._cache: CanonicalCache[GameValue] = CanonicalCache(cache_size)
+        self._searcher = NegamaxSearcher(time_budget=time_budget)
+
+    @property
+    def exact(self) -> bool:
+        """Return whether every value is solved rather than time-limited."""
+
+        return self._table is not None or self.time_budget is None
+
+    @property
+    def cache(self) -> CanonicalCache[GameValue]:
+        """Return the cache holding searched (non-table) values."""
+
+        return self._cache
+
+    def value(self, game: TicTacToe) -> GameValue:
+        """Return the value of *game* for ``game.current_player``.
+
+        Raises:
+            ValueError: if the game is already over
+        """
+
+        if game.state != GameState.PLAYING:
+            raise ValueError("Finished games have no player to move.")
+        if self._table is not None:
+            value = self._table.value(game.board)
+            if value is not None:
+                return value
+        return self._cache.get_or_compute(game.board, lambda _: self._search(game))
+
+    def _search(self, game: TicTacToe) -> GameValue:
+        # An unproven result within the time budget is graded as a draw.
+        result = self._searcher.search(game)
+        if result.is_win:
+            return GameValue.WIN
+        if result.is_loss:
+            return GameValue.LOSS
+        return GameValue.DRAW
+
+
+@lru_cache(maxsize=None)
+def shared_evaluator(
+    size: int = 3,
+    win_length: Optional[int] = None,
+    time_budget: Optional[float] = None,
+) -> PositionEvaluator:
+    """Return this process's evaluator for a board configuration."""
+
+    return PositionEvaluator(size, win_length, time_budget=time_budget)
+
+
+@dataclass(frozen=True)
+class GameAnalysis:
+    """Graded moves of one game, or the reason it could not be replayed."""
+
+    number: int
+    moves: Tuple[int, ...] = ()
+    grades: Tuple[MoveQuality, ...] = ()
+    result: str = ""
+    error: Optional[str] = None
+
+    def count(self, quality: MoveQuality, player: Optional[Player] = None) -> int:
+        """Return how many moves (of *player*, if given) received *quality*."""
+
+        if player is None:
+            grades = self.grades
+        else:
+            grades = self.grades[0 if player == Player.X else 1 :: 2]
+        return sum(1 for grade in grades if grade == quality)
+
+    def annotated(self) -> str:
+        """Return the moves with ``?`` after inaccuracies and ``??`` after blunders."""
+
+        return " ".join(
+            f"{move}{_MARKS[grade]}" for move, grade in zip(self.moves, self.grades)
+        )
+
+    def to_json(self) -> str:
+        if self.error is not None:
+            data: Dict[str, object] = {"game": self.number, "error": self.error}
+        else:
+            data = {
+                "game": self.number,
+                "result": self.result,
+                "moves": format_script(self.moves),
+                "grades": [grade.value for grade in self.grades],
+                "inaccuracies": self.count(MoveQuality.INACCURATE),
+                "blunders": self.count(MoveQuality.BLUNDER),
+            }
+        return json.dumps(data, separators=(",", ":"))
+
+    def to_text(self) -> str:
+        if self.error is not None:
+            return f"Game {self.number}: error: {self.error}"
+        return (
+            f"Game {self.number}: {self.result} in {len(self.moves)} - "
+            f"{self.annotated()} ({self.count(MoveQuality.INACCURATE)} "
+            f"inaccuracies, {self.count(MoveQuality.BLUNDER)} blunders)"
+        )
+
+
+def _result_label(game: TicTacToe) -> str:
+    if game.state == GameState.DRAW:
+        return "draw"
+    if game.state == GameState.PLAYING:
+        return "unfinished"
+    winner = game.get_winner()
+    return f"{winner.value} wins" if winner else "?"
+
+
+def analyze_game(
+    number: int,
+    moves: Sequence[int],
+    evaluator: PositionEvaluator,
+) -> GameAnalysis:
+    """Replay *moves* and grade each one.
+
+    Raises:
+        ValueError: if a move is illegal
+    """
+
+    game = TicTacToe(size=evaluator.size, win_length=evaluator.win_length)
+    grades: List[MoveQuality] = []
+    # Value for the player about to move; each position is evaluated once.
+    before = evaluator.value(game) if moves else GameValue.DRAW
+    for move in moves:
+        if not game.make_move(move):
+            raise ValueError(f"Move {move} is invalid for the current board state.")
+        if game.state == GameState.PLAYING:
+            next_value = evaluator.value(game)
+            after = GameValue(-next_value)
+        else:
+            next_value = GameValue.DRAW  # unused: no further moves are legal
+            after = GameValue.WIN if game.get_winner() else GameValue.DRAW
+
+        if after >= before:
+            grades.append(MoveQuality.BEST)
+        elif after == GameValue.LOSS:
+            grades.append(MoveQuality.BLUNDER)
+        else:
+            grades.append(MoveQuality.INACCURATE)
+        before = next_value
+    return GameAnalysis(number, tuple(moves), tuple(grades), _result_label(game))
+
+
+def _analyze_chunk(
+    size: int,
+    win_length: Optional[int],
+    time_budget: Optional[float],
+    games: Sequence[GameInput],
+) -> List[GameAnalysis]:
+    evaluator = shared_evaluator(size, win_length, time_budget)
+    cell_count = size * size
+    results = []
+    for number, game in games:
+        try:
+            moves = parse_script(game, cell_count) if isinstance(game, str) else game
+            results.append(analyze_game(number, moves, evaluator))
+        except ValueError as exc:
+            results.append(GameAnalysis(number, error=str(exc)))
+    return results
+
+
+def analyze_stream(
+    games: Iterable[GameInput],
+    *,
+    size: int = 3,
+    win_length: Optional[int] = None,
+    workers: int = 1,
+    chunk_size: int = 1_000,
+    time_budget: Optional[float] = None,
+) -> Iterator[GameAnalysis]:
+    """Grade *games* in input order.
+
+    *time_budget* limits the search of each position the perfect-play table
+    does not cover, in seconds. With several workers, chunks of games are
+    analysed in a process pool with at most two chunks per worker in flight,
+    so memory stays bounded however long the input is.
+    """
+
+    iterator = iter(games)
+    chunks = iter(lambda: list(islice(iterator, chunk_size)), [])
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _analyze_chunk(size, win_length, time_budget, chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Deque[Future] = deque()
+        for chunk in chunks:
+            pending.append(
+                executor.submit(_analyze_chunk, size, win_length, time_budget, chunk)
+            )
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+@dataclass
+class AnalysisSummary:
+    """Aggregate grades over many games."""
+
+    games: int = 0
+    errors: int = 0
+    counts: Dict[Tuple[Player, MoveQuality], int] = field(default_factory=dict)
+
+    def add(self, analysis: GameAnalysis) -> None:
+        if analysis.error is not None:
+            self.errors += 1
+            return
+        self.games += 1
+        for player in Player:
+            for quality in MoveQuality:
+                key = (player, quality)
+                self.counts[key] = self.counts.get(key, 0) + analysis.count(
+                    quality, player
+                )
+
+    def moves(self, player: Optional[Player] = None) -> int:
+        players = list(Player) if player is None else [player]
+        return sum(
+            count for (owner, _), count in self.counts.items() if owner in players
+        )
+
+    def format(self) -> str:
+        lines = [f"Analysed {self.games} games ({self.errors} with errors)."]
+        for player in Player:
+            total = self.moves(player)
+            parts = []
+            for quality in MoveQuality:
+                count = self.counts.get((player, quality), 0)
+                share = count / total if total else 0.0
+                parts.append(f"{quality.value} {count} ({share:.1%})")
+            lines.append(f"{player.value}: {total} moves - " + ", ".join(parts))
+        return "\n".join(lines)
+
+
+def _read_games(path: str) -> Iterator[GameInput]:
+    if path != "-" and is_record_file(Path(path)):
+        with RecordReader(Path(path)) as reader:
+            yield from enumerate(reader, start=1)
+        return
+
+    source: TextIO = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for number, line in enumerate(source, start=1):
+            text = line.strip()
+            if text and not text.startswith("#"):
+                yield number, text
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+def _board_of(path: str) -> Optional[Tuple[int, int]]:
+    """Return ``(size, win_length)`` stored in a record file, if *path* is one."""
+
+    if path == "-" or not is_record_file(Path(path)):
+        return None
+    with RecordReader(Path(path)) as reader:
+        return reader.size, reader.win_length
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m tictactoe analyze",
+        description="Grade every move of recorded games against perfect play.",
+    )
+    parser.add_argument(
+        "input",
+        help="Script file (one game per line), binary record file, or '-'.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("text", "jsonl"),
+        default="text",
+        help="Per-game output format (default: text).",
+    )
+    parser.add_argument("--size", type=int, default=3, help="Board size.")
+    parser.add_argument("--win-length", type=int, help="Marks in a row to win.")
+    parser.add_argument(
+        "--search-time",
+        type=float,
+        default=1.0,
+        help="Seconds to search each position off the 3x3 table; grades are "
+        "approximate when it runs out. 0 solves exactly (default: 1.0).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (default: one per core).",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1_000,
+        help="Games sent to a worker at a time (default: 1000).",
+    )
+    parser.add_argument(
+        "--summary-only",
+        action="store_true",
+        help="Print only the aggregate statistics.",
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be positive")
+
+    try:
+        board = _board_of(args.input)
+        size, win_length = board if board else (args.size, args.win_length)
+        TicTacToe(size=size, win_length=win_length)
+        time_budget = args.search_time or None
+        if not shared_evaluator(size, win_length, time_budget).exact:
+            print(
+                f"Grades are approximate: positions are searched for at most "
+                f"{time_budget:g} s each.",
+                file=sys.stderr,
+            )
+        games = _read_games(args.input)
+        summary = AnalysisSummary()
+        write = sys.stdout.write
+        for analysis in analyze_stream(
+            games,
+            size=size,
+            win_length=win_length,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            time_budget=time_budget,
+        ):
+            summary.add(analysis)
+            if not args.summary_only:
+                line = (
+                    analysis.to_json() if args.format == "jsonl" else analysis.to_text()
+                )
+                write(line + "\n")
+    except (OSError, ValueError) as exc:
+        raise SystemExit(str(exc)) from exc
+
+    print(summary.format(), file=sys.stderr if args.format == "jsonl" else sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,216 @@
+"""Vectorized simulation of many 3x3 games at once with NumPy.
+
+``BatchSimulator`` keeps ``B`` boards in a ``(B, 9)`` ``int8`` array (X = 1,
+O = -1, empty = 0) and advances every unfinished game by one ply per call.
+Wins are found by multiplying the boards with the ``8 x 9`` line matrix: a
+line sum of +3 or -3 means X or O completed it. Finished games are masked
+out of later plies.
+
+NumPy is an optional dependency (``pip install tictactoe[batch]``); it is
+imported the first time a simulator is created.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Optional, Sequence, Tuple, cast
+
+from tictactoe.domain.logic import WIN_LINES
+
+CELLS = 9
+X_MARK = 1
+O_MARK = -1
+_NO_MOVE = -1
+
+
+def _numpy() -> ModuleType:
+    try:
+        import numpy
+    except ImportError as exc:  # pragma: no cover - depends on the environment
+        raise ImportError(
+            "tictactoe.batch needs NumPy; install it with "
+            "`pip install tictactoe[batch]`."
+        ) from exc
+    return cast(ModuleType, numpy)
+
+
+def line_matrix() -> Any:
+    """Return the ``8 x 9`` int8 matrix with a 1 for every cell of each line."""
+
+    np = _numpy()
+    matrix = np.zeros((len(WIN_LINES), CELLS), dtype=np.int8)
+    for row, line in enumerate(WIN_LINES):
+        matrix[row, list(line)] = 1
+    return matrix
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Aggregate outcome of a batch of finished games."""
+
+    games: int
+    x_wins: int
+    o_wins: int
+    draws: int
+    length_histogram: Tuple[int, ...]  # index = number of moves played
+
+    @property
+    def x_win_rate(self) -> float:
+        return self.x_wins / self.games if self.games else 0.0
+
+    @property
+    def o_win_rate(self) -> float:
+        return self.o_wins / self.games if self.games else 0.0
+
+    @property
+    def draw_rate(self) -> float:
+        return self.draws / self.games if self.games else 0.0
+
+    def __add__(self, other: BatchResult) -> BatchResult:
+        return BatchResult(
+            games=self.games + other.games,
+            x_wins=self.x_wins + other.x_wins,
+            o_wins=self.o_wins + other.o_wins,
+            draws=self.draws + other.draws,
+            length_histogram=tuple(
+                a + b for a, b in zip(self.length_histogram, other.length_histogram)
+            ),
+        )
+
+
+class BatchSimulator:
+    """Play ``batch_size`` games in lock step.
+
+    Every call to :meth:`apply_moves` places one mark in each unfinished game.
+    X moves first, so all games in a batch share the side to move. *seed* is
+    anything ``numpy.random.default_rng`` accepts, including a generator to
+    share between simulators.
+    """
+
+    def __init__(self, batch_size: int, *, seed: Any = None) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        self._np = _numpy()
+        self.batch_size = batch_size
+        self._rng = self._np.random.default_rng(seed)
+        self._lines_t = line_matrix().T
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear every board."""
+
+        np = self._np
+        self.boards = np.zeros((self.batch_size, CELLS), dtype=np.int8)
+        self.moves = np.full((self.batch_size, CELLS), _NO_MOVE, dtype=np.int8)
+        self.lengths = np.zeros(self.batch_size, dtype=np.int8)
+        self.winners = np.zeros(self.batch_size, dtype=np.int8)
+        self.active = np.ones(self.batch_size, dtype=bool)
+        self.ply = 0
+
+    @property
+    def finished(self) -> bool:
+        """Return True once every game has a result."""
+
+        return not self.active.any()
+
+    def apply_moves(self, moves: Any) -> None:
+        """Play ``moves[i]`` in game ``i`` for every unfinished game.
+
+        Entries for finished games are ignored.
+
+        Raises:
+            ValueError: if a move is out of range or targets an occupied cell
+        """
+        np = self._np
+        moves = np.asarray(moves)
+        if moves.shape != (self.batch_size,):
+            raise ValueError(f"Expected {self.batch_size} moves, got {moves.shape}.")
+        rows = np.flatnonzero(self.active)
+        if rows.size == 0:
+            return
+        cells = moves[rows]
+        if ((cells < 0) | (cells >= CELLS)).any():
+            raise ValueError(f"Moves must be between 0 and {CELLS - 1}.")
+        if self.boards[rows, cells].any():
+            raise ValueError("Moves must target empty cells.")
+
+        mark = X_MARK if self.ply % 2 == 0 else O_MARK
+        self.boards[rows, cells] = mark
+        self.moves[rows, self.ply] = cells
+        self.ply += 1
+        self.lengths[rows] = self.ply
+
+        line_sums = self.boards[rows] @ self._lines_t
+        won = (line_sums == 3 * mark).any(axis=1)
+        self.winners[rows[won]] = mark
+        self.active[rows[won]] = False
+        if self.ply == CELLS:
+            self.active[:] = False
+
+    def random_moves(self) -> Any:
+        """Return a uniformly random empty cell for every game."""
+
+        noise = self._rng.random((self.batch_size, CELLS))
+        noise[self.boards != 0] = -1.0
+        return noise.argmax(axis=1)
+
+    def play_random(self, opening: Sequence[int] = ()) -> BatchResult:
+        """Play every game to the end and return the aggregate result.
+
+        Args:
+            opening: Moves forced in every game before random play starts.
+        """
+        np = self._np
+        self.reset()
+        for move in opening:
+            self.apply_moves(np.full(self.batch_size, move))
+        while not self.finished:
+            self.apply_moves(self.random_moves())
+        return self.result()
+
+    def result(self) -> BatchResult:
+        """Summarize the games played so far (unfinished games count as none)."""
+
+        np = self._np
+        done = ~self.active
+        winners = self.winners[done]
+        x_wins = int((winners == X_MARK).sum())
+        o_wins = int((winners == O_MARK).sum())
+        histogram = np.bincount(self.lengths[done], minlength=CELLS + 1)
+        return BatchResult(
+            games=int(done.sum()),
+            x_wins=x_wins,
+            o_wins=o_wins,
+            draws=int(done.sum()) - x_wins - o_wins,
+            length_histogram=tuple(int(count) for count in histogram),
+        )
+
+
+def simulate(
+    games: int,
+    *,
+    batch_size: int = 100_000,
+    seed: Optional[int] = None,
+    opening: Sequence[int] = (),
+) -> BatchResult:
+    """Play *games* uniformly random games in batches and merge the results."""
+
+    if games < 1:
+        raise ValueError("games must be at least 1.")
+    rng = _numpy().random.default_rng(seed)
+    simulator: Optional[BatchSimulator] = None
+    total: Optional[BatchResult] = None
+    remaining = games
+    while remaining:
+        size = min(batch_size, remaining)
+        if simulator is None or simulator.batch_size != size:
+            simulator = BatchSimulator(size, seed=rng)
+        result = simulator.play_random(opening)
+        total = result if total is None else total + result
+        remaining -= result.games
+    assert total is not None
+    return total
+
+
+__all__ = ["BatchResult", "BatchSimulator", "line_matrix", "simulate"]
@@ -43,6 +43,7 @@ class LayoutConfig:
     cell_size: Tuple[int, int] = (100, 100)
     cell_spacing: int = 5
     reset_padding: int = 20
+    control_width: int = 100
 
 
 @dataclass(frozen=True)
@@ -51,6 +52,8 @@ class TextConfig:
 
     title: str = "Tic Tac Toe"
     reset_button: str = "New Game"
+    undo_button: str = "Undo"
+    redo_button: str = "Redo"
     draw_message: str = "It's a draw!"
     win_message_template: str = "Player {winner} wins!"
     turn_message_template: str = "Player {player}'s turn"
@@ -1,5 +1,16 @@
 """Domain module containing game logic."""
 
-from .logic import GameState, Player, TicTacToe
+from .bitboard import BitboardTicTacToe
+from .dispatch import AsyncioDispatcher, DispatchStats, ThreadedDispatcher
+from .logic import CompactGame, GameState, Player, TicTacToe
 
-__all__ = ["TicTacToe", "Player", "GameState"]
+__all__ = [
+    "TicTacToe",
+    "BitboardTicTacToe",
+    "CompactGame",
+    "Player",
+    "GameState",
+    "ThreadedDispatcher",
+    "AsyncioDispatcher",
+    "DispatchStats",
+]
@@ -0,0 +1,261 @@
+"""Bitboard implementation of the Tic Tac Toe rules."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Tuple
+
+from .dispatch import ListenerDispatcher
+from .logic import WIN_LINES, BoardTuple, GameSnapshot, GameState, Player
+
+_CELL_COUNT = 9
+FULL_MASK = (1 << _CELL_COUNT) - 1
+
+WIN_MASKS: Tuple[int, ...] = tuple(
+    (1 << a) | (1 << b) | (1 << c) for a, b, c in WIN_LINES
+)
+
+# Only the lines that pass through a cell can be completed by a move there.
+_CELL_WIN_MASKS: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(mask for mask in WIN_MASKS if mask & (1 << position))
+    for position in range(_CELL_COUNT)
+)
+
+
+class BitboardTicTacToe:
+    """Drop-in TicTacToe engine that keeps one integer mask per player.
+
+    Bit ``n`` of a mask is set when that player owns board position ``n``. The
+    public surface (``make_move``, ``undo_move``, ``reset``, ``snapshot``,
+    listeners) mirrors
+    :class:`tictactoe.domain.logic.TicTacToe`, so it can be passed as a
+    ``game_factory`` to the GUI or used by the CLI unchanged. Only the classic
+    3x3 board is supported.
+    """
+
+    size = 3
+    win_length = 3
+    cell_count = _CELL_COUNT
+
+    def __init__(self, *, dispatcher: Optional[ListenerDispatcher] = None):
+        """Initialize a new game (see ``TicTacToe`` for *dispatcher*)."""
+        self._dispatcher = dispatcher
+        self._listeners: list[Callable[[GameSnapshot], None]] = []
+        self._x_mask = 0
+        self._o_mask = 0
+        self._history: list[int] = []
+        self._redo: list[int] = []
+        self._muted = 0
+        self.current_player: Player = Player.X
+        self.state: GameState = GameState.PLAYING
+        self.reset()
+
+    def add_listener(self, listener: Callable[[GameSnapshot], None]) -> None:
+        """Register a callback to be invoked whenever the game state changes."""
+
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[GameSnapshot], None]) -> None:
+        """Remove a previously registered listener."""
+
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    @contextmanager
+    def suppress_notifications(self, *, notify_on_exit: bool = False) -> Iterator[None]:
+        """Silence listeners while the block runs (see ``TicTacToe``)."""
+
+        self._muted += 1
+        try:
+            yield
+        finally:
+            self._muted -= 1
+        if notify_on_exit:
+            self._notify_listeners()
+
+    @property
+    def masks(self) -> Tuple[int, int]:
+        """Return the raw ``(x_mask, o_mask)`` pair."""
+
+        return self._x_mask, self._o_mask
+
+    @property
+    def board(self) -> BoardTuple:
+        """Return an immutable view of the board."""
+
+        x_mask = self._x_mask
+        o_mask = self._o_mask
+        return tuple(
+            (
+                Player.X
+                if x_mask >> position & 1
+                else Player.O if o_mask >> position & 1 else None
+            )
+            for position in range(_CELL_COUNT)
+        )
+
+    @property
+    def snapshot(self) -> GameSnapshot:
+        """Return a snapshot that summarizes the current game state."""
+
+        return GameSnapshot(
+            board=self.board,
+            current_player=self.current_player,
+            state=self.state,
+            winner=self.get_winner(),
+        )
+
+    @property
+    def history(self) -> Tuple[int, ...]:
+        """Return the positions played so far, oldest first."""
+
+        return tuple(self._history)
+
+    @property
+    def can_undo(self) -> bool:
+        """Return True when at least one move can be taken back."""
+
+        return bool(self._history)
+
+    @property
+    def can_redo(self) -> bool:
+        """Return True when an undone move can be replayed."""
+
+        return bool(self._redo)
+
+    def copy(self) -> "BitboardTicTacToe":
+        """Return an independent copy of the position without any listeners."""
+
+        clone = type(self).__new__(type(self))
+        clone._dispatcher = None
+        clone._listeners = []
+        clone._x_mask = self._x_mask
+        clone._o_mask = self._o_mask
+        clone._history = list(self._history)
+        clone._redo = list(self._redo)
+        clone._muted = 0
+        clone.current_player = self.current_player
+        clone.state = self.state
+        return clone
+
+    def make_move(self, position: int) -> bool:
+        """
+        Make a move at the specified position.
+
+        Args:
+            position: Board position (0-8)
+
+        Returns:
+            True if move was successful, False otherwise
+        """
+        if self.state != GameState.PLAYING:
+            return False
+
+        if position < 0 or position >= _CELL_COUNT:
+            return False
+
+        bit = 1 << position
+        if (self._x_mask | self._o_mask) & bit:
+            return False
+
+        if self._redo:
+            self._redo.clear()
+        self._apply_move(position)
+        return True
+
+    def undo_move(self) -> bool:
+        """Take back the most recent move.
+
+        Returns:
+            True if a move was undone, False if the history is empty
+        """
+        if not self._history:
+            return False
+
+        position = self._history.pop()
+        bit = 1 << position
+        if self._x_mask & bit:
+            self._x_mask &= ~bit
+            self.current_player = Player.X
+        else:
+            self._o_mask &= ~bit
+            self.current_player = Player.O
+        self.state = GameState.PLAYING
+        self._redo.append(position)
+
+        self._notify_listeners()
+
+        return True
+
+    def redo_move(self) -> bool:
+        """Replay the most recently undone move.
+
+        Returns:
+            True if a move was replayed, False if there is nothing to redo
+        """
+        if not self._redo:
+            return False
+
+        self._apply_move(self._redo.pop())
+        return True
+
+    def _apply_move(self, position: int) -> None:
+        """Place the current player's mark on an empty *position*."""
+
+        bit = 1 << position
+        self._history.append(position)
+        if self.current_player == Player.X:
+            self._x_mask |= bit
+            mask = self._x_mask
+        else:
+            self._o_mask |= bit
+            mask = self._o_mask
+
+        for line in _CELL_WIN_MASKS[position]:
+            if mask & line == line:
+                self.state = (
+                    GameState.X_WON
+                    if self.current_player == Player.X
+                    else GameState.O_WON
+                )
+                break
+        else:
+            if self._x_mask | self._o_mask == FULL_MASK:
+                self.state = GameState.DRAW
+            else:
+                self.current_player = (
+                    Player.O if self.current_player == Player.X else Player.X
+                )
+
+        self._notify_listeners()
+
+    def reset(self) -> None:
+        """Reset the game to initial state."""
+        self._x_mask = 0
+        self._o_mask = 0
+        self._history.clear()
+        self._redo.clear()
+        self.current_player = Player.X
+        self.state = GameState.PLAYING
+        self._notify_listeners()
+
+    def get_winner(self) -> Optional[Player]:
+        """Get the winning player if any."""
+        if self.state == GameState.X_WON:
+            return Player.X
+        elif self.state == GameState.O_WON:
+            return Player.O
+        return None
+
+    def _notify_listeners(self) -> None:
+        """Notify all registered listeners of the latest snapshot."""
+
+        if self._muted or not self._listeners:
+            return
+
+        snapshot = self.snapshot
+        if self._dispatcher is not None:
+            self._dispatcher.dispatch(tuple(self._listeners), snapshot, self)
+            return
+        for listener in list(self._listeners):
+            listener(snapshot)
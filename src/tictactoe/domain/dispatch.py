@@ -0,0 +1,241 @@
+"""Off-thread, coalescing delivery of game snapshots to listeners.
+
+By default a game calls its listeners synchronously inside ``make_move``.
+Passing a dispatcher (``TicTacToe(dispatcher=ThreadedDispatcher())``) hands
+each snapshot to the dispatcher instead, and the move returns at once:
+
+- :class:`ThreadedDispatcher` delivers on one background thread;
+- :class:`AsyncioDispatcher` delivers as callbacks on an event loop.
+
+Each listener has a single pending slot per game, so one dispatcher can be
+shared by many games. A snapshot that arrives while the same game's previous
+one is still waiting for that listener replaces it (a *coalesced* update), so
+a slow listener skips intermediate states and only ever sees the latest. An
+exception raised by one listener is logged and counted without affecting the
+game or the other listeners.
+"""
+
+from __future__ import annotations
+
+import abc
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+)
+
+if TYPE_CHECKING:  # pragma: no cover - imports for annotations only
+    import asyncio
+
+    from .logic import GameSnapshot
+
+Listener = Callable[["GameSnapshot"], None]
+_Slot = Tuple[Hashable, Listener]
+
+logger = logging.getLogger(__name__)
+
+
+class ListenerDispatcher(Protocol):
+    """Anything a game can hand its listeners and a new snapshot to."""
+
+    def dispatch(
+        self,
+        listeners: Sequence[Listener],
+        snapshot: GameSnapshot,
+        source: Hashable = None,
+    ) -> None: ...
+
+
+@dataclass
+class DispatchStats:
+    """Counters kept by a :class:`CoalescingDispatcher`."""
+
+    submitted: int = 0
+    delivered: int = 0
+    coalesced: int = 0
+    errors: int = 0
+    max_depth: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        """Return the mean seconds from submission to delivery."""
+
+        return self.total_latency / self.delivered if self.delivered else 0.0
+
+
+class CoalescingDispatcher(abc.ABC):
+    """Per-game, per-listener latest-snapshot slots drained by an executor.
+
+    Subclasses implement :meth:`_schedule`, called whenever the ready queue
+    goes from empty to non-empty, and arrange for :meth:`_drain` to run.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (source game, listener) -> (latest snapshot, submission time); the
+        # deque keeps the slots with a pending snapshot in the order they
+        # became ready.
+        self._pending: Dict[_Slot, Tuple[GameSnapshot, float]] = {}
+        self._ready: Deque[_Slot] = deque()
+        self._stats = DispatchStats()
+
+    @property
+    def stats(self) -> DispatchStats:
+        """Return a consistent copy of the dispatcher's counters."""
+
+        with self._lock:
+            return replace(self._stats)
+
+    @property
+    def depth(self) -> int:
+        """Return how many listeners have a snapshot waiting."""
+
+        return len(self._ready)
+
+    def dispatch(
+        self,
+        listeners: Sequence[Listener],
+        snapshot: GameSnapshot,
+        source: Hashable = None,
+    ) -> None:
+        """Queue *snapshot* of the game *source* for each of *listeners*."""
+
+        now = self._clock()
+        stats = self._stats
+        with self._lock:
+            was_idle = not self._ready
+            for listener in listeners:
+                slot = (source, listener)
+                stats.submitted += 1
+                if slot in self._pending:
+                    stats.coalesced += 1
+                else:
+                    self._ready.append(slot)
+                self._pending[slot] = (snapshot, now)
+            stats.max_depth = max(stats.max_depth, len(self._ready))
+        if was_idle and listeners:
+            self._schedule()
+
+    @abc.abstractmethod
+    def _schedule(self) -> None:
+        """Arrange for :meth:`_drain` to run on the dispatcher's executor."""
+
+    def _drain(self) -> None:
+        """Deliver every pending snapshot (run on the dispatcher's executor)."""
+
+        stats = self._stats
+        while True:
+            with self._lock:
+                if not self._ready:
+                    return
+                slot = self._ready.popleft()
+                snapshot, submitted = self._pending.pop(slot)
+            listener = slot[1]
+            latency = self._clock() - submitted
+            failed = False
+            try:
+                listener(snapshot)
+            except Exception:
+                failed = True
+                logger.exception("Game listener %r failed", listener)
+            with self._lock:
+                if failed:
+                    stats.errors += 1
+                stats.delivered += 1
+                stats.total_latency += latency
+                stats.max_latency = max(stats.max_latency, latency)
+
+
+class ThreadedDispatcher(CoalescingDispatcher):
+    """Deliver snapshots on one daemon thread, started on first use."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        super().__init__(clock)
+        self._wakeup = threading.Condition()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every pending snapshot is delivered.
+
+        Returns:
+            False if *timeout* expired first.
+        """
+
+        return self._idle.wait(timeout)
+
+    def close(self) -> None:
+        """Deliver what is pending, then stop the thread.
+
+        Snapshots dispatched afterwards are delivered synchronously.
+        """
+
+        with self._wakeup:
+            self._closed = True
+            self._wakeup.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _schedule(self) -> None:
+        with self._wakeup:
+            closed = self._closed
+            if not closed:
+                self._idle.clear()
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="tictactoe-dispatch", daemon=True
+                    )
+                    self._thread.start()
+                self._wakeup.notify()
+        if closed:
+            self._drain()
+
+    def _run(self) -> None:
+        while True:
+            self._drain()
+            with self._wakeup:
+                if not self._ready:
+                    self._idle.set()
+                    if self._closed:
+                        return
+                    self._wakeup.wait()
+
+
+class AsyncioDispatcher(CoalescingDispatcher):
+    """Deliver snapshots as callbacks on an asyncio event loop.
+
+    Games may be driven from the loop itself or from other threads; delivery
+    always happens on *loop* (by default the running loop at construction).
+    """
+
+    def __init__(
+        self,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        super().__init__(clock)
+        if loop is None:
+            import asyncio  # deferred: most games never need an event loop
+
+            loop = asyncio.get_running_loop()
+        self._loop = loop
+
+    def _schedule(self) -> None:
+        self._loop.call_soon_threadsafe(self._drain)
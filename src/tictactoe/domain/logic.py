@@ -1,8 +1,16 @@
 """Game logic for Tic Tac Toe."""
 
+from __future__ import annotations
+
+from array import array
+from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum
-from typing import Callable, Optional, Tuple
+from functools import lru_cache
+from math import isqrt
+from typing import Callable, Iterator, NamedTuple, Optional, Tuple
+
+from .dispatch import ListenerDispatcher
 
 
 class Player(Enum):
@@ -23,6 +31,80 @@ class GameState(Enum):
 
 BoardTuple = Tuple[Optional["Player"], ...]
 
+DEFAULT_SIZE = 3
+
+# (row, column) steps for horizontal, vertical, diagonal and anti-diagonal lines.
+_DIRECTIONS: Tuple[Tuple[int, int], ...] = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+@dataclass(frozen=True)
+class LineIndex:
+    """Precomputed winning lines for one board size and win length."""
+
+    size: int
+    win_length: int
+    lines: Tuple[Tuple[int, ...], ...]
+    cell_lines: Tuple[Tuple[int, ...], ...]
+
+    @property
+    def cell_count(self) -> int:
+        """Return the number of cells on the board."""
+
+        return self.size * self.size
+
+
+def line_index(size: int = DEFAULT_SIZE, win_length: Optional[int] = None) -> LineIndex:
+    """Return the cached line index for a ``size`` x ``size`` board.
+
+    Every run of ``win_length`` consecutive cells along a row, column or
+    diagonal is a line; ``cell_lines[n]`` lists the indices of the lines that
+    contain cell ``n``. The index is built once per configuration and shared by
+    every game that uses it.
+    """
+
+    win_length = size if win_length is None else win_length
+    if size < 1:
+        raise ValueError("Board size must be at least 1.")
+    if not 1 <= win_length <= size:
+        raise ValueError(f"Win length must be between 1 and {size}.")
+    return _build_line_index(size, win_length)
+
+
+@lru_cache(maxsize=None)
+def _build_line_index(size: int, win_length: int) -> LineIndex:
+    lines: list[Tuple[int, ...]] = []
+    seen: set[Tuple[int, ...]] = set()
+    for row in range(size):
+        for column in range(size):
+            for row_step, column_step in _DIRECTIONS:
+                end_row = row + row_step * (win_length - 1)
+                end_column = column + column_step * (win_length - 1)
+                if not (0 <= end_row < size and 0 <= end_column < size):
+                    continue
+                line = tuple(
+                    (row + row_step * step) * size + column + column_step * step
+                    for step in range(win_length)
+                )
+                # A single-cell line is the same in every direction.
+                if line not in seen:
+                    seen.add(line)
+                    lines.append(line)
+
+    cell_lines: list[list[int]] = [[] for _ in range(size * size)]
+    for index, line in enumerate(lines):
+        for cell in line:
+            cell_lines[cell].append(index)
+
+    return LineIndex(
+        size=size,
+        win_length=win_length,
+        lines=tuple(lines),
+        cell_lines=tuple(tuple(indices) for indices in cell_lines),
+    )
+
+
+WIN_LINES: Tuple[Tuple[int, ...], ...] = line_index(DEFAULT_SIZE).lines
+
 
 @dataclass(frozen=True)
 class GameSnapshot:
@@ -33,14 +115,71 @@ class GameSnapshot:
     state: "GameState"
     winner: Optional["Player"]
 
+    @property
+    def size(self) -> int:
+        """Return the side length of the (square) board."""
+
+        return isqrt(len(self.board))
+
+
+class CompactGame(NamedTuple):
+    """Listener-free, enum-free-board encoding of a position.
+
+    ``board`` is a base-3 integer (empty=0, X=1, O=2, cell 0 lowest) and
+    ``history`` holds the played positions (one byte each on boards of up to
+    256 cells, native 32-bit integers beyond that) so undo keeps working
+    after a round trip. The redo stack is not kept.
+    """
+
+    size: int
+    win_length: int
+    board: int
+    current_player: Player
+    state: GameState
+    history: bytes
+
+
+_CELL_CODES = {None: 0, Player.X: 1, Player.O: 2}
+_CODE_PLAYERS = (None, Player.X, Player.O)
+
+
+def _history_typecode(cell_count: int) -> str:
+    return "B" if cell_count <= 256 else "I"
+
 
 class TicTacToe:
     """Main game logic for Tic Tac Toe."""
 
-    def __init__(self):
-        """Initialize a new game."""
+    def __init__(
+        self,
+        size: int = DEFAULT_SIZE,
+        win_length: Optional[int] = None,
+        *,
+        dispatcher: Optional[ListenerDispatcher] = None,
+    ):
+        """Initialize a new game.
+
+        Args:
+            size: Number of rows and columns on the board.
+            win_length: Marks in a row needed to win (defaults to ``size``).
+            dispatcher: Delivers snapshots to listeners off the move path
+                (see :mod:`tictactoe.domain.dispatch`); listeners are called
+                synchronously when omitted.
+        """
+        self._lines = line_index(size, win_length)
+        self._dispatcher = dispatcher
         self._listeners: list[Callable[[GameSnapshot], None]] = []
-        self._board: list[Optional[Player]] = [None for _ in range(9)]
+        self._board: list[Optional[Player]] = []
+        self._line_counts: dict[Player, list[int]] = {}
+        self._move_count = 0
+        self._history: list[int] = []
+        self._redo: list[int] = []
+        self._muted = 0
+        # Bumped on every mutation; the board tuple and snapshot are built
+        # lazily once per version and shared until the next one.
+        self._version = 0
+        self._board_view: Optional[BoardTuple] = None
+        self._snapshot: Optional[GameSnapshot] = None
         self.current_player: Player = Player.X
         self.state: GameState = GameState.PLAYING
         self.reset()
@@ -56,29 +195,169 @@ class TicTacToe:
         if listener in self._listeners:
             self._listeners.remove(listener)
 
+    @contextmanager
+    def suppress_notifications(self, *, notify_on_exit: bool = False) -> Iterator[None]:
+        """Silence listeners while the block runs.
+
+        Search code can make and undo moves in place without every listener
+        re-rendering intermediate positions. With ``notify_on_exit`` the
+        listeners receive a single snapshot of the final state afterwards.
+        Blocks may be nested; only the outermost one notifies.
+        """
+
+        self._muted += 1
+        try:
+            yield
+        finally:
+            self._muted -= 1
+        if notify_on_exit:
+            self._notify_listeners()
+
+    @property
+    def size(self) -> int:
+        """Return the number of rows (and columns) on the board."""
+
+        return self._lines.size
+
+    @property
+    def win_length(self) -> int:
+        """Return how many marks in a row win the game."""
+
+        return self._lines.win_length
+
+    @property
+    def cell_count(self) -> int:
+        """Return the number of cells on the board."""
+
+        return self._lines.cell_count
+
+    @property
+    def version(self) -> int:
+        """Return a counter that changes whenever the position changes."""
+
+        return self._version
+
     @property
     def board(self) -> BoardTuple:
-        """Return an immutable view of the board."""
+        """Return an immutable view of the board (shared until the next move)."""
 
-        return tuple(self._board)
+        board = self._board_view
+        if board is None:
+            board = self._board_view = tuple(self._board)
+        return board
 
     @property
     def snapshot(self) -> GameSnapshot:
-        """Return a snapshot that summarizes the current game state."""
+        """Return a snapshot that summarizes the current game state.
+
+        The same object is returned until the position changes.
+        """
+
+        snapshot = self._snapshot
+        if (
+            snapshot is None
+            or snapshot.current_player is not self.current_player
+            or snapshot.state is not self.state
+        ):
+            snapshot = self._snapshot = GameSnapshot(
+                board=self.board,
+                current_player=self.current_player,
+                state=self.state,
+                winner=self.get_winner(),
+            )
+        return snapshot
 
-        return GameSnapshot(
-            board=self.board,
-            current_player=self.current_player,
-            state=self.state,
-            winner=self.get_winner(),
+    @property
+    def history(self) -> Tuple[int, ...]:
+        """Return the positions played so far, oldest first."""
+
+        return tuple(self._history)
+
+    @property
+    def can_undo(self) -> bool:
+        """Return True when at least one move can be taken back."""
+
+        return bool(self._history)
+
+    @property
+    def can_redo(self) -> bool:
+        """Return True when an undone move can be replayed."""
+
+        return bool(self._redo)
+
+    def copy(self) -> TicTacToe:
+        """Return an independent copy of the position without any listeners."""
+
+        clone = type(self).__new__(type(self))
+        clone._lines = self._lines
+        clone._dispatcher = None
+        clone._listeners = []
+        clone._board = list(self._board)
+        clone._line_counts = {
+            player: list(counts) for player, counts in self._line_counts.items()
+        }
+        clone._move_count = self._move_count
+        clone._history = list(self._history)
+        clone._redo = list(self._redo)
+        clone._muted = 0
+        clone._version = self._version
+        clone._board_view = self._board_view
+        clone._snapshot = self._snapshot
+        clone.current_player = self.current_player
+        clone.state = self.state
+        return clone
+
+    def to_compact(self) -> CompactGame:
+        """Return the position in its compact form (see :class:`CompactGame`)."""
+
+        board = 0
+        for cell in reversed(self._board):
+            board = board * 3 + _CELL_CODES[cell]
+        return CompactGame(
+            self._lines.size,
+            self._lines.win_length,
+            board,
+            self.current_player,
+            self.state,
+            array(_history_typecode(len(self._board)), self._history).tobytes(),
         )
 
+    @classmethod
+    def from_compact(cls, compact: CompactGame) -> TicTacToe:
+        """Rebuild a game (without listeners) from :meth:`to_compact` output.
+
+        Raises:
+            ValueError: if the board and history disagree
+        """
+
+        game = cls(compact.size, compact.win_length)
+        cell_lines = game._lines.cell_lines
+        board = compact.board
+        for cell in range(game._lines.cell_count):
+            board, code = divmod(board, 3)
+            player = _CODE_PLAYERS[code]
+            if player is not None:
+                game._board[cell] = player
+                counts = game._line_counts[player]
+                for line in cell_lines[cell]:
+                    counts[line] += 1
+                game._move_count += 1
+        history = array(_history_typecode(game._lines.cell_count))
+        history.frombytes(compact.history)
+        if board or game._move_count != len(history):
+            raise ValueError("Compact board does not match its move history.")
+        game._history = history.tolist()
+        game.current_player = compact.current_player
+        game.state = compact.state
+        game._changed()
+        return game
+
     def make_move(self, position: int) -> bool:
         """
         Make a move at the specified position.
 
         Args:
-            position: Board position (0-8)
+            position: Board position (0 to ``cell_count - 1``)
 
         Returns:
             True if move was successful, False otherwise
@@ -86,78 +365,117 @@ class TicTacToe:
         if self.state != GameState.PLAYING:
             return False
 
-        if position < 0 or position > 8:
+        if position < 0 or position >= len(self._board):
             return False
 
         if self._board[position] is not None:
             return False
 
+        if self._redo:
+            self._redo.clear()
+        self._apply_move(position)
+        return True
+
+    def undo_move(self) -> bool:
+        """Take back the most recent move.
+
+        The move is kept on a redo stack until a different move is played.
+
+        Returns:
+            True if a move was undone, False if the history is empty
+        """
+        if not self._history:
+            return False
+
+        position = self._history.pop()
+        player = self._board[position]
+        assert player is not None
+        self._board[position] = None
+        counts = self._line_counts[player]
+        for line in self._lines.cell_lines[position]:
+            counts[line] -= 1
+        self._move_count -= 1
+        self.current_player = player
+        self.state = GameState.PLAYING
+        self._redo.append(position)
+        self._changed()
+
+        self._notify_listeners()
+
+        return True
+
+    def redo_move(self) -> bool:
+        """Replay the most recently undone move.
+
+        Returns:
+            True if a move was replayed, False if there is nothing to redo
+        """
+        if not self._redo:
+            return False
+
+        self._apply_move(self._redo.pop())
+        return True
+
+    def _apply_move(self, position: int) -> None:
+        """Place the current player's mark on an empty *position*."""
+
         self._board[position] = self.current_player
-        self._check_game_state()
+        self._history.append(position)
+        self._check_game_state(position)
 
         if self.state == GameState.PLAYING:
             self.current_player = (
                 Player.O if self.current_player == Player.X else Player.X
             )
+        self._changed()
 
         self._notify_listeners()
 
-        return True
-
-    def _check_game_state(self) -> None:
-        """Check if the game has been won or drawn."""
-        # Check rows
-        for i in range(0, 9, 3):
-            if (
-                self._board[i] is not None
-                and self._board[i] == self._board[i + 1] == self._board[i + 2]
-            ):
-                self.state = (
-                    GameState.X_WON if self._board[i] == Player.X else GameState.O_WON
-                )
-                return
-
-        # Check columns
-        for i in range(3):
-            if (
-                self._board[i] is not None
-                and self._board[i] == self._board[i + 3] == self._board[i + 6]
-            ):
-                self.state = (
-                    GameState.X_WON if self._board[i] == Player.X else GameState.O_WON
-                )
-                return
+    def _check_game_state(self, position: int) -> None:
+        """Check if the move at *position* won or drew the game.
 
-        # Check diagonals
-        if (
-            self._board[0] is not None
-            and self._board[0] == self._board[4] == self._board[8]
-        ):
-            self.state = (
-                GameState.X_WON if self._board[0] == Player.X else GameState.O_WON
-            )
-            return
-
-        if (
-            self._board[2] is not None
-            and self._board[2] == self._board[4] == self._board[6]
-        ):
+        Only the lines passing through *position* can change, so their
+        counters are the only ones updated and inspected.
+        """
+        counts = self._line_counts[self.current_player]
+        win_length = self._lines.win_length
+        won = False
+        for line in self._lines.cell_lines[position]:
+            counts[line] += 1
+            if counts[line] == win_length:
+                won = True
+
+        self._move_count += 1
+        if won:
             self.state = (
-                GameState.X_WON if self._board[2] == Player.X else GameState.O_WON
+                GameState.X_WON if self.current_player == Player.X else GameState.O_WON
             )
-            return
-
-        # Check for draw
-        if all(cell is not None for cell in self._board):
+        elif self._move_count == len(self._board):
             self.state = GameState.DRAW
 
     def reset(self) -> None:
         """Reset the game to initial state."""
-        self._board = [None for _ in range(9)]
+        line_count = len(self._lines.lines)
+        self._board = [None] * self._lines.cell_count
+        self._line_counts = {
+            Player.X: [0] * line_count,
+            Player.O: [0] * line_count,
+        }
+        self._move_count = 0
+        self._history.clear()
+        self._redo.clear()
         self.current_player = Player.X
         self.state = GameState.PLAYING
+        self._changed()
         self._notify_listeners()
 
+    def _changed(self) -> None:
+        """Record a mutation: drop the cached board view and snapshot."""
+
+        self._version += 1
+        self._board_view = None
+        self._snapshot = None
+
     def get_winner(self) -> Optional[Player]:
         """Get the winning player if any."""
         if self.state == GameState.X_WON:
@@ -169,9 +487,12 @@ class TicTacToe:
     def _notify_listeners(self) -> None:
         """Notify all registered listeners of the latest snapshot."""
 
-        if not self._listeners:
+        if self._muted or not self._listeners:
             return
 
         snapshot = self.snapshot
+        if self._dispatcher is not None:
+            self._dispatcher.dispatch(tuple(self._listeners), snapshot, self)
+            return
         for listener in list(self._listeners):
             listener(snapshot)
@@ -0,0 +1,537 @@
+"""Opt-in counters and latency histograms for the engine and GUI hot paths.
+
+Nothing is measured until :func:`enable` is called. Enabling swaps timing
+wrappers onto ``make_move`` and ``_notify_listeners`` of both engines
+(labelled ``engine="TicTacToe"`` or ``"BitboardTicTacToe"``), onto
+``TicTacToe._check_game_state`` (the bitboard engine checks for wins inline)
+and onto the GUI views' render paths, and times every listener added from
+then on separately. Metrics may be updated from any thread: listeners can
+run on a dispatcher's thread and serve-cli jobs on worker threads.
+:func:`disable` puts the original methods back, so a process that never
+enables metrics runs exactly the uninstrumented code. The GUI also records
+how long each phase of ``TicTacToeGUI.__init__`` took.
+
+Snapshots export as JSON or Prometheus text. Set ``TICTACTOE_METRICS`` to use
+them from any frontend:
+
+- a file path: ``python -m tictactoe`` enables metrics and writes them there
+  at exit (JSON for ``*.json``, Prometheus text otherwise);
+- ``:PORT`` or ``HOST:PORT``: serve ``/metrics`` (Prometheus) and
+  ``/metrics.json`` over HTTP while the frontend runs::
+
+    TICTACTOE_METRICS=moves.prom python -m tictactoe cli --batch games.txt
+    TICTACTOE_METRICS=:9464 python -m tictactoe gui
+"""
+
+from __future__ import annotations
+
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+if TYPE_CHECKING:  # pragma: no cover - imports for annotations only
+    from tictactoe.domain.bitboard import BitboardTicTacToe
+    from tictactoe.domain.logic import TicTacToe
+
+    Engine = Union[Type[TicTacToe], Type[BitboardTicTacToe]]
+
+ENV_VAR = "TICTACTOE_METRICS"
+# Latency bucket upper bounds in seconds, from 1 us to 1 s.
+LATENCY_BOUNDS = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 0.1, 1.0,
+)  # fmt: skip
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Counter:
+    """A monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self) -> None:
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def as_json(self) -> int:
+        return self.value
+
+
+class Gauge:
+    """The most recently set value."""
+
+    kind = "gauge"
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def as_json(self) -> float:
+        return self.value
+
+
+class Histogram:
+    """Counts of observations in fixed buckets, plus their sum and maximum."""
+
+    kind = "histogram"
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BOUNDS) -> None:
+        self.bounds = bounds
+        # One extra bucket for observations above the largest bound.
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, value: float) -> None:
+        bucket = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[bucket] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def totals(self) -> Tuple[List[int], int, float, float]:
+        """Return a consistent copy of ``(counts, count, sum, max)``."""
+
+        with self._lock:
+            return list(self.counts), self.count, self.sum, self.max
+
+    def as_json(self) -> Dict[str, Any]:
+        counts, count, total, largest = self.totals()
+        labels = [f"<={bound:g}" for bound in self.bounds]
+        labels.append(f">{self.bounds[-1]:g}")
+        return {
+            "count": count,
+            "sum": total,
+            "max": largest,
+            "buckets": dict(zip(labels, counts)),
+        }
+
+
+Metric = Union[Counter, Gauge, Histogram]
+M = TypeVar("M", Counter, Gauge, Histogram)
+
+
+class Registry:
+    """Named metrics, each optionally split by labels."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[Tuple[str, Labels], Metric] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, description: str = "", **labels: str) -> Counter:
+        return self._get(Counter, name, description, labels)
+
+    def gauge(self, name: str, description: str = "", **labels: str) -> Gauge:
+        return self._get(Gauge, name, description, labels)
+
+    def histogram(self, name: str, description: str = "", **labels: str) -> Histogram:
+        return self._get(Histogram, name, description, labels)
+
+    def _get(
+        self, kind: Type[M], name: str, description: str, labels: Dict[str, str]
+    ) -> M:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                created = self._metrics[key] = kind()
+                if description:
+                    self._help.setdefault(name, description)
+                return created
+        if not isinstance(metric, kind):
+            raise TypeError(f"Metric {name!r} is a {metric.kind}.")
+        return metric
+
+    def items(self) -> List[Tuple[str, Labels, Metric]]:
+        """Return ``(name, labels, metric)`` for every metric, sorted."""
+
+        with self._lock:
+            metrics = dict(self._metrics)
+        return [
+            (name, labels, metrics[name, labels]) for name, labels in sorted(metrics)
+        ]
+
+    def to_json(self) -> str:
+        """Return every metric as a JSON object keyed by name."""
+
+        document: Dict[str, List[Dict[str, Any]]] = {}
+        for name, labels, metric in self.items():
+            document.setdefault(name, []).append(
+                {"labels": dict(labels), "value": metric.as_json()}
+            )
+        return json.dumps({"time": time.time(), "metrics": document}, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+
+        lines: List[str] = []
+        announced = set()
+        for name, labels, metric in self.items():
+            if name not in announced:
+                announced.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {metric.kind}")
+            if isinstance(metric, Histogram):
+                counts, total, seconds, _ = metric.totals()
+                cumulative = 0
+                for bound, count in zip(metric.bounds, counts):
+                    cumulative += count
+                    lines.append(
+                        f"{name}_bucket{_labels(labels, le=f'{bound:g}')} {cumulative}"
+                    )
+                overflow = _labels(labels, le="+Inf")
+                lines.append(f"{name}_bucket{overflow} {total}")
+                lines.append(f"{name}_sum{_labels(labels)} {seconds!r}")
+                lines.append(f"{name}_count{_labels(labels)} {total}")
+            else:
+                lines.append(f"{name}{_labels(labels)} {metric.value!r}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: Labels, **extra: str) -> str:
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Instrumentation --------------------------------------------------------------
+
+_registry: Optional[Registry] = None
+_originals: List[Tuple[type, str, Any]] = []
+_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return _registry is not None
+
+
+def registry() -> Registry:
+    """Return the active registry.
+
+    Raises:
+        RuntimeError: If metrics are not enabled.
+    """
+
+    if _registry is None:
+        raise RuntimeError("Metrics are not enabled; call tictactoe.metrics.enable().")
+    return _registry
+
+
+def enable(target: Optional[Registry] = None) -> Registry:
+    """Start recording into *target* (a new registry by default)."""
+
+    global _registry
+    with _lock:
+        if _registry is not None:
+            return _registry
+        _registry = target if target is not None else Registry()
+        _instrument(_registry)
+        return _registry
+
+
+def disable() -> None:
+    """Stop recording and restore the uninstrumented methods."""
+
+    global _registry
+    with _lock:
+        while _originals:
+            owner, attribute, original = _originals.pop()
+            setattr(owner, attribute, original)
+        _registry = None
+
+
+@contextmanager
+def phase(frontend: str, name: str) -> Iterator[None]:
+    """Record how long the block took as a startup phase of *frontend*."""
+
+    if _registry is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _registry.gauge(
+            "tictactoe_startup_phase_seconds",
+            "Duration of each frontend start-up phase.",
+            frontend=frontend,
+            phase=name,
+        ).set(time.perf_counter() - started)
+
+
+def _patch(owner: type, attribute: str, replacement: Any) -> None:
+    _originals.append((owner, attribute, owner.__dict__[attribute]))
+    setattr(owner, attribute, replacement)
+
+
+def _timed(original: Callable[..., Any], histogram: Histogram) -> Callable[..., Any]:
+    @wraps(original)
+    def timed(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            histogram.record(time.perf_counter() - started)
+
+    return timed
+
+
+class _TimedListener:
+    """A listener that records how long each call takes.
+
+    It compares equal to the listener it wraps, so ``remove_listener`` keeps
+    working. Listeners stay wrapped after :func:`disable` until removed.
+    """
+
+    __slots__ = ("listener", "histogram", "calls")
+
+    def __init__(
+        self, listener: Callable[..., Any], histogram: Histogram, calls: Counter
+    ) -> None:
+        self.listener = listener
+        self.histogram = histogram
+        self.calls = calls
+
+    def __call__(self, snapshot: Any) -> None:
+        started = time.perf_counter()
+        try:
+            self.listener(snapshot)
+        finally:
+            self.histogram.record(time.perf_counter() - started)
+            self.calls.inc()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, _TimedListener):
+            other = other.listener
+        return bool(self.listener == other)
+
+    def __hash__(self) -> int:
+        return hash(self.listener)
+
+
+def _listener_name(listener: Callable[..., Any]) -> str:
+    owner = getattr(listener, "__self__", None)
+    name = getattr(listener, "__qualname__", None) or type(listener).__qualname__
+    if owner is not None and "." not in name:
+        name = f"{type(owner).__qualname__}.{name}"
+    module = getattr(listener, "__module__", None) or type(listener).__module__
+    return f"{module}.{name}"
+
+
+def _instrument(target: Registry) -> None:
+    from tictactoe.domain.bitboard import BitboardTicTacToe
+    from tictactoe.domain.logic import TicTacToe
+
+    fan_out = target.counter(
+        "tictactoe_listener_calls_total", "Snapshots delivered to listeners."
+    )
+    for engine in (TicTacToe, BitboardTicTacToe):
+        _instrument_engine(target, engine, fan_out)
+    _patch(
+        TicTacToe,
+        "_check_game_state",
+        _timed(
+            TicTacToe._check_game_state,
+            target.histogram(
+                "tictactoe_check_game_state_seconds",
+                "Latency of the win/draw check after each move.",
+                engine="TicTacToe",
+            ),
+        ),
+    )
+
+    from tictactoe.ui.gui.headless_view import HeadlessGameView
+    from tictactoe.ui.gui.view import GameView
+
+    def render_seconds(view: str) -> Histogram:
+        return target.histogram(
+            "tictactoe_render_seconds",
+            "Time to draw one snapshot into a view.",
+            view=view,
+        )
+
+    requests = target.counter(
+        "tictactoe_render_requests_total",
+        "Snapshots handed to a view (GameView draws at most one per frame).",
+        view="GameView",
+    )
+    render = GameView.render
+
+    @wraps(render)
+    def counted_render(view: GameView, snapshot: Any) -> None:
+        requests.inc()
+        render(view, snapshot)
+
+    _patch(GameView, "render", counted_render)
+    _patch(GameView, "flush", _timed(GameView.flush, render_seconds("GameView")))
+    _patch(
+        HeadlessGameView,
+        "render",
+        _timed(HeadlessGameView.render, render_seconds("HeadlessGameView")),
+    )
+
+
+def _instrument_engine(target: Registry, engine: Engine, fan_out: Counter) -> None:
+    label = engine.__name__
+    move_seconds = target.histogram(
+        "tictactoe_make_move_seconds", "Latency of make_move.", engine=label
+    )
+    accepted = target.counter(
+        "tictactoe_moves_total",
+        "Moves offered to make_move.",
+        engine=label,
+        result="accepted",
+    )
+    rejected = target.counter("tictactoe_moves_total", engine=label, result="rejected")
+    make_move = engine.make_move
+
+    @wraps(make_move)
+    def timed_make_move(game: Any, position: int) -> bool:
+        started = time.perf_counter()
+        ok = make_move(game, position)
+        move_seconds.record(time.perf_counter() - started)
+        (accepted if ok else rejected).inc()
+        return ok
+
+    _patch(engine, "make_move", timed_make_move)
+    _patch(
+        engine,
+        "_notify_listeners",
+        _timed(
+            engine._notify_listeners,
+            target.histogram(
+                "tictactoe_notify_seconds",
+                "Time in _notify_listeners per state change.",
+                engine=label,
+            ),
+        ),
+    )
+    add_listener = engine.add_listener
+
+    @wraps(add_listener)
+    def timed_add_listener(game: Any, listener: Callable[..., Any]) -> None:
+        histogram = target.histogram(
+            "tictactoe_listener_seconds",
+            "Time spent in each listener per notification.",
+            listener=_listener_name(listener),
+        )
+        add_listener(game, _TimedListener(listener, histogram, fan_out))
+
+    _patch(engine, "add_listener", timed_add_listener)
+
+
+# Export -----------------------------------------------------------------------
+
+
+def write(path: Union[str, Path], target: Optional[Registry] = None) -> None:
+    """Write a snapshot to *path*: JSON for ``*.json``, else Prometheus text."""
+
+    path = Path(path)
+    source = target if target is not None else registry()
+    text = source.to_json() if path.suffix == ".json" else source.to_prometheus()
+    partial = path.with_name(path.name + ".tmp")
+    partial.write_text(text, encoding="utf-8")
+    os.replace(partial, path)
+
+
+def serve(port: int, host: str = "127.0.0.1", target: Optional[Registry] = None) -> Any:
+    """Serve ``/metrics`` and ``/metrics.json`` from a daemon thread.
+
+    Returns:
+        The ``http.server.ThreadingHTTPServer``; call ``shutdown()`` to stop.
+    """
+
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    source = target if target is not None else registry()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            if self.path == "/metrics":
+                body, content_type = source.to_prometheus(), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body, content_type = source.to_json(), "application/json"
+            else:
+                self.send_error(404)
+                return
+            data = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args: Any) -> None:
+            return None
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(
+        target=server.serve_forever, name="tictactoe-metrics", daemon=True
+    ).start()
+    return server
+
+
+def configure_from_env(value: Optional[str] = None) -> Optional[Registry]:
+    """Enable metrics and set up their export from ``TICTACTOE_METRICS``.
+
+    Returns:
+        The active registry, or ``None`` when the variable is unset.
+
+    Raises:
+        ValueError: If a ``HOST:PORT`` value has a non-numeric port.
+    """
+
+    value = os.environ.get(ENV_VAR, "") if value is None else value
+    if not value:
+        return None
+    host, colon, port = value.rpartition(":")
+    if colon and "/" not in value and "\\" not in value:
+        if not port.isdigit():
+            raise ValueError(f"{ENV_VAR}={value!r}: expected a path or HOST:PORT.")
+        active = enable()
+        serve(int(port), host or "127.0.0.1", active)
+        return active
+    active = enable()
+    atexit.register(write, value, active)
+    return active
@@ -0,0 +1,314 @@
+"""CPU and allocation profiling for any frontend.
+
+``python -m tictactoe --profile [cpu|alloc] FRONTEND ...`` runs the frontend
+under :mod:`cProfile` or :mod:`tracemalloc` and writes a report when it
+exits, including on Ctrl-C:
+
+- ``cpu`` dumps pstats data (browse it with ``python -m pstats FILE``) and
+  prints the most expensive calls to stderr;
+- ``alloc`` writes the largest live allocations, and what grew since the
+  frontend started, by source line.
+
+When the GUI is loaded, every call to ``TicTacToeGUI._on_cell_click`` and
+``_on_game_updated`` is sampled, along with the view methods that draw a
+frame (``GameView.flush``, which ``_on_game_updated`` only schedules, and
+``HeadlessGameView.render``): its wall time, and under ``alloc`` the traced
+memory it left behind, so slow frames and handlers that leak show up in the
+report. On POSIX, ``kill -USR1 <pid>`` writes the report without
+stopping a long-running GUI or server session::
+
+    python -m tictactoe --profile cpu cli --batch games.txt --quiet
+    python -m tictactoe --profile alloc --profile-output gui.txt gui
+"""
+
+from __future__ import annotations
+
+import cProfile
+import heapq
+import pstats
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from functools import wraps
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+MODES = ("cpu", "alloc")
+DEFAULT_OUTPUTS = {"cpu": "tictactoe.pstats", "alloc": "tictactoe-alloc.txt"}
+# Handler calls slower than one 60 Hz frame are listed individually.
+SLOW_FRAME_SECONDS = 1 / 60
+# Rows shown per section of a report.
+DEFAULT_TOP = 25
+
+# (module, class, method) of every sampled GUI handler.
+_HANDLERS = (
+    ("tictactoe.ui.gui.main", "TicTacToeGUI", "_on_cell_click"),
+    ("tictactoe.ui.gui.main", "TicTacToeGUI", "_on_game_updated"),
+    ("tictactoe.ui.gui.view", "GameView", "flush"),
+    ("tictactoe.ui.gui.headless_view", "HeadlessGameView", "render"),
+)
+_SLOWEST_KEPT = 5
+_TRACEBACK_FRAMES = 10
+
+T = TypeVar("T")
+
+
+class HandlerStats:
+    """Timing (and memory growth) of one GUI event handler's calls."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.total = 0.0
+        self.longest = 0.0
+        self.memory = 0
+        # Min-heap of the slowest (seconds, call number) over the frame budget.
+        self.slow: List[Tuple[float, int]] = []
+        self.slow_calls = 0
+
+    def record(self, seconds: float, memory: int = 0) -> None:
+        self.calls += 1
+        self.total += seconds
+        self.longest = max(self.longest, seconds)
+        self.memory += memory
+        if seconds > SLOW_FRAME_SECONDS:
+            self.slow_calls += 1
+            entry = (seconds, self.calls)
+            if len(self.slow) < _SLOWEST_KEPT:
+                heapq.heappush(self.slow, entry)
+            else:
+                heapq.heappushpop(self.slow, entry)
+
+    def describe(self, memory: bool) -> List[str]:
+        mean = self.total / self.calls if self.calls else 0.0
+        line = (
+            f"  {self.name:<27} calls={self.calls} total={self.total * 1e3:.1f} ms "
+            f"mean={mean * 1e3:.3f} ms max={self.longest * 1e3:.3f} ms "
+            f"slow={self.slow_calls}"
+        )
+        if memory:
+            line += f" memory={self.memory / 1024:+.1f} KiB"
+        lines = [line]
+        if self.slow:
+            calls = ", ".join(
+                f"#{number} {seconds * 1e3:.1f} ms"
+                for seconds, number in sorted(self.slow, reverse=True)
+            )
+            lines.append(f"    slowest frames: {calls}")
+        return lines
+
+
+class HandlerSampler:
+    """Sample each call of the GUI event handlers while installed.
+
+    The view and the engine hold bound methods, so install the sampler
+    before the ``TicTacToeGUI`` is constructed.
+    """
+
+    def __init__(self, memory: bool = False) -> None:
+        self.memory = memory
+        self.stats: Dict[str, HandlerStats] = {
+            f"{owner}.{name}": HandlerStats(f"{owner}.{name}")
+            for _, owner, name in _HANDLERS
+        }
+        self._originals: List[Tuple[type, str, Any]] = []
+
+    def install(self, owner: type) -> None:
+        """Sample the handlers in ``_HANDLERS`` that *owner* defines."""
+
+        for _, owner_name, name in _HANDLERS:
+            if owner_name != owner.__name__:
+                continue
+            original = owner.__dict__[name]
+            self._originals.append((owner, name, original))
+            stats = self.stats[f"{owner_name}.{name}"]
+            setattr(owner, name, self._sampled(original, stats))
+
+    def install_loaded(self) -> None:
+        """Sample the handlers of every GUI module imported so far."""
+
+        owners = dict.fromkeys((module, owner) for module, owner, _ in _HANDLERS)
+        for module_name, owner_name in owners:
+            module = sys.modules.get(module_name)
+            if module is not None:
+                self.install(getattr(module, owner_name))
+
+    def uninstall(self) -> None:
+        while self._originals:
+            owner, name, original = self._originals.pop()
+            setattr(owner, name, original)
+
+    def _sampled(
+        self, handler: Callable[..., Any], stats: HandlerStats
+    ) -> Callable[..., Any]:
+        traced = tracemalloc.get_traced_memory if self.memory else None
+
+        @wraps(handler)
+        def sampled(*args: Any, **kwargs: Any) -> Any:
+            before = traced()[0] if traced is not None else 0
+            started = time.perf_counter()
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                stats.record(elapsed, traced()[0] - before if traced else 0)
+
+        return sampled
+
+    def report(self) -> List[str]:
+        if not any(stats.calls for stats in self.stats.values()):
+            return []
+        lines = [f"GUI event handlers (slow = over {SLOW_FRAME_SECONDS * 1e3:.1f} ms):"]
+        for stats in self.stats.values():
+            lines += stats.describe(self.memory)
+        return lines
+
+
+class Profiler:
+    """Run a frontend under one profiling *mode* and write its report."""
+
+    def __init__(
+        self,
+        mode: str,
+        output: Union[str, Path, None] = None,
+        *,
+        top: int = DEFAULT_TOP,
+        stream: Optional[IO[str]] = None,
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(
+                f"Unknown profiling mode {mode!r}; choose one of {', '.join(MODES)}."
+            )
+        self.mode = mode
+        self.output = Path(output or DEFAULT_OUTPUTS[mode])
+        self.top = top
+        self.stream = stream if stream is not None else sys.stderr
+        self.sampler = HandlerSampler(memory=mode == "alloc")
+        self._profile: Optional[cProfile.Profile] = None
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._previous_handler: Any = None
+        self._running = False
+
+    def run(self, call: Callable[[], T]) -> T:
+        """Return ``call()``, profiled; the report is written however it exits."""
+
+        self.start()
+        try:
+            return call()
+        finally:
+            self.stop()
+
+    def start(self) -> None:
+        self.sampler.install_loaded()
+        self._install_signal()
+        self._running = True
+        if self.mode == "cpu":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            tracemalloc.start(_TRACEBACK_FRAMES)
+            self._baseline = _snapshot()
+
+    def stop(self) -> None:
+        if not self._running:
+            return
+        try:
+            self.write()
+        finally:
+            self._running = False
+            if self._profile is not None:
+                self._profile.disable()
+            if self.mode == "alloc":
+                tracemalloc.stop()
+            self._restore_signal()
+            self.sampler.uninstall()
+
+    def write(self) -> None:
+        """Write the report so far; profiling continues if it is running."""
+
+        if self.mode == "cpu":
+            self._write_cpu()
+        else:
+            self._write_alloc()
+
+    def _write_cpu(self) -> None:
+        assert self._profile is not None
+        self._profile.disable()
+        try:
+            self._profile.dump_stats(self.output)
+            stats = pstats.Stats(self._profile, stream=self.stream)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        finally:
+            if self._running:
+                self._profile.enable()
+        for line in self.sampler.report():
+            print(line, file=self.stream)
+        print(f"Wrote CPU profile to {self.output}", file=self.stream)
+
+    def _write_alloc(self) -> None:
+        snapshot = _snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [
+            f"Traced memory: {current / 1024:.1f} KiB now, {peak / 1024:.1f} KiB peak",
+            "",
+            "Largest live allocations:",
+        ]
+        lines += [f"  {stat}" for stat in snapshot.statistics("lineno")[: self.top]]
+        if self._baseline is not None:
+            grown = [
+                diff
+                for diff in snapshot.compare_to(self._baseline, "lineno")
+                if diff.size_diff > 0
+            ]
+            lines += ["", "Growth since start:"]
+            lines += [f"  {diff}" for diff in grown[: self.top]]
+        handlers = self.sampler.report()
+        if handlers:
+            lines += ["", *handlers]
+        self.output.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        print(f"Wrote allocation report to {self.output}", file=self.stream)
+
+    def _install_signal(self) -> None:
+        if not hasattr(signal, "SIGUSR1"):
+            return
+        if threading.current_thread() is not threading.main_thread():
+            return
+        self._previous_handler = signal.signal(
+            signal.SIGUSR1, lambda signum, frame: self.write()
+        )
+
+    def _restore_signal(self) -> None:
+        if self._previous_handler is not None:
+            signal.signal(signal.SIGUSR1, self._previous_handler)
+            self._previous_handler = None
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    """Take a snapshot without the import machinery's and tracemalloc's own."""
+
+    return tracemalloc.take_snapshot().filter_traces(
+        (
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        )
+    )
+
+
+def run(call: Callable[[], T], mode: str, output: Union[str, Path, None] = None) -> T:
+    """Return ``call()`` profiled in *mode*, writing the report to *output*."""
+
+    return Profiler(mode, output).run(call)
+
+
+__all__ = [
+    "DEFAULT_OUTPUTS",
+    "HandlerSampler",
+    "HandlerStats",
+    "MODES",
+    "Profiler",
+    "run",
+]
@@ -0,0 +1,386 @@
+"""Persistent Elo ratings backed by SQLite.
+
+Results are appended to a ``results`` log in batches (:meth:`RatingStore.record`
+buffers them; one ``executemany`` per ``batch_size`` results writes them) and
+ratings are recomputed separately by :meth:`RatingStore.update`, which takes
+every result logged since the previous pass as one *rating period*: each
+player's expected score is computed from the ratings at the start of the
+period, the rating changes are summed in memory, and one ``executemany``
+applies them. The log is never rewritten, so ratings can be rebuilt from it.
+
+The ``players_by_rating`` index makes :meth:`RatingStore.leaderboard` a
+bounded index scan however many players there are::
+
+    python -m tictactoe.ratings leaderboard --db ratings.db --limit 20
+    python -m tictactoe.ratings import tournament.jsonl --db ratings.db
+    python -m tictactoe.ratings bench --players 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from tictactoe.domain.logic import Player
+
+INITIAL_RATING = 1500.0
+DEFAULT_K = 24.0
+DEFAULT_BATCH_SIZE = 1000
+# Results folded into ratings per pass; keeps each period's memory bounded.
+DEFAULT_PERIOD = 100_000
+# Stay under SQLite's host-parameter limit on older builds.
+_CHUNK = 900
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    rating REAL NOT NULL,
+    games INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS players_by_rating ON players (rating DESC, id);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    x INTEGER NOT NULL REFERENCES players (id),
+    o INTEGER NOT NULL REFERENCES players (id),
+    score REAL NOT NULL  -- X's score: 1 win, 0.5 draw, 0 loss
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_SCORES = {Player.X: 1.0, Player.O: 0.0, None: 0.5}
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Standing:
+    """One leaderboard row."""
+
+    rank: int
+    name: str
+    rating: float
+    games: int
+
+
+def expected_score(rating: float, opponent: float) -> float:
+    """Return the Elo expected score of *rating* against *opponent*."""
+
+    return float(1.0 / (1.0 + 10.0 ** ((opponent - rating) / 400.0)))
+
+
+def _chunks(items: Sequence[T], size: int = _CHUNK) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+class RatingStore:
+    """Result log and Elo ratings in one SQLite database.
+
+    A store may be handed to another thread (the game server runs it on a
+    worker), but calls into it must not overlap.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        *,
+        k_factor: float = DEFAULT_K,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        """Open (creating if needed) the database at *path*.
+
+        Args:
+            path: Database file, or ``":memory:"``.
+            k_factor: Largest rating change one game can cause.
+            batch_size: Buffered results that trigger a write to the log.
+        """
+
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        self.k_factor = k_factor
+        self.batch_size = batch_size
+        self._pending: List[Tuple[str, str, float]] = []
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def __enter__(self) -> RatingStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Write buffered results and close the database."""
+
+        self.flush()
+        self._db.close()
+
+    @property
+    def pending(self) -> int:
+        """Return how many recorded results are still buffered in memory."""
+
+        return len(self._pending)
+
+    def record(self, x: str, o: str, winner: Optional[Player]) -> None:
+        """Log a finished game; *winner* is ``None`` for a draw.
+
+        Pass ``GameSnapshot.winner`` (or ``TicTacToe.get_winner()``) once the
+        game has left ``GameState.PLAYING``.
+        """
+
+        self._pending.append((x, o, _SCORES[winner]))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """Append buffered results to the log in one transaction.
+
+        Returns:
+            The number of results written.
+        """
+
+        pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+        with self._db:
+            ids = self._player_ids({name for x, o, _ in pending for name in (x, o)})
+            self._db.executemany(
+                "INSERT INTO results (x, o, score) VALUES (?, ?, ?)",
+                [(ids[x], ids[o], score) for x, o, score in pending],
+            )
+        return len(pending)
+
+    def update(self, period: int = DEFAULT_PERIOD) -> int:
+        """Fold every logged but unrated result into the ratings.
+
+        Results are taken *period* at a time; each batch is one rating period.
+
+        Returns:
+            The number of results applied.
+        """
+
+        self.flush()
+        applied = 0
+        while True:
+            (rated_through,) = self._db.execute(
+                "SELECT COALESCE(MAX(value), 0) FROM meta WHERE key = 'rated_through'"
+            ).fetchone()
+            rows = self._db.execute(
+                "SELECT id, x, o, score FROM results WHERE id > ? ORDER BY id LIMIT ?",
+                (rated_through, period),
+            ).fetchall()
+            if not rows:
+                return applied
+            with self._db:
+                self._apply_period(rows)
+            applied += len(rows)
+
+    def rating(self, name: str) -> Optional[float]:
+        """Return *name*'s rating, or ``None`` for an unknown player."""
+
+        row = self._db.execute(
+            "SELECT rating FROM players WHERE name = ?", (name,)
+        ).fetchone()
+        return None if row is None else float(row[0])
+
+    def rank(self, name: str) -> Optional[int]:
+        """Return *name*'s 1-based leaderboard position, or ``None``."""
+
+        rating = self.rating(name)
+        if rating is None:
+            return None
+        (better,) = self._db.execute(
+            "SELECT COUNT(*) FROM players WHERE rating > ?", (rating,)
+        ).fetchone()
+        return int(better) + 1
+
+    def leaderboard(self, limit: int = 10, offset: int = 0) -> List[Standing]:
+        """Return the top rated players, best first (an index range scan)."""
+
+        rows = self._db.execute(
+            "SELECT name, rating, games FROM players "
+            "ORDER BY rating DESC, id LIMIT ? OFFSET ?",
+            (limit, offset),
+        )
+        return [
+            Standing(offset + index + 1, name, rating, games)
+            for index, (name, rating, games) in enumerate(rows)
+        ]
+
+    def __len__(self) -> int:
+        (count,) = self._db.execute("SELECT COUNT(*) FROM players").fetchone()
+        return int(count)
+
+    def _player_ids(self, names: Iterable[str]) -> Dict[str, int]:
+        ordered = sorted(names)
+        self._db.executemany(
+            "INSERT OR IGNORE INTO players (name, rating) VALUES (?, ?)",
+            [(name, INITIAL_RATING) for name in ordered],
+        )
+        ids: Dict[str, int] = {}
+        for chunk in _chunks(ordered):
+            marks = ",".join("?" * len(chunk))
+            ids.update(
+                self._db.execute(
+                    f"SELECT name, id FROM players WHERE name IN ({marks})", chunk
+                )
+            )
+        return ids
+
+    def _apply_period(self, rows: List[Tuple[int, int, int, float]]) -> None:
+        players = sorted({player for _, x, o, _ in rows for player in (x, o)})
+        ratings: Dict[int, float] = {}
+        for chunk in _chunks(players):
+            marks = ",".join("?" * len(chunk))
+            ratings.update(
+                self._db.execute(
+                    f"SELECT id, rating FROM players WHERE id IN ({marks})", chunk
+                )
+            )
+
+        delta: Dict[int, float] = defaultdict(float)
+        games: Dict[int, int] = defaultdict(int)
+        k = self.k_factor
+        for _, x, o, score in rows:
+            change = k * (score - expected_score(ratings[x], ratings[o]))
+            delta[x] += change
+            delta[o] -= change
+            games[x] += 1
+            games[o] += 1
+
+        self._db.executemany(
+            "UPDATE players SET rating = rating + ?, games = games + ? WHERE id = ?",
+            [(delta[player], games[player], player) for player in players],
+        )
+        self._db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('rated_through', ?)",
+            (rows[-1][0],),
+        )
+
+
+def import_tournament(store: RatingStore, path: Path) -> int:
+    """Log every game of a tournament checkpoint file; return the count."""
+
+    from tictactoe.tournament import DRAW, GameRecord
+
+    count = 0
+    with open(path, encoding="utf-8") as handle:
+        handle.readline()  # the tournament config header
+        for line in handle:
+            try:
+                record = GameRecord.from_json(line)
+            except (ValueError, KeyError):
+                break  # a torn final line from an interrupted run
+            winner = None if record.result == DRAW else Player(record.result)
+            store.record(record.x, record.o, winner)
+            count += 1
+    return count
+
+
+def run_benchmark(players: int, games: int, seed: Optional[int] = None) -> str:
+    """Fill an in-memory store and time logging, rating and leaderboard queries."""
+
+    rng = random.Random(seed)
+    store = RatingStore(batch_size=10_000)
+    names = [f"player{index}" for index in range(players)]
+    outcomes = (Player.X, Player.O, None)
+
+    started = time.perf_counter()
+    for name in names:  # everybody plays at least once
+        store.record(name, rng.choice(names), rng.choice(outcomes))
+    for _ in range(max(0, games - players)):
+        store.record(rng.choice(names), rng.choice(names), rng.choice(outcomes))
+    store.flush()
+    logged = time.perf_counter() - started
+
+    started = time.perf_counter()
+    applied = store.update()
+    rated = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for page in range(100):
+        store.leaderboard(limit=20, offset=page * 20)
+    query = (time.perf_counter() - started) / 100
+    store.close()
+    return "\n".join(
+        [
+            f"Logged {max(games, players)} results in {logged:.2f}s",
+            f"Rated {applied} results for {players} players in {rated:.2f}s",
+            f"Leaderboard page (20 rows): {query * 1000:.3f} ms",
+        ]
+    )
+
+
+def _format_leaderboard(rows: Sequence[Standing]) -> str:
+    if not rows:
+        return "No rated players yet."
+    width = max(len(row.name) for row in rows)
+    return "\n".join(
+        f"{row.rank:>5}  {row.name.ljust(width)}  {row.rating:7.1f}  {row.games}"
+        for row in rows
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tictactoe.ratings",
+        description="Maintain Elo ratings from logged game results.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    board = commands.add_parser("leaderboard", help="Print the top players.")
+    board.add_argument("--db", type=Path, required=True, help="Rating database.")
+    board.add_argument("--limit", type=int, default=10)
+    board.add_argument("--offset", type=int, default=0)
+    imported = commands.add_parser(
+        "import", help="Log the games of a tournament checkpoint and re-rate."
+    )
+    imported.add_argument("checkpoint", type=Path)
+    imported.add_argument("--db", type=Path, required=True, help="Rating database.")
+    bench = commands.add_parser("bench", help="Time an in-memory rating run.")
+    bench.add_argument("--players", type=int, default=100_000)
+    bench.add_argument("--games", type=int, default=0, help="Results to log.")
+    bench.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        if args.players < 2:
+            parser.error("--players must be at least 2")
+        print(run_benchmark(args.players, args.games, args.seed))
+        return 0
+    try:
+        with RatingStore(args.db) as store:
+            if args.command == "import":
+                count = import_tournament(store, args.checkpoint)
+                store.update()
+                print(f"Imported {count} games into {args.db}")
+            else:
+                print(_format_leaderboard(store.leaderboard(args.limit, args.offset)))
+    except (OSError, sqlite3.Error, ValueError) as exc:
+        raise SystemExit(str(exc)) from exc
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,338 @@
+"""Compact binary archive of played games.
+
+A record file starts with a small header followed by the games back to
+back::
+
+    header  magic "TTTR", format version, board size, win length, cell bits
+    record  one byte move count, then the cell indices packed ``cell bits``
+            wide (low nibble first for 4-bit cells)
+
+Boards of up to 16 cells (3x3 and 4x4) use 4-bit cells, so a full 3x3 game
+takes six bytes; larger boards fall back to one byte per move. Files are
+append-only: :class:`RecordWriter` adds games in bulk and
+:class:`RecordReader` memory-maps the file, iterates records without copying
+them and builds an offset index on demand for random access to game N.
+
+Convert to and from the CLI's comma separated ``--script`` format with
+``python -m tictactoe.records pack`` / ``unpack``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import struct
+import sys
+from array import array
+from contextlib import suppress
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from tictactoe.domain.logic import line_index
+
+_MAGIC = b"TTTR"
+_VERSION = 1
+# magic, format version, board size, win length, bits per cell index
+_HEADER = struct.Struct("<4sBBBB")
+_MAX_CELLS = 255
+
+Moves = Tuple[int, ...]
+
+# Byte value -> (low nibble, high nibble), used to unpack 4-bit records.
+_NIBBLES: Tuple[Tuple[int, int], ...] = tuple(
+    (value & 0xF, value >> 4) for value in range(256)
+)
+
+
+class RecordFormatError(ValueError):
+    """Raised when a record file is truncated, corrupt or of another version."""
+
+
+def parse_script(script: str, cell_count: int = 9) -> Moves:
+    """Parse a comma separated move list such as ``"0,4,8"``.
+
+    Raises:
+        ValueError: if the list is empty, a move is not a number or a move is
+            outside the board
+    """
+
+    tokens = [token.strip() for token in script.split(",") if token.strip()]
+    if not tokens:
+        raise ValueError("Script must contain at least one move.")
+    moves: List[int] = []
+    for token in tokens:
+        try:
+            value = int(token)
+        except ValueError:
+            raise ValueError(f"Move {token!r} is not a number.") from None
+        if value < 0 or value >= cell_count:
+            raise ValueError(f"Moves must be between 0 and {cell_count - 1}.")
+        moves.append(value)
+    return tuple(moves)
+
+
+def format_script(moves: Iterable[int]) -> str:
+    """Return *moves* in the CLI's ``--script`` format."""
+
+    return ",".join(str(move) for move in moves)
+
+
+def _cell_bits(size: int) -> int:
+    return 4 if size * size <= 16 else 8
+
+
+def _packed_length(count: int, bits: int) -> int:
+    return (count + 1) // 2 if bits == 4 else count
+
+
+def encode_record(moves: Sequence[int], cell_count: int) -> bytes:
+    """Pack one game (move count byte plus packed cell indices)."""
+
+    if len(moves) > cell_count:
+        raise ValueError(f"A game has at most {cell_count} moves.")
+    for move in moves:
+        if move < 0 or move >= cell_count:
+            raise ValueError(f"Moves must be between 0 and {cell_count - 1}.")
+    if cell_count > 16:
+        return bytes((len(moves), *moves))
+    packed = bytearray((len(moves),))
+    for index in range(0, len(moves) - 1, 2):
+        packed.append(moves[index] | moves[index + 1] << 4)
+    if len(moves) % 2:
+        packed.append(moves[-1])
+    return bytes(packed)
+
+
+def is_record_file(path: Path) -> bool:
+    """Return True if *path* starts with the record-file magic bytes."""
+
+    with open(path, "rb") as handle:
+        return handle.read(len(_MAGIC)) == _MAGIC
+
+
+def _read_header(data: bytes, source: object) -> Tuple[int, int, int]:
+    if len(data) < _HEADER.size:
+        raise RecordFormatError(f"{source} is too small to be a record file")
+    magic, version, size, win_length, bits = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC or version != _VERSION or bits != _cell_bits(size):
+        raise RecordFormatError(f"{source} is not a version {_VERSION} record file")
+    return size, win_length, bits
+
+
+class RecordWriter:
+    """Append games to a record file, creating it (and its header) if needed."""
+
+    def __init__(
+        self, path: Path, size: int = 3, win_length: Optional[int] = None
+    ) -> None:
+        lines = line_index(size, win_length)
+        if lines.cell_count > _MAX_CELLS:
+            raise ValueError(f"Records support at most {_MAX_CELLS} cells.")
+        self.path = path
+        self.size = lines.size
+        self.win_length = lines.win_length
+        self.cell_count = lines.cell_count
+        header = _HEADER.pack(
+            _MAGIC, _VERSION, self.size, self.win_length, _cell_bits(self.size)
+        )
+
+        self._handle: IO[bytes] = open(path, "ab")
+        if self._handle.tell() == 0:
+            self._handle.write(header)
+        else:
+            with open(path, "rb") as existing:
+                found = existing.read(_HEADER.size)
+            if found != header:
+                self._handle.close()
+                _read_header(found, path)
+                raise RecordFormatError(
+                    f"{path} holds games for a different board configuration"
+                )
+
+    def append(self, moves: Sequence[int]) -> None:
+        """Add one game."""
+
+        self._handle.write(encode_record(moves, self.cell_count))
+
+    def extend(self, games: Iterable[Sequence[int]]) -> int:
+        """Add many games with a single write and return how many were added."""
+
+        buffer = bytearray()
+        count = 0
+        for moves in games:
+            buffer += encode_record(moves, self.cell_count)
+            count += 1
+        self._handle.write(buffer)
+        return count
+
+    def flush(self) -> None:
+        self._handle.flush()
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __enter__(self) -> RecordWriter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class RecordReader:
+    """Memory-mapped, read-only view over a record file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as handle:
+            try:
+                self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:  # empty file
+                raise RecordFormatError(f"{path} is empty") from exc
+        try:
+            self.size, self.win_length, self._bits = _read_header(
+                self._map[: _HEADER.size], path
+            )
+        except RecordFormatError:
+            self.close()
+            raise
+        self.cell_count = self.size * self.size
+        self._offsets: Optional[array] = None
+
+    def close(self) -> None:
+        """Release the memory map.
+
+        While views from :meth:`iter_raw` are still held the mapping cannot
+        be unmapped; it is then freed with the last object referring to it.
+        """
+
+        with suppress(BufferError):
+            self._map.close()
+
+    def __enter__(self) -> RecordReader:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def iter_raw(self) -> Iterator[memoryview]:
+        """Yield each record's packed bytes as a view into the mapping.
+
+        Release views once done with them; any still held keep the mapping
+        alive past :meth:`close`.
+        """
+
+        view = memoryview(self._map)
+        try:
+            offset = _HEADER.size
+            end = len(view)
+            bits = self._bits
+            while offset < end:
+                length = 1 + _packed_length(view[offset], bits)
+                if offset + length > end:
+                    raise RecordFormatError(f"{self.path} ends with a truncated record")
+                yield view[offset : offset + length]
+                offset += length
+        finally:
+            view.release()
+
+    def __iter__(self) -> Iterator[Moves]:
+        for raw in self.iter_raw():
+            yield self._decode(raw)
+            raw.release()
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def __getitem__(self, number: int) -> Moves:
+        """Return game *number* (negative numbers count from the end)."""
+
+        offsets = self._index()
+        offset = offsets[number]
+        length = 1 + _packed_length(self._map[offset], self._bits)
+        return self._decode(self._map[offset : offset + length])
+
+    def _index(self) -> array:
+        """Return the byte offset of every record, scanning the file once."""
+
+        if self._offsets is None:
+            offsets = array("Q")
+            data = self._map
+            offset = _HEADER.size
+            end = len(data)
+            bits = self._bits
+            while offset < end:
+                length = 1 + _packed_length(data[offset], bits)
+                if offset + length > end:
+                    raise RecordFormatError(f"{self.path} ends with a truncated record")
+                offsets.append(offset)
+                offset += length
+            self._offsets = offsets
+        return self._offsets
+
+    def _decode(self, raw: Sequence[int]) -> Moves:
+        count = raw[0]
+        if self._bits == 8:
+            return tuple(raw[1 : 1 + count])
+        moves: List[int] = []
+        for byte in raw[1:]:
+            moves.extend(_NIBBLES[byte])
+        del moves[count:]
+        return tuple(moves)
+
+
+def _pack(args: argparse.Namespace) -> int:
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        with RecordWriter(args.output, args.size, args.win_length) as writer:
+            games = (
+                parse_script(line, writer.cell_count)
+                for line in source
+                if line.strip() and not line.startswith("#")
+            )
+            count = writer.extend(games)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    print(f"Packed {count} games into {args.output}", file=sys.stderr)
+    return 0
+
+
+def _unpack(args: argparse.Namespace) -> int:
+    with RecordReader(args.input) as reader:
+        write = sys.stdout.write
+        for moves in reader:
+            write(format_script(moves) + "\n")
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Convert between ``--script`` text files and binary record files."""
+
+    parser = argparse.ArgumentParser(
+        prog="python -m tictactoe.records",
+        description="Convert game records between script text and binary form.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack = commands.add_parser(
+        "pack", help="Append one-game-per-line scripts to a record file."
+    )
+    pack.add_argument("input", help="Script file, or '-' for stdin.")
+    pack.add_argument("output", type=Path, help="Record file to append to.")
+    pack.add_argument("--size", type=int, default=3, help="Board size.")
+    pack.add_argument("--win-length", type=int, help="Marks in a row to win.")
+    pack.set_defaults(handler=_pack)
+    unpack = commands.add_parser(
+        "unpack", help="Print every game in a record file as a script line."
+    )
+    unpack.add_argument("input", type=Path, help="Record file to read.")
+    unpack.set_defaults(handler=_unpack)
+
+    args = parser.parse_args(argv)
+    try:
+        return int(args.handler(args))
+    except (OSError, ValueError) as exc:
+        raise SystemExit(str(exc)) from exc
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
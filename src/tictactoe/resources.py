@@ -0,0 +1,72 @@
+"""Locate files shipped in the ``tictactoe/assets`` directory."""
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+from importlib import resources
+from pathlib import Path
+from typing import Dict, Optional
+
+ASSETS_DIR = Path(__file__).resolve().parent / "assets"
+
+_ASSET_CACHE: Dict[str, Path] = {}
+
+
+def locate_asset(name: str) -> Optional[Path]:
+    """Resolve an asset path from source or installed package data."""
+
+    cached = _ASSET_CACHE.get(name)
+    if cached and cached.exists():
+        return cached
+
+    source_candidate = ASSETS_DIR / name
+    if source_candidate.exists():
+        _ASSET_CACHE[name] = source_candidate
+        return source_candidate
+
+    package_candidate = _locate_package_asset(name)
+    if package_candidate is not None:
+        _ASSET_CACHE[name] = package_candidate
+        return package_candidate
+
+    return None
+
+
+def _locate_package_asset(name: str) -> Optional[Path]:
+    """Locate an asset via importlib.resources for installed packages."""
+
+    files_fn = getattr(resources, "files", None)
+    if files_fn is None:
+        return None
+
+    try:
+        asset_resource = files_fn("tictactoe") / "assets" / name
+    except ModuleNotFoundError:
+        return None
+
+    try:
+        asset_path = Path(asset_resource)
+        if asset_path.exists():
+            return asset_path
+    except TypeError:
+        pass
+
+    as_file_fn = getattr(resources, "as_file", None)
+    if as_file_fn is None:
+        return None
+
+    try:
+        with as_file_fn(asset_resource) as extracted_path:
+            extracted = Path(extracted_path)
+            if not extracted.exists():
+                return None
+            temp_dir = Path(tempfile.gettempdir()) / "tictactoe"
+            temp_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = temp_dir / name
+            shutil.copyfile(extracted, temp_path)
+            return temp_path
+    except FileNotFoundError:
+        return None
+
+    return None
@@ -0,0 +1,15 @@
+"""Network frontend: host games over TCP with line-delimited JSON."""
+
+from .matchmaking import Matchmaker, QueueFullError
+from .server import GameServer, main
+from .sessions import Session, SessionLimitError, SessionStore
+
+__all__ = [
+    "GameServer",
+    "Matchmaker",
+    "QueueFullError",
+    "Session",
+    "SessionLimitError",
+    "SessionStore",
+    "main",
+]
@@ -0,0 +1,131 @@
+"""Memory benchmark for parked sessions.
+
+Fills a :class:`SessionStore` with part-played games and measures, with
+:mod:`tracemalloc`, what each session costs live and parked::
+
+    python -m tictactoe.server.bench --sessions 1000000
+
+Live sessions are measured on a smaller sample (``--sample``) because a
+million full engines would need gigabytes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from tictactoe.server.sessions import Session, SessionStore
+
+
+@dataclass
+class MemoryReport:
+    """Bytes per session measured for one store configuration."""
+
+    sessions: int
+    live_bytes: float
+    parked_bytes: float
+    park_seconds: float
+
+    def format(self) -> str:
+        million = 1_000_000
+        return "\n".join(
+            [
+                f"Live session:   {self.live_bytes:8.0f} bytes "
+                f"({self.live_bytes * million / 2**20:,.0f} MiB per million)",
+                f"Parked session: {self.parked_bytes:8.0f} bytes "
+                f"({self.parked_bytes * million / 2**20:,.0f} MiB per million)",
+                f"Parked {self.sessions} sessions in {self.park_seconds:.2f}s",
+            ]
+        )
+
+
+def _fill(store: SessionStore, count: int, size: int, rng: random.Random) -> None:
+    for _ in range(count):
+        game = store.create(size).game
+        # Leave each game somewhere between empty and nearly full.
+        for _ in range(rng.randrange(game.cell_count)):
+            if not game.make_move(rng.randrange(game.cell_count)):
+                break
+
+
+def _bytes_per_session(
+    count: int, size: int, seed: Optional[int], max_live: Optional[int]
+) -> float:
+    rng = random.Random(seed)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        store = SessionStore(max_live=max_live, park_after=None)
+        _fill(store, count, size, rng)
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    del store
+    return used / count
+
+
+def run_benchmark(
+    sessions: int = 100_000,
+    *,
+    sample: int = 10_000,
+    size: int = 3,
+    seed: Optional[int] = None,
+) -> MemoryReport:
+    """Measure live and parked bytes per session.
+
+    Parked sessions are created under ``max_live=1``, so each one is parked
+    as soon as the next is created and the live engines never pile up.
+    """
+
+    live = _bytes_per_session(min(sample, sessions), size, seed, None)
+    parked = _bytes_per_session(sessions, size, seed, 1)
+
+    # Time parking alone, outside tracemalloc.
+    store = SessionStore(max_live=None, park_after=None)
+    _fill(store, min(sample, sessions), size, random.Random(seed))
+    batch: List[Session] = store.sessions()
+    started = time.perf_counter()
+    for session in batch:
+        session.park()
+    park_seconds = (time.perf_counter() - started) * sessions / len(batch)
+    return MemoryReport(sessions, live, parked, park_seconds)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tictactoe.server.bench",
+        description="Measure the memory cost of live and parked sessions.",
+    )
+    parser.add_argument(
+        "--sessions",
+        type=int,
+        default=100_000,
+        help="Parked sessions to create (default: 100000).",
+    )
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=10_000,
+        help="Live sessions to measure (default: 10000).",
+    )
+    parser.add_argument("--size", type=int, default=3, help="Board size.")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible games.")
+    args = parser.parse_args(argv)
+    if args.sessions < 1 or args.sample < 1:
+        parser.error("--sessions and --sample must be positive.")
+    report = run_benchmark(
+        args.sessions, sample=args.sample, size=args.size, seed=args.seed
+    )
+    print(report.format())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
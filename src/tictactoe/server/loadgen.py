@@ -0,0 +1,253 @@
+"""Local load generator for the game server.
+
+Opens a crowd of idle connections and/or plays random games through the
+protocol, then reports throughput, move latency and the server's own
+connection count and peak memory::
+
+    python -m tictactoe server &
+    python -m tictactoe.server.loadgen --idle 10000 --games 2000 --concurrency 50
+
+With ``--matched`` the playing connections queue for the matchmaker instead
+and play each seat of the rooms they are paired into; the report then adds
+the server's matchmaking wait-time histogram.
+
+Each connection uses a file descriptor on both sides; raise ``ulimit -n``
+above the number of idle connections first.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+from tictactoe.server.protocol import EMPTY_CELL, Message, encode
+from tictactoe.server.server import DEFAULT_HOST, DEFAULT_PORT
+
+Stream = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+@dataclass
+class LoadReport:
+    """Results of one load-generation run."""
+
+    idle_connections: int = 0
+    games: int = 0
+    moves: int = 0
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    server_stats: Optional[Message] = None
+
+    def percentile(self, fraction: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def format(self) -> str:
+        lines = [f"Idle connections held: {self.idle_connections}"]
+        if self.games:
+            rate = self.games / self.elapsed if self.elapsed else 0.0
+            lines.append(
+                f"Games: {self.games} ({self.moves} moves) in {self.elapsed:.2f}s "
+                f"= {rate:.0f} games/s"
+            )
+            lines.append(
+                f"Move latency: p50 {self.percentile(0.5) * 1000:.2f} ms, "
+                f"p99 {self.percentile(0.99) * 1000:.2f} ms"
+            )
+        if self.server_stats:
+            stats = self.server_stats
+            lines.append(
+                f"Server: {stats['connections']} connections, "
+                f"{stats['sessions']} sessions ({stats['parked']} parked), "
+                f"peak RSS {stats['max_rss_kb']} KiB"
+            )
+            if stats.get("matches"):
+                waits = ", ".join(
+                    f"{label}: {count}" for label, count in stats["wait_ms"].items()
+                )
+                lines.append(
+                    f"Matchmaking: {stats['matches']} matches, "
+                    f"max wait {stats['max_wait_ms']} ms ({waits})"
+                )
+        return "\n".join(lines)
+
+
+async def _request(stream: Stream, message: Message, expect: str) -> Message:
+    """Send *message* and return the first reply of type *expect*."""
+
+    reader, writer = stream
+    writer.write(encode(message))
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection.")
+        reply: Message = json.loads(line)
+        if reply["type"] == "error":
+            raise RuntimeError(reply["message"])
+        if reply["type"] == expect:
+            return reply
+
+
+async def open_idle(host: str, port: int, count: int, batch: int = 500) -> List[Stream]:
+    """Open *count* connections that stay silent until closed."""
+
+    streams: List[Stream] = []
+    while len(streams) < count:
+        size = min(batch, count - len(streams))
+        streams += await asyncio.gather(
+            *(asyncio.open_connection(host, port) for _ in range(size))
+        )
+    return streams
+
+
+async def play_random_game(
+    stream: Stream, rng: random.Random, report: LoadReport
+) -> None:
+    """Play both sides of one game with uniformly random moves."""
+
+    snapshot = await _request(stream, {"op": "new"}, "snapshot")
+    while snapshot["state"] == "playing":
+        empty = [i for i, cell in enumerate(snapshot["board"]) if cell == EMPTY_CELL]
+        started = time.perf_counter()
+        snapshot = await _request(
+            stream, {"op": "move", "position": rng.choice(empty)}, "snapshot"
+        )
+        report.latencies.append(time.perf_counter() - started)
+        report.moves += 1
+    report.games += 1
+
+
+async def play_matched_game(
+    stream: Stream, rng: random.Random, report: LoadReport
+) -> None:
+    """Queue for an opponent and play our seat of the room with random moves."""
+
+    seat = (await _request(stream, {"op": "queue"}, "matched"))["seat"]
+    reader, writer = stream
+    sent = 0.0
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection.")
+        message: Message = json.loads(line)
+        if message["type"] == "closed":
+            break
+        if message["type"] != "snapshot":
+            continue
+        if sent:
+            report.latencies.append(time.perf_counter() - sent)
+            sent = 0.0
+        if message["state"] == "playing" and message["current"] == seat:
+            board = message["board"]
+            empty = [i for i, cell in enumerate(board) if cell == EMPTY_CELL]
+            sent = time.perf_counter()
+            writer.write(encode({"op": "move", "position": rng.choice(empty)}))
+            report.moves += 1
+    if seat == "X":
+        report.games += 1
+
+
+async def run_load(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    *,
+    idle: int = 0,
+    games: int = 0,
+    concurrency: int = 10,
+    seed: Optional[int] = None,
+    matched: bool = False,
+) -> LoadReport:
+    """Hold *idle* connections open while *games* games are played.
+
+    With *matched*, an even number of players queue for the matchmaker and
+    each plays enough rooms for *games* in total (rounded up).
+    """
+
+    report = LoadReport()
+    idle_streams = await open_idle(host, port, idle)
+    report.idle_connections = len(idle_streams)
+    remaining = games
+
+    players = min(concurrency, games)
+    if matched:
+        players = max(2, players + players % 2)
+        rounds = -(-2 * games // players)
+
+    async def player(index: int) -> None:
+        nonlocal remaining
+        rng = random.Random(None if seed is None else seed + index)
+        stream = await asyncio.open_connection(host, port)
+        try:
+            if matched:
+                for _ in range(rounds):
+                    await play_matched_game(stream, rng, report)
+            else:
+                while remaining > 0:
+                    remaining -= 1
+                    await play_random_game(stream, rng, report)
+        finally:
+            stream[1].close()
+
+    started = time.perf_counter()
+    if games:
+        await asyncio.gather(*(player(i) for i in range(players)))
+    report.elapsed = time.perf_counter() - started
+
+    probe = await asyncio.open_connection(host, port)
+    report.server_stats = await _request(probe, {"op": "stats"}, "stats")
+    probe[1].close()
+    for _, writer in idle_streams:
+        writer.close()
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tictactoe.server.loadgen",
+        description="Generate load against a running game server.",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--idle", type=int, default=0, help="Idle connections to hold open."
+    )
+    parser.add_argument("--games", type=int, default=100, help="Games to play.")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=10,
+        help="Connections playing games at the same time (default: 10).",
+    )
+    parser.add_argument("--seed", type=int, help="Seed for reproducible moves.")
+    parser.add_argument(
+        "--matched",
+        action="store_true",
+        help="Pair the playing connections through the matchmaking queue.",
+    )
+    args = parser.parse_args(argv)
+    try:
+        report = asyncio.run(
+            run_load(
+                args.host,
+                args.port,
+                idle=args.idle,
+                games=args.games,
+                concurrency=args.concurrency,
+                seed=args.seed,
+                matched=args.matched,
+            )
+        )
+    except OSError as exc:
+        raise SystemExit(f"Cannot reach {args.host}:{args.port}: {exc}") from exc
+    print(report.format())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,224 @@
+"""Matchmaking queue pairing waiting clients by board and rating.
+
+Waiting clients hold a :class:`Ticket` in a FIFO queue keyed by board
+configuration and rating bucket (``rating // bucket_width``). A new ticket
+is paired at once with the oldest ticket in its own bucket; a ticket that has
+waited ``widen_after`` seconds also accepts the next bucket on either side,
+widening by one more bucket per further ``widen_after``, so no client waits
+forever for an exact match. :meth:`Matchmaker.sweep` performs that widening
+for tickets nobody new has arrived for.
+
+Enqueueing, cancelling and same-bucket pairing are O(1); cancelled tickets
+are skipped lazily when they reach the front of their queue.
+"""
+
+from __future__ import annotations
+
+import bisect
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+DEFAULT_RATING = 1500
+DEFAULT_BUCKET_WIDTH = 200
+DEFAULT_WIDEN_AFTER = 2.0
+
+QueueKey = Tuple[int, int, int]  # (size, win_length, rating bucket)
+Pair = Tuple["Ticket", "Ticket"]
+
+# Widening stops after this many buckets either side of the ticket's own.
+_MAX_REACH = 50
+
+# Upper bounds of the wait-time histogram buckets, in milliseconds.
+WAIT_BOUNDS_MS: Tuple[float, ...] = (1, 5, 10, 50, 100, 500, 1000, 5000, 10000)
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the matchmaking queue is at its configured capacity."""
+
+
+class Ticket:
+    """One client waiting for an opponent."""
+
+    __slots__ = ("client", "key", "enqueued", "active")
+
+    def __init__(self, client: Any, key: QueueKey, enqueued: float) -> None:
+        self.client = client
+        self.key = key
+        self.enqueued = enqueued
+        self.active = True
+
+    @property
+    def size(self) -> int:
+        return self.key[0]
+
+    @property
+    def win_length(self) -> int:
+        return self.key[1]
+
+
+class WaitHistogram:
+    """Counts of queueing delays in fixed millisecond buckets."""
+
+    def __init__(self, bounds_ms: Tuple[float, ...] = WAIT_BOUNDS_MS) -> None:
+        self.bounds_ms = bounds_ms
+        # One extra bucket for waits above the largest bound.
+        self.counts = [0] * (len(bounds_ms) + 1)
+        self.total = 0
+        self.max_ms = 0.0
+
+    def record(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.bounds_ms, ms)] += 1
+        self.total += 1
+        self.max_ms = max(self.max_ms, ms)
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return ``{"<=1": n, ..., ">10000": n}`` keyed by bucket bound."""
+
+        labels = [f"<={bound:g}" for bound in self.bounds_ms]
+        labels.append(f">{self.bounds_ms[-1]:g}")
+        return dict(zip(labels, self.counts))
+
+
+class Matchmaker:
+    """FIFO matchmaking queues with rating buckets that widen over time."""
+
+    def __init__(
+        self,
+        *,
+        bucket_width: int = DEFAULT_BUCKET_WIDTH,
+        widen_after: float = DEFAULT_WIDEN_AFTER,
+        max_queue: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create an empty matchmaker.
+
+        Args:
+            bucket_width: Rating points per bucket.
+            widen_after: Seconds a ticket waits before each widening step.
+            max_queue: Most tickets allowed to wait (``None``: no limit).
+            clock: Monotonic time source, replaceable in tests.
+        """
+
+        if bucket_width < 1:
+            raise ValueError("bucket_width must be at least 1.")
+        if widen_after <= 0:
+            raise ValueError("widen_after must be positive.")
+        self.bucket_width = bucket_width
+        self.widen_after = widen_after
+        self.max_queue = max_queue
+        self._clock = clock
+        self._queues: Dict[QueueKey, Deque[Ticket]] = {}
+        self.depth = 0
+        self.matches = 0
+        self.waits = WaitHistogram()
+
+    def __len__(self) -> int:
+        return self.depth
+
+    def enqueue(
+        self,
+        client: Any,
+        *,
+        size: int = 3,
+        win_length: Optional[int] = None,
+        rating: int = DEFAULT_RATING,
+    ) -> Tuple[Ticket, Optional[Pair]]:
+        """Queue *client*, pairing it immediately if an opponent is waiting.
+
+        Returns:
+            The client's ticket and, when matched, the ``(older, newer)``
+            ticket pair (both already removed from the queue).
+
+        Raises:
+            QueueFullError: if ``max_queue`` tickets are already waiting
+        """
+
+        now = self._clock()
+        win_length = size if win_length is None else win_length
+        key = (size, win_length, rating // self.bucket_width)
+        ticket = Ticket(client, key, now)
+        opponent = self._pop(key)
+        if opponent is not None:
+            return ticket, self._pair(opponent, ticket, now)
+        if self.max_queue is not None and self.depth >= self.max_queue:
+            raise QueueFullError("The matchmaking queue is full.")
+        self._queues.setdefault(key, deque()).append(ticket)
+        self.depth += 1
+        return ticket, None
+
+    def cancel(self, ticket: Ticket) -> bool:
+        """Withdraw a waiting ticket; return False if it was already matched."""
+
+        if not ticket.active:
+            return False
+        ticket.active = False
+        self.depth -= 1
+        return True
+
+    def sweep(self) -> List[Pair]:
+        """Pair tickets that have waited long enough to widen their bucket."""
+
+        now = self._clock()
+        pairs: List[Pair] = []
+        for key in sorted(self._queues):
+            while True:
+                ticket = self._peek(key)
+                if ticket is None:
+                    break
+                waited = now - ticket.enqueued
+                reach = min(_MAX_REACH, int(waited / self.widen_after))
+                opponent_key = self._nearest_waiting(key, reach)
+                if opponent_key is None:
+                    break
+                self._pop(key)
+                opponent = self._pop(opponent_key)
+                assert opponent is not None
+                older, newer = sorted((ticket, opponent), key=lambda t: t.enqueued)
+                pairs.append(self._pair(older, newer, now))
+        return pairs
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, match count and the wait-time histogram."""
+
+        return {
+            "queued": self.depth,
+            "matches": self.matches,
+            "wait_ms": self.waits.as_dict(),
+            "max_wait_ms": round(self.waits.max_ms, 3),
+        }
+
+    def _nearest_waiting(self, key: QueueKey, reach: int) -> Optional[QueueKey]:
+        size, win_length, bucket = key
+        for distance in range(1, reach + 1):
+            for candidate in (bucket - distance, bucket + distance):
+                other = (size, win_length, candidate)
+                if self._peek(other) is not None:
+                    return other
+        return None
+
+    def _peek(self, key: QueueKey) -> Optional[Ticket]:
+        queue = self._queues.get(key)
+        while queue:
+            if queue[0].active:
+                return queue[0]
+            queue.popleft()
+        if queue is not None:
+            del self._queues[key]
+        return None
+
+    def _pop(self, key: QueueKey) -> Optional[Ticket]:
+        ticket = self._peek(key)
+        if ticket is not None:
+            self._queues[key].popleft()
+            ticket.active = False
+            self.depth -= 1
+        return ticket
+
+    def _pair(self, older: Ticket, newer: Ticket, now: float) -> Pair:
+        self.matches += 1
+        for ticket in (older, newer):
+            ticket.active = False
+            self.waits.record(now - ticket.enqueued)
+        return older, newer
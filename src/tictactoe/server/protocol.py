@@ -0,0 +1,89 @@
+"""Line-delimited JSON protocol spoken by the game server.
+
+Every message is one JSON object terminated by ``\\n``. Clients send
+requests carrying an ``op`` field; the server answers with messages carrying
+a ``type`` field and pushes a ``snapshot`` message to every client attached
+to a session whenever its game changes::
+
+    -> {"op": "new", "size": 3}
+    <- {"type": "session", "session": "k3J9..."}
+    <- {"type": "snapshot", "session": "k3J9...", "board": ".........",
+        "current": "X", "state": "playing", "winner": null}
+    -> {"op": "move", "position": 4}
+    <- {"type": "snapshot", ..., "board": "....X....", "current": "O", ...}
+
+Requests: ``new`` (optional ``size``/``win_length``; boards are at most
+15x15), ``join`` (``session``), ``move`` (``position``), ``undo``, ``reset``,
+``leave``, ``ping`` and ``stats`` (connection/session counts, matchmaking
+queue depth and wait times, peak memory).
+
+``queue`` (optional ``size``/``win_length``/``rating``/``name``) waits for an opponent
+(``{"type": "queued"}``) until ``unqueue``. Once paired, both clients receive
+``{"type": "matched", "session": ..., "seat": "X"}`` (or ``"O"``) and a
+snapshot; only the seated player to move may ``move``, and ``undo``/``reset``
+are refused. When the game ends or a player leaves, every client in the room
+receives ``{"type": "closed", "session": ..., "reason": ...}`` with reason
+``finished`` or ``opponent_left``.
+Finished games between two named players are logged for rating when the
+server keeps a rating database; a named player queues at their stored rating
+unless ``rating`` is given.
+Failures are reported as ``{"type": "error", "message": ...}`` and leave
+the connection open.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Optional
+
+from tictactoe.domain.logic import BoardTuple, GameSnapshot
+
+Message = Dict[str, Any]
+
+EMPTY_CELL = "."
+
+
+class ProtocolError(ValueError):
+    """Raised when a client sends something that is not a valid request."""
+
+
+def encode(message: Message) -> bytes:
+    """Serialize *message* as one protocol line."""
+
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+def decode(line: bytes) -> Message:
+    """Parse one protocol line into a request dictionary."""
+
+    try:
+        message = json.loads(line)
+    except ValueError as exc:
+        raise ProtocolError("Messages must be JSON objects.") from exc
+    if not isinstance(message, dict):
+        raise ProtocolError("Messages must be JSON objects.")
+    return message
+
+
+def board_string(board: BoardTuple) -> str:
+    """Return *board* as one character per cell (``X``, ``O`` or ``.``)."""
+
+    return "".join(EMPTY_CELL if cell is None else cell.value for cell in board)
+
+
+def snapshot_message(session_id: str, snapshot: GameSnapshot) -> Message:
+    """Return the ``snapshot`` push for *session_id*."""
+
+    winner: Optional[str] = snapshot.winner.value if snapshot.winner else None
+    return {
+        "type": "snapshot",
+        "session": session_id,
+        "board": board_string(snapshot.board),
+        "current": snapshot.current_player.value,
+        "state": snapshot.state.value,
+        "winner": winner,
+    }
+
+
+def error_message(text: str) -> Message:
+    return {"type": "error", "message": text}
@@ -0,0 +1,571 @@
+"""asyncio TCP server hosting games over the line-delimited JSON protocol."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple, TypeVar
+
+from tictactoe.domain.logic import GameState, Player, line_index
+from tictactoe.ratings import RatingStore
+from tictactoe.server.matchmaking import (
+    DEFAULT_BUCKET_WIDTH,
+    DEFAULT_RATING,
+    DEFAULT_WIDEN_AFTER,
+    Matchmaker,
+    Pair,
+    QueueFullError,
+    Ticket,
+)
+from tictactoe.server.protocol import (
+    Message,
+    ProtocolError,
+    decode,
+    encode,
+    error_message,
+)
+from tictactoe.server.sessions import (
+    DEFAULT_MAX_LIVE,
+    DEFAULT_PARK_AFTER,
+    Session,
+    SessionLimitError,
+    SessionStore,
+)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Requests are tiny; a small limit keeps each idle connection's buffer small.
+DEFAULT_MAX_LINE = 1024
+# Pause reading from a client whose pushes are piling up past this many bytes.
+_WRITE_HIGH_WATER = 64 * 1024
+# Drop a client that has stopped reading once this many bytes are unsent.
+MAX_WRITE_BUFFER = 256 * 1024
+# Longest player name accepted by ``queue``.
+_MAX_NAME = 64
+# Largest board a client may ask for; bigger line indexes take too long to build.
+MAX_BOARD_SIZE = 15
+# Seconds between matchmaking widening / session parking sweeps.
+DEFAULT_SWEEP_INTERVAL = 0.5
+
+T = TypeVar("T")
+Handler = Callable[["Connection", Message], Optional[Awaitable[None]]]
+
+
+def _resident_kb() -> Optional[int]:
+    """Return the peak resident set size of this process, where available."""
+
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class Connection:
+    """Server-side state of one client: its stream, session and queue ticket."""
+
+    __slots__ = ("writer", "session", "ticket", "name")
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        self.session: Optional[Session] = None
+        self.ticket: Optional[Ticket] = None
+        self.name: Optional[str] = None
+
+    def send(self, data: bytes) -> None:
+        """Queue *data*, dropping a client that lets its pushes pile up.
+
+        Only a client's own request loop waits for its buffer to drain, so a
+        passive subscriber that stops reading would otherwise hold every
+        snapshot pushed to it.
+        """
+
+        writer = self.writer
+        if writer.is_closing():
+            return
+        transport: Any = writer.transport
+        if transport.get_write_buffer_size() + len(data) > MAX_WRITE_BUFFER:
+            transport.abort()
+            return
+        writer.write(data)
+
+    def reply(self, message: Message) -> None:
+        self.send(encode(message))
+
+
+class GameServer:
+    """Host any number of games; each client plays in at most one at a time.
+
+    Clients either create and join sessions by id or ``queue`` for the
+    matchmaker, which seats two waiting clients in a new room. A room is
+    closed as soon as its game ends or one of its players leaves. With a
+    :class:`RatingStore`, finished rooms between two named players are logged
+    and re-rated on every sweep, and named players queue at their rating.
+    Every call into the store runs on one worker thread, so SQLite commits
+    never stall the event loop; the server owns the store while it runs.
+    """
+
+    def __init__(
+        self,
+        store: Optional[SessionStore] = None,
+        *,
+        matchmaker: Optional[Matchmaker] = None,
+        ratings: Optional[RatingStore] = None,
+        max_line: int = DEFAULT_MAX_LINE,
+        sweep_interval: float = DEFAULT_SWEEP_INTERVAL,
+    ) -> None:
+        self.store = store if store is not None else SessionStore()
+        self.matchmaker = matchmaker if matchmaker is not None else Matchmaker()
+        self.ratings = ratings
+        self.max_line = max_line
+        self.sweep_interval = sweep_interval
+        self.connections = 0
+        self.rooms = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._sweeper: Optional[asyncio.Task[None]] = None
+        self._rating_executor: Optional[ThreadPoolExecutor] = None
+        self._rating_update: Optional[asyncio.Future[int]] = None
+        if ratings is not None:
+            self._rating_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="tictactoe-ratings"
+            )
+        self._handlers: Dict[str, Handler] = {
+            "new": self._new,
+            "join": self._join,
+            "move": self._move,
+            "undo": self._undo,
+            "reset": self._reset,
+            "leave": self._leave,
+            "queue": self._queue,
+            "unqueue": self._unqueue,
+            "ping": self._ping,
+            "stats": self._stats,
+        }
+
+    async def start(
+        self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, backlog: int = 4096
+    ) -> None:
+        """Start listening (``port=0`` picks a free port)."""
+
+        self._server = await asyncio.start_server(
+            self._handle_client, host, port, limit=self.max_line, backlog=backlog
+        )
+        self._sweeper = asyncio.ensure_future(self._sweep_forever())
+
+    @property
+    def port(self) -> int:
+        """Return the port the server is bound to."""
+
+        if self._server is None:
+            raise RuntimeError("The server has not been started.")
+        server: Any = self._server  # asyncio.Server, which has .sockets
+        return int(server.sockets[0].getsockname()[1])
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            raise RuntimeError("The server has not been started.")
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._sweeper
+            self._sweeper = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._rating_executor is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._rating_executor.shutdown
+            )
+            self._rating_executor = None
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        connection = Connection(writer)
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    connection.reply(error_message("Message too long."))
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    pending = self.handle_line(connection, line)
+                    if pending is not None:
+                        await pending
+                transport: Any = writer.transport
+                if transport.get_write_buffer_size() > _WRITE_HIGH_WATER:
+                    await writer.drain()
+        finally:
+            self._unqueue_quietly(connection)
+            self._detach(connection)
+            self.connections -= 1
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    def handle_line(
+        self, connection: Connection, line: bytes
+    ) -> Optional[Awaitable[None]]:
+        """Decode and execute one request, replying with an error on failure.
+
+        Returns:
+            For requests that wait on the rating store, an awaitable that
+            finishes them; the client's next request must wait for it.
+        """
+
+        try:
+            message = decode(line)
+            handler = self._handlers.get(message.get("op", ""))
+            if handler is None:
+                raise ProtocolError(f"Unknown op {message.get('op')!r}.")
+            pending = handler(connection, message)
+        except (ProtocolError, ValueError, TypeError) as exc:
+            connection.reply(error_message(str(exc)))
+            return None
+        return None if pending is None else self._finish(connection, pending)
+
+    @staticmethod
+    async def _finish(connection: Connection, pending: Awaitable[None]) -> None:
+        try:
+            await pending
+        except (ProtocolError, ValueError, TypeError) as exc:
+            connection.reply(error_message(str(exc)))
+
+    # Request handlers --------------------------------------------------------
+    def _new(self, connection: Connection, message: Message) -> None:
+        size, win_length = self._board_config(message)
+        try:
+            session = self.store.create(size, win_length)
+        except SessionLimitError as exc:
+            raise ProtocolError(str(exc)) from None
+        self._attach(connection, session)
+
+    def _join(self, connection: Connection, message: Message) -> None:
+        session_id = message.get("session")
+        try:
+            session = self.store.get(str(session_id))
+        except KeyError:
+            raise ProtocolError(f"Unknown session {session_id!r}.") from None
+        self._attach(connection, session)
+
+    def _move(self, connection: Connection, message: Message) -> None:
+        session = self._require_session(connection)
+        position = message.get("position")
+        if not isinstance(position, int) or isinstance(position, bool):
+            raise ProtocolError("position must be an integer.")
+        game = session.game
+        if session.seats is not None:
+            seat = session.seats[0 if game.current_player == Player.X else 1]
+            if seat is not connection:
+                raise ProtocolError("It is not your turn.")
+        if not game.make_move(position):
+            raise ProtocolError(f"Move {position} is not legal.")
+        if session.seats is not None and game.state != GameState.PLAYING:
+            x, o = session.seats
+            names = (getattr(x, "name", None), getattr(o, "name", None))
+            if self.ratings is not None and names[0] and names[1]:
+                self._rate(self.ratings.record, names[0], names[1], game.get_winner())
+            self._close_room(session, "finished")
+
+    def _undo(self, connection: Connection, message: Message) -> None:
+        if not self._require_free_session(connection).game.undo_move():
+            raise ProtocolError("Nothing to undo.")
+
+    def _reset(self, connection: Connection, message: Message) -> None:
+        self._require_free_session(connection).game.reset()
+
+    def _leave(self, connection: Connection, message: Message) -> None:
+        self._detach(connection)
+        connection.reply({"type": "left"})
+
+    def _queue(
+        self, connection: Connection, message: Message
+    ) -> Optional[Awaitable[None]]:
+        if connection.ticket is not None:
+            raise ProtocolError("Already waiting for an opponent.")
+        size, win_length = self._board_config(message)
+        line_index(size, win_length)  # reject bad boards before queueing
+        name = message.get("name")
+        if name is not None:
+            if not isinstance(name, str) or not 0 < len(name) <= _MAX_NAME:
+                raise ProtocolError(f"name must be 1 to {_MAX_NAME} characters.")
+            connection.name = name
+        rating = message.get("rating")
+        if rating is None and self.ratings is not None and name:
+            return self._queue_at_stored_rating(connection, size, win_length, name)
+        if rating is None:
+            rating = DEFAULT_RATING
+        if not _is_int(rating):
+            raise ProtocolError("rating must be an integer.")
+        self._enqueue(connection, size, win_length, rating)
+        return None
+
+    async def _queue_at_stored_rating(
+        self, connection: Connection, size: int, win_length: Optional[int], name: str
+    ) -> None:
+        assert self.ratings is not None
+        known = await self._rate(self.ratings.rating, name)
+        rating = DEFAULT_RATING if known is None else int(known)
+        self._enqueue(connection, size, win_length, rating)
+
+    def _enqueue(
+        self, connection: Connection, size: int, win_length: Optional[int], rating: int
+    ) -> None:
+        self._detach(connection)
+        try:
+            ticket, pair = self.matchmaker.enqueue(
+                connection, size=size, win_length=win_length, rating=rating
+            )
+        except QueueFullError as exc:
+            raise ProtocolError(str(exc)) from None
+        if pair is None:
+            connection.ticket = ticket
+            connection.reply({"type": "queued"})
+        else:
+            self._start_room(pair)
+
+    def _unqueue(self, connection: Connection, message: Message) -> None:
+        if not self._unqueue_quietly(connection):
+            raise ProtocolError("Not waiting for an opponent.")
+        connection.reply({"type": "unqueued"})
+
+    def _ping(self, connection: Connection, message: Message) -> None:
+        connection.reply({"type": "pong"})
+
+    def _stats(self, connection: Connection, message: Message) -> None:
+        connection.reply(
+            {
+                "type": "stats",
+                "connections": self.connections,
+                **self.store.stats(),
+                "rooms": self.rooms,
+                **self.matchmaker.stats(),
+                "max_rss_kb": _resident_kb(),
+            }
+        )
+
+    # Helpers -----------------------------------------------------------------
+    def _attach(self, connection: Connection, session: Session) -> None:
+        self._detach(connection)
+        session.attach(connection)
+        connection.session = session
+        connection.reply({"type": "session", "session": session.id})
+        connection.send(session.snapshot_line())
+
+    def _detach(self, connection: Connection) -> None:
+        session = connection.session
+        if session is not None:
+            if session.seats is not None and connection in session.seats:
+                self._close_room(session, "opponent_left")
+            else:
+                session.detach(connection)
+                connection.session = None
+
+    def _start_room(self, pair: Pair) -> None:
+        """Seat a matched pair in a new room; the longer waiter plays X."""
+
+        older, newer = pair
+        for ticket in pair:
+            ticket.client.ticket = None
+        try:
+            session = self.store.create(older.size, older.win_length)
+        except SessionLimitError as exc:
+            for ticket in pair:
+                ticket.client.reply(error_message(str(exc)))
+            return
+        session.seats = (older.client, newer.client)
+        self.rooms += 1
+        for seat, ticket in zip(Player, pair):
+            connection: Connection = ticket.client
+            self._detach(connection)
+            session.attach(connection)
+            connection.session = session
+            connection.reply(
+                {"type": "matched", "session": session.id, "seat": seat.value}
+            )
+            connection.send(session.snapshot_line())
+
+    def _close_room(self, session: Session, reason: str) -> None:
+        """Release everyone in a room and forget its session."""
+
+        session.seats = None
+        self.rooms -= 1
+        notice = encode({"type": "closed", "session": session.id, "reason": reason})
+        for subscriber in list(session.subscribers):
+            connection: Connection = subscriber  # type: ignore[assignment]
+            session.detach(connection)
+            connection.session = None
+            connection.send(notice)
+        self.store.discard(session.id)
+
+    def _unqueue_quietly(self, connection: Connection) -> bool:
+        ticket, connection.ticket = connection.ticket, None
+        return ticket is not None and self.matchmaker.cancel(ticket)
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            for pair in self.matchmaker.sweep():
+                self._start_room(pair)
+            self.store.sweep()
+            update = self._rating_update
+            if self.ratings is not None and (update is None or update.done()):
+                self._rating_update = self._rate(self.ratings.update)
+
+    def _rate(self, call: Callable[..., T], *args: Any) -> asyncio.Future[T]:
+        """Run *call* on the rating store's thread."""
+
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._rating_executor, call, *args)
+
+    @staticmethod
+    def _board_config(message: Message) -> Tuple[int, Optional[int]]:
+        size = message.get("size", 3)
+        win_length = message.get("win_length")
+        if not _is_int(size) or not (win_length is None or _is_int(win_length)):
+            raise ProtocolError("size and win_length must be integers.")
+        if not 1 <= size <= MAX_BOARD_SIZE:
+            raise ProtocolError(f"size must be between 1 and {MAX_BOARD_SIZE}.")
+        return size, win_length
+
+    def _require_session(self, connection: Connection) -> Session:
+        if connection.session is None:
+            raise ProtocolError("Start or join a session first.")
+        return self.store.touch(connection.session)
+
+    def _require_free_session(self, connection: Connection) -> Session:
+        session = self._require_session(connection)
+        if session.seats is not None:
+            raise ProtocolError("Not allowed in a matched game.")
+        return session
+
+
+def _is_int(value: object) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+async def _serve(
+    host: str,
+    port: int,
+    max_line: int,
+    store: SessionStore,
+    matchmaker: Matchmaker,
+    ratings: Optional[RatingStore],
+) -> None:
+    server = GameServer(
+        store, matchmaker=matchmaker, ratings=ratings, max_line=max_line
+    )
+    await server.start(host, port)
+    print(f"Serving games on {host}:{server.port}", flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tictactoe server",
+        description="Host games over TCP using line-delimited JSON.",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to bind.")
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Port to listen on (default: {DEFAULT_PORT}).",
+    )
+    parser.add_argument(
+        "--max-line",
+        type=int,
+        default=DEFAULT_MAX_LINE,
+        help=f"Longest accepted request in bytes (default: {DEFAULT_MAX_LINE}).",
+    )
+    parser.add_argument(
+        "--max-live",
+        type=int,
+        default=DEFAULT_MAX_LIVE,
+        help=f"Sessions kept as full engines (default: {DEFAULT_MAX_LIVE}).",
+    )
+    parser.add_argument(
+        "--park-after",
+        type=float,
+        default=DEFAULT_PARK_AFTER,
+        help="Idle seconds before a session is parked in compact form "
+        f"(default: {DEFAULT_PARK_AFTER:g}).",
+    )
+    parser.add_argument(
+        "--max-sessions",
+        type=int,
+        help="Hard cap on hosted sessions; the least recently used "
+        "unattached session is dropped to make room (default: no cap).",
+    )
+    parser.add_argument(
+        "--bucket-width",
+        type=int,
+        default=DEFAULT_BUCKET_WIDTH,
+        help="Rating points per matchmaking bucket "
+        f"(default: {DEFAULT_BUCKET_WIDTH}).",
+    )
+    parser.add_argument(
+        "--widen-after",
+        type=float,
+        default=DEFAULT_WIDEN_AFTER,
+        help="Seconds in the queue before each widening to a neighbouring "
+        f"rating bucket (default: {DEFAULT_WIDEN_AFTER:g}).",
+    )
+    parser.add_argument(
+        "--max-queue",
+        type=int,
+        help="Most clients allowed to wait for an opponent (default: no cap).",
+    )
+    parser.add_argument(
+        "--ratings",
+        type=Path,
+        help="SQLite rating database for named players' matched games.",
+    )
+    args = parser.parse_args(argv)
+    try:
+        store = SessionStore(
+            max_live=args.max_live,
+            park_after=args.park_after,
+            max_sessions=args.max_sessions,
+        )
+        matchmaker = Matchmaker(
+            bucket_width=args.bucket_width,
+            widen_after=args.widen_after,
+            max_queue=args.max_queue,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    try:
+        ratings = RatingStore(args.ratings) if args.ratings else None
+    except sqlite3.Error as exc:
+        raise SystemExit(f"Cannot open {args.ratings}: {exc}") from exc
+    try:
+        asyncio.run(
+            _serve(args.host, args.port, args.max_line, store, matchmaker, ratings)
+        )
+    except KeyboardInterrupt:
+        pass
+    except OSError as exc:
+        raise SystemExit(f"Cannot serve on {args.host}:{args.port}: {exc}") from exc
+    finally:
+        if ratings is not None:
+            ratings.close()
+    return 0
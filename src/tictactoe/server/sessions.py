@@ -0,0 +1,291 @@
+"""Sessions for the game server, with idle games parked in compact form.
+
+A live session owns a full :class:`TicTacToe` (board list, line counters,
+history and listener). Sessions nobody has touched for ``park_after`` seconds,
+or the least recently used ones once more than ``max_live`` are live, are
+*parked*: the engine is replaced by its :class:`CompactGame` and rebuilt the
+next time the session is used. ``max_sessions`` caps the total; creating a
+session beyond it drops the unattached session that was least recently used
+or left by its last client.
+"""
+
+from __future__ import annotations
+
+import secrets
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Protocol, Tuple
+
+from tictactoe.domain.logic import CompactGame, GameSnapshot, TicTacToe
+from tictactoe.server.protocol import encode, snapshot_message
+
+DEFAULT_MAX_LIVE = 10_000
+DEFAULT_PARK_AFTER = 60.0
+
+
+class Subscriber(Protocol):
+    """Anything that accepts pushed protocol lines (a client connection)."""
+
+    def send(self, data: bytes) -> None: ...
+
+
+class SessionLimitError(RuntimeError):
+    """Raised when the store is full and every session has attached clients."""
+
+
+class Session:
+    """One hosted game and the clients watching it.
+
+    Matched games (rooms) also record ``seats``: the X and O players, the only
+    subscribers allowed to move.
+    """
+
+    __slots__ = (
+        "id",
+        "subscribers",
+        "seats",
+        "last_used",
+        "_game",
+        "_parked",
+        "_unattached",
+    )
+
+    def __init__(self, session_id: str, game: TicTacToe) -> None:
+        self.id = session_id
+        self.subscribers: List[Subscriber] = []
+        self.seats: Optional[Tuple[Subscriber, Subscriber]] = None
+        self.last_used = 0.0
+        self._game: Optional[TicTacToe] = None
+        self._parked: Optional[CompactGame] = None
+        # The owning store's sessions without subscribers, kept up to date here.
+        self._unattached: Optional["OrderedDict[str, Session]"] = None
+        self._adopt(game)
+
+    @property
+    def parked(self) -> bool:
+        """Return True while the game is held only in compact form."""
+
+        return self._game is None
+
+    @property
+    def game(self) -> TicTacToe:
+        """Return the live engine.
+
+        Raises:
+            RuntimeError: if the session is parked; use
+                :meth:`SessionStore.touch` to bring it back
+        """
+
+        if self._game is None:
+            raise RuntimeError(f"Session {self.id} is parked.")
+        return self._game
+
+    def park(self) -> None:
+        """Replace the engine by its compact form (no-op if already parked)."""
+
+        if self._game is not None:
+            self._parked = self._game.to_compact()
+            self._game = None
+
+    def unpark(self) -> None:
+        """Rebuild the engine from its compact form (no-op if live)."""
+
+        if self._parked is not None:
+            self._adopt(TicTacToe.from_compact(self._parked))
+            self._parked = None
+
+    def attach(self, subscriber: Subscriber) -> None:
+        if subscriber not in self.subscribers:
+            self.subscribers.append(subscriber)
+            if self._unattached is not None:
+                self._unattached.pop(self.id, None)
+
+    def detach(self, subscriber: Subscriber) -> None:
+        if subscriber in self.subscribers:
+            self.subscribers.remove(subscriber)
+            if not self.subscribers and self._unattached is not None:
+                self._unattached[self.id] = self
+
+    def snapshot_line(self) -> bytes:
+        """Return the encoded ``snapshot`` message for the current position."""
+
+        return encode(snapshot_message(self.id, self.game.snapshot))
+
+    def _adopt(self, game: TicTacToe) -> None:
+        game.add_listener(self._broadcast)
+        self._game = game
+
+    def _broadcast(self, snapshot: GameSnapshot) -> None:
+        # Encoded once, however many clients are attached.
+        data = encode(snapshot_message(self.id, snapshot))
+        for subscriber in list(self.subscribers):
+            subscriber.send(data)
+
+
+class SessionStore:
+    """Hosted sessions keyed by an unguessable id.
+
+    Sessions are kept in least-recently-used order. :meth:`get` and
+    :meth:`touch` mark a session as used and unpark it (a *miss*; using a live
+    session is a *hit*). Parking (an *eviction*) happens as a side effect of
+    using the store and in :meth:`sweep`, so no timer is needed.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_live: Optional[int] = DEFAULT_MAX_LIVE,
+        park_after: Optional[float] = DEFAULT_PARK_AFTER,
+        max_sessions: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create an empty store.
+
+        Args:
+            max_live: Most sessions kept as full engines (``None``: no limit).
+            park_after: Idle seconds before a live session is parked
+                (``None``: never park for idleness).
+            max_sessions: Most sessions kept at all (``None``: no limit).
+            clock: Monotonic time source, replaceable in tests.
+        """
+
+        if max_live is not None and max_live < 1:
+            raise ValueError("max_live must be at least 1.")
+        if max_sessions is not None and max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1.")
+        self.max_live = max_live
+        self.park_after = park_after
+        self.max_sessions = max_sessions
+        self._clock = clock
+        # Every session, and the live subset, least recently used first.
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._live: "OrderedDict[str, Session]" = OrderedDict()
+        # Sessions without subscribers, least recently used or left first, so
+        # dropping one at the cap does not scan the attached ones.
+        self._unattached: "OrderedDict[str, Session]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._sessions
+
+    def sessions(self) -> List[Session]:
+        """Return every session, least recently used first, without touching."""
+
+        return list(self._sessions.values())
+
+    @property
+    def live_count(self) -> int:
+        """Return how many sessions currently hold a full engine."""
+
+        return len(self._live)
+
+    def create(self, size: int = 3, win_length: Optional[int] = None) -> Session:
+        """Start a new game and return its session.
+
+        Raises:
+            ValueError: for an invalid board configuration
+            SessionLimitError: if ``max_sessions`` is reached and no session
+                can be dropped
+        """
+
+        game = TicTacToe(size=size, win_length=win_length)
+        if self.max_sessions is not None and len(self._sessions) >= self.max_sessions:
+            self._drop_one()
+        session_id = secrets.token_urlsafe(6)
+        while session_id in self._sessions:  # pragma: no cover - 48-bit ids
+            session_id = secrets.token_urlsafe(6)
+        session = Session(session_id, game)
+        session.last_used = self._clock()
+        session._unattached = self._unattached
+        self._sessions[session_id] = session
+        self._live[session_id] = session
+        self._unattached[session_id] = session
+        self._enforce_limits(session.last_used)
+        return session
+
+    def get(self, session_id: str) -> Session:
+        """Return a live session and mark it as used.
+
+        Raises:
+            KeyError: if no session has that id
+        """
+
+        return self.touch(self._sessions[session_id])
+
+    def touch(self, session: Session) -> Session:
+        """Mark *session* as used, unparking it if needed, and return it."""
+
+        now = self._clock()
+        session.last_used = now
+        self._sessions.move_to_end(session.id)
+        if session.id in self._unattached:
+            self._unattached.move_to_end(session.id)
+        if session.parked:
+            self.misses += 1
+            session.unpark()
+            self._live[session.id] = session
+        else:
+            self.hits += 1
+            self._live.move_to_end(session.id)
+        self._enforce_limits(now)
+        return session
+
+    def discard(self, session_id: str) -> None:
+        """Forget a session (no-op if it is unknown)."""
+
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            session._unattached = None
+        self._live.pop(session_id, None)
+        self._unattached.pop(session_id, None)
+
+    def sweep(self) -> int:
+        """Park every session idle for longer than ``park_after``.
+
+        Returns:
+            The number of sessions parked.
+        """
+
+        before = self.evictions
+        self._enforce_limits(self._clock())
+        return self.evictions - before
+
+    def stats(self) -> Dict[str, int]:
+        """Return session counts and cache counters."""
+
+        return {
+            "sessions": len(self._sessions),
+            "live": len(self._live),
+            "parked": len(self._sessions) - len(self._live),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "dropped": self.dropped,
+        }
+
+    def _enforce_limits(self, now: float) -> None:
+        live = self._live
+        # The most recently used session is never parked by the size limit.
+        while self.max_live is not None and len(live) > self.max_live:
+            self._park_oldest()
+        if self.park_after is not None:
+            deadline = now - self.park_after
+            while live and next(iter(live.values())).last_used < deadline:
+                self._park_oldest()
+
+    def _park_oldest(self) -> None:
+        _, session = self._live.popitem(last=False)
+        session.park()
+        self.evictions += 1
+
+    def _drop_one(self) -> None:
+        if not self._unattached:
+            raise SessionLimitError("Too many sessions are in use.")
+        self.discard(next(iter(self._unattached)))
+        self.dropped += 1
@@ -0,0 +1,185 @@
+"""Cold-start import profile and time budget for each frontend.
+
+Each frontend is profiled in a fresh interpreter under ``python -X
+importtime``: the child loads the frontend's entry point the way
+``python -m tictactoe`` does, without running it, and the import time of
+everything loaded after interpreter startup is summed. ``list`` profiles
+``python -m tictactoe --list-frontends``, which must not import any UI code.
+Batch jobs launch the CLI thousands of times, so every frontend has a budget::
+
+    python -m tictactoe.startup
+    python -m tictactoe.startup cli --top 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from tictactoe.__main__ import FRONTENDS
+
+# Cumulative import time allowed per frontend, in milliseconds: roughly 1.5x
+# what each takes on a developer machine. The tests also pin which heavy
+# packages (Tk, asyncio, the process pool) each frontend may load at all.
+STARTUP_BUDGETS_MS: Mapping[str, float] = {
+    "list": 50.0,
+    "cli-client": 60.0,
+    "cli": 140.0,
+    "headless": 160.0,
+    "gui": 160.0,
+    "analyze": 170.0,
+    "tournament": 180.0,
+    "server": 180.0,
+}
+DEFAULT_BUDGET_MS = 180.0
+
+_MARKER = "-- tictactoe.startup --"
+_SRC_ROOT = Path(__file__).resolve().parent.parent
+
+
+@dataclass(frozen=True)
+class ImportProfile:
+    """Import times of one cold start, in microseconds."""
+
+    frontend: str
+    total_us: int
+    # module -> (self time, cumulative time), in import order.
+    modules: Dict[str, Tuple[int, int]]
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_us / 1000
+
+    @property
+    def budget_ms(self) -> float:
+        return STARTUP_BUDGETS_MS.get(self.frontend, DEFAULT_BUDGET_MS)
+
+    @property
+    def within_budget(self) -> bool:
+        return self.total_ms <= self.budget_ms
+
+    def imported(self, *packages: str) -> List[str]:
+        """Return the loaded modules that belong to any of *packages*."""
+
+        return [name for name in self.modules if name.partition(".")[0] in packages]
+
+    def slowest(self, count: int = 10) -> List[Tuple[str, int]]:
+        """Return the *count* modules with the largest self time."""
+
+        ranked = sorted(self.modules.items(), key=lambda item: item[1][0], reverse=True)
+        return [(name, times[0]) for name, times in ranked[:count]]
+
+
+def parse_importtime(frontend: str, stderr: str) -> ImportProfile:
+    """Build a profile from ``-X importtime`` output following the marker."""
+
+    _, found, report = stderr.partition(_MARKER)
+    if not found:
+        raise ValueError(f"No import report for frontend {frontend!r}.")
+    modules: Dict[str, Tuple[int, int]] = {}
+    total = 0
+    for line in report.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        try:
+            times = (int(own), int(cumulative))
+        except ValueError:
+            continue  # the column header
+        modules[name.strip()] = times
+        if not name.startswith("  "):  # top level: nested imports are indented
+            total += times[1]
+    return ImportProfile(frontend, total, modules)
+
+
+def _child_code(frontend: str) -> str:
+    lines = [
+        f"import sys; sys.stderr.write({_MARKER!r} + '\\n'); sys.stderr.flush()",
+        "from tictactoe.__main__ import FRONTENDS",
+    ]
+    if frontend != "list":
+        # -X importtime only reports import statements, not import_module(),
+        # so import the target explicitly before resolving it.
+        module = FRONTENDS[frontend].target.partition(":")[0]
+        lines += [f"import {module}", f"FRONTENDS[{frontend!r}].load()"]
+    return "\n".join(lines) + "\n"
+
+
+def profile_frontend(
+    frontend: str, *, repeat: int = 3, python: str = sys.executable
+) -> ImportProfile:
+    """Profile *frontend* in *repeat* fresh interpreters; return the fastest.
+
+    The first run also warms the bytecode cache, so taking the minimum
+    measures import work rather than compilation or disk noise.
+    """
+
+    if frontend != "list" and frontend not in FRONTENDS:
+        raise ValueError(f"Unknown frontend {frontend!r}.")
+    env = dict(os.environ)
+    if frontend != "list":
+        env.update(FRONTENDS[frontend].env_overrides)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(_SRC_ROOT), env.get("PYTHONPATH")])
+    )
+    best: Optional[ImportProfile] = None
+    for _ in range(max(1, repeat)):
+        completed = subprocess.run(
+            [python, "-X", "importtime", "-c", _child_code(frontend)],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=False,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(
+                f"Loading frontend {frontend!r} failed:\n{completed.stderr}"
+            )
+        profile = parse_importtime(frontend, completed.stderr)
+        if best is None or profile.total_us < best.total_us:
+            best = profile
+    assert best is not None
+    return best
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tictactoe.startup",
+        description="Measure each frontend's cold-start import time.",
+    )
+    parser.add_argument(
+        "frontends",
+        nargs="*",
+        help="Frontends to profile (default: all, plus 'list').",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per frontend.")
+    parser.add_argument(
+        "--top", type=int, default=0, help="Also list the N slowest modules."
+    )
+    args = parser.parse_args(argv)
+
+    names = args.frontends or ["list", *sorted(FRONTENDS)]
+    over_budget = 0
+    for name in names:
+        try:
+            profile = profile_frontend(name, repeat=args.repeat)
+        except (ValueError, RuntimeError) as exc:
+            raise SystemExit(str(exc)) from exc
+        status = "ok" if profile.within_budget else "OVER BUDGET"
+        over_budget += not profile.within_budget
+        print(
+            f"{name:<10} {profile.total_ms:7.1f} ms "
+            f"(budget {profile.budget_ms:.0f} ms) {status}"
+        )
+        for module, own in profile.slowest(args.top):
+            print(f"    {own / 1000:7.2f} ms  {module}")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,523 @@
+"""Round-robin tournaments between move strategies.
+
+Run ``python -m tictactoe tournament --players random greedy minimax mcts``.
+Every ordered pairing of distinct players meets ``--games`` times (so each
+side plays both colours). Games are cut into shards and played in a process
+pool with one worker per core; each shard streams back compact per-game
+records that are appended to an optional JSON-lines checkpoint, so an
+interrupted run picks up where it stopped when started again with the same
+checkpoint.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import (
+    IO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from tictactoe.ai import (
+    GreedyStrategy,
+    MCTSSearcher,
+    MoveStrategy,
+    RandomStrategy,
+    default_strategy,
+)
+from tictactoe.domain.logic import GameState, Player, TicTacToe
+from tictactoe.ratings import RatingStore
+
+DRAW = "D"
+
+
+@dataclass(frozen=True)
+class TournamentConfig:
+    """Everything that determines the games of a tournament."""
+
+    players: Tuple[str, ...]
+    games: int = 100
+    size: int = 3
+    win_length: Optional[int] = None
+    seed: int = 0
+    mcts_iterations: int = 400
+    minimax_depth: Optional[int] = None
+    # Seconds per minimax move; larger boards cannot be solved outright.
+    minimax_time: Optional[float] = 1.0
+
+    def pairings(self) -> List[Tuple[str, str]]:
+        """Return every ordered ``(x, o)`` pair of distinct players."""
+
+        return [(x, o) for x in self.players for o in self.players if x != o]
+
+    @property
+    def total_games(self) -> int:
+        return len(self.pairings()) * self.games
+
+    def pairing_for(self, index: int) -> Tuple[str, str]:
+        """Return the players of game *index*."""
+
+        return self.pairings()[index // self.games]
+
+    def seeds_for(self, index: int) -> Tuple[int, int]:
+        """Return the X and O strategy seeds of game *index*.
+
+        Every player of every game gets its own seed, so no two random or
+        MCTS players share a random stream, and each base ``seed`` owns a
+        disjoint block of them.
+        """
+
+        first = 2 * (self.seed * self.total_games + index)
+        return first, first + 1
+
+
+StrategyFactory = Callable[[TournamentConfig, int], MoveStrategy]
+
+STRATEGIES: Dict[str, StrategyFactory] = {
+    "random": lambda config, seed: RandomStrategy(seed),
+    "greedy": lambda config, seed: GreedyStrategy(),
+    "minimax": lambda config, seed: default_strategy(
+        config.size,
+        config.win_length,
+        max_depth=config.minimax_depth,
+        time_budget=config.minimax_time,
+    ),
+    "mcts": lambda config, seed: MCTSSearcher(
+        iterations=config.mcts_iterations, seed=seed
+    ),
+}
+
+
+@dataclass(frozen=True)
+class GameRecord:
+    """Outcome of one tournament game (serialized as one JSON line)."""
+
+    index: int
+    x: str
+    o: str
+    result: str  # "X", "O" or "D"
+    moves: Tuple[int, ...]
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "g": self.index,
+                "x": self.x,
+                "o": self.o,
+                "r": self.result,
+                "m": list(self.moves),
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, line: str) -> GameRecord:
+        data = json.loads(line)
+        return cls(
+            index=data["g"],
+            x=data["x"],
+            o=data["o"],
+            result=data["r"],
+            moves=tuple(data["m"]),
+        )
+
+
+def play_game(
+    x_strategy: MoveStrategy,
+    o_strategy: MoveStrategy,
+    *,
+    size: int = 3,
+    win_length: Optional[int] = None,
+) -> Tuple[str, Tuple[int, ...]]:
+    """Play one game and return the result code and the moves played."""
+
+    game = TicTacToe(size=size, win_length=win_length)
+    strategies = {Player.X: x_strategy, Player.O: o_strategy}
+    while game.state == GameState.PLAYING:
+        position = strategies[game.current_player].choose_move(game)
+        if not game.make_move(position):
+            raise RuntimeError(f"Strategy chose illegal move {position}.")
+    winner = game.get_winner()
+    return (winner.value if winner else DRAW), game.history
+
+
+def play_shard(config: TournamentConfig, indices: Sequence[int]) -> List[GameRecord]:
+    """Play the games numbered *indices* (run inside a worker process).
+
+    Each game seeds its strategies from ``config.seeds_for(index)`` so a
+    game's outcome does not depend on which shard or worker played it.
+    """
+
+    records = []
+    for index in indices:
+        x_name, o_name = config.pairing_for(index)
+        x_seed, o_seed = config.seeds_for(index)
+        result, moves = play_game(
+            STRATEGIES[x_name](config, x_seed),
+            STRATEGIES[o_name](config, o_seed),
+            size=config.size,
+            win_length=config.win_length,
+        )
+        records.append(GameRecord(index, x_name, o_name, result, moves))
+    return records
+
+
+def _shards(indices: Sequence[int], shard_size: int) -> Iterator[Sequence[int]]:
+    for start in range(0, len(indices), shard_size):
+        yield indices[start : start + shard_size]
+
+
+def run_games(
+    config: TournamentConfig,
+    indices: Sequence[int],
+    *,
+    workers: int = 1,
+    shard_size: int = 25,
+) -> Iterator[GameRecord]:
+    """Yield records for *indices* as their shards finish.
+
+    With one worker the games run in this process; otherwise shards are
+    spread over a :class:`ProcessPoolExecutor`.
+    """
+
+    if workers <= 1:
+        for shard in _shards(indices, shard_size):
+            yield from play_shard(config, shard)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(play_shard, config, shard)
+            for shard in _shards(indices, shard_size)
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+@dataclass
+class Tally:
+    """Wins, draws and losses of one player against one opponent."""
+
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    @property
+    def score(self) -> float:
+        """Return points per game (win = 1, draw = 0.5)."""
+
+        return (self.wins + 0.5 * self.draws) / self.games if self.games else 0.0
+
+    def win_interval(self, z: float = 1.96) -> Tuple[float, float]:
+        """Return the Wilson score interval of the win rate."""
+
+        return wilson_interval(self.wins, self.games, z)
+
+
+def wilson_interval(
+    successes: int, trials: int, z: float = 1.96
+) -> Tuple[float, float]:
+    """Return the Wilson score interval for a binomial proportion."""
+
+    if trials == 0:
+        return 0.0, 1.0
+    rate = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (rate + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials))
+    margin /= denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+@dataclass
+class Standings:
+    """Win/draw/loss matrix merged from game records."""
+
+    players: Tuple[str, ...]
+    matrix: Dict[Tuple[str, str], Tally] = field(default_factory=dict)
+
+    def add(self, record: GameRecord) -> None:
+        """Fold one game into the matrix (both players' rows)."""
+
+        x_row = self.matrix.setdefault((record.x, record.o), Tally())
+        o_row = self.matrix.setdefault((record.o, record.x), Tally())
+        if record.result == Player.X.value:
+            x_row.wins += 1
+            o_row.losses += 1
+        elif record.result == Player.O.value:
+            x_row.losses += 1
+            o_row.wins += 1
+        else:
+            x_row.draws += 1
+            o_row.draws += 1
+
+    def total(self, player: str) -> Tally:
+        """Return *player*'s results against every opponent combined."""
+
+        combined = Tally()
+        for (row, _), tally in self.matrix.items():
+            if row == player:
+                combined.wins += tally.wins
+                combined.draws += tally.draws
+                combined.losses += tally.losses
+        return combined
+
+    def format(self) -> str:
+        """Render the matrix (row player's W-D-L) and overall standings."""
+
+        width = max(9, *(len(name) for name in self.players)) + 2
+        lines = ["".ljust(width) + "".join(name.rjust(width) for name in self.players)]
+        for row in self.players:
+            cells = []
+            for column in self.players:
+                tally = self.matrix.get((row, column))
+                if row == column or tally is None:
+                    cells.append("-".rjust(width))
+                else:
+                    text = f"{tally.wins}-{tally.draws}-{tally.losses}"
+                    cells.append(text.rjust(width))
+            lines.append(row.ljust(width) + "".join(cells))
+
+        lines.append("")
+        lines.append("Standings (score per game, win rate with 95% CI):")
+        ranked = sorted(self.players, key=lambda name: -self.total(name).score)
+        for name in ranked:
+            tally = self.total(name)
+            low, high = tally.win_interval()
+            lines.append(
+                f"{name.ljust(width)}{tally.score:6.3f}  "
+                f"W {tally.wins} D {tally.draws} L {tally.losses}  "
+                f"win {tally.wins / max(tally.games, 1):.1%} "
+                f"[{low:.1%}, {high:.1%}]"
+            )
+        return "\n".join(lines)
+
+
+class Checkpoint:
+    """Append-only JSON-lines file: a config header, then one line per game."""
+
+    def __init__(self, path: Path, config: TournamentConfig) -> None:
+        self.path = path
+        self.config = config
+
+    def load(self) -> List[GameRecord]:
+        """Return the games already recorded, creating the file if needed.
+
+        Raises:
+            SystemExit: if the file was written for a different tournament
+        """
+        header = {"tournament": asdict(self.config)}
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(header) + "\n", encoding="utf-8")
+            return []
+
+        with open(self.path, "r+", encoding="utf-8") as handle:
+            saved = json.loads(handle.readline())
+            if saved != json.loads(json.dumps(header)):
+                raise SystemExit(
+                    f"{self.path} belongs to a different tournament; "
+                    "use another --checkpoint path."
+                )
+            records = []
+            good_offset = handle.tell()
+            for line in iter(handle.readline, ""):
+                try:
+                    records.append(GameRecord.from_json(line))
+                except (ValueError, KeyError):
+                    # A torn final line from an interrupted run: drop it so
+                    # new records are appended after the last complete one.
+                    handle.seek(good_offset)
+                    handle.truncate()
+                    break
+                good_offset = handle.tell()
+        return records
+
+    def open(self) -> IO[str]:
+        return open(self.path, "a", encoding="utf-8")
+
+
+def run_tournament(
+    config: TournamentConfig,
+    *,
+    workers: int = 1,
+    shard_size: int = 25,
+    checkpoint: Optional[Path] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    ratings: Optional[RatingStore] = None,
+) -> Standings:
+    """Play (or finish) a tournament and return the merged standings.
+
+    Newly played games are also logged to *ratings* when given; resumed games
+    from the checkpoint are not logged again.
+    """
+
+    standings = Standings(config.players)
+    done: Iterable[GameRecord] = []
+    store = Checkpoint(checkpoint, config) if checkpoint else None
+    if store is not None:
+        done = store.load()
+    completed = set()
+    for record in done:
+        if record.index not in completed:
+            completed.add(record.index)
+            standings.add(record)
+
+    pending = [index for index in range(config.total_games) if index not in completed]
+    handle = store.open() if store is not None else None
+    try:
+        for record in run_games(
+            config, pending, workers=workers, shard_size=shard_size
+        ):
+            standings.add(record)
+            completed.add(record.index)
+            if ratings is not None:
+                winner = None if record.result == DRAW else Player(record.result)
+                ratings.record(record.x, record.o, winner)
+            if handle is not None:
+                handle.write(record.to_json() + "\n")
+                handle.flush()
+            if progress is not None:
+                progress(len(completed), config.total_games)
+    finally:
+        if handle is not None:
+            handle.close()
+    return standings
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m tictactoe tournament",
+        description="Play a round-robin tournament between move strategies.",
+    )
+    parser.add_argument(
+        "--players",
+        nargs="+",
+        choices=sorted(STRATEGIES),
+        default=["random", "greedy", "minimax", "mcts"],
+        help="Strategies to enter (default: all).",
+    )
+    parser.add_argument(
+        "--games",
+        type=int,
+        default=100,
+        help="Games per ordered pairing (default: 100).",
+    )
+    parser.add_argument("--size", type=int, default=3, help="Board size.")
+    parser.add_argument("--win-length", type=int, help="Marks in a row to win.")
+    parser.add_argument("--seed", type=int, default=0, help="Base random seed.")
+    parser.add_argument(
+        "--mcts-iterations",
+        type=int,
+        default=400,
+        help="Playouts per MCTS move (default: 400).",
+    )
+    parser.add_argument(
+        "--minimax-depth",
+        type=int,
+        help="Depth limit for minimax (default: full strength).",
+    )
+    parser.add_argument(
+        "--minimax-time",
+        type=float,
+        default=1.0,
+        help="Seconds minimax may think per move; 0 for no limit (default: 1.0).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (default: one per core).",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=25,
+        help="Games handed to a worker at a time (default: 25).",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        help="JSON-lines file to record games in and resume from.",
+    )
+    parser.add_argument(
+        "--ratings",
+        type=Path,
+        help="SQLite rating database to log the games in and re-rate.",
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="Suppress progress output."
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    players = tuple(dict.fromkeys(args.players))
+    if len(players) < 2:
+        parser.error("a tournament needs at least two different players")
+    if args.games < 1 or args.shard_size < 1:
+        parser.error("--games and --shard-size must be positive")
+    if args.minimax_depth is not None and args.minimax_depth < 0:
+        parser.error("--minimax-depth must not be negative")
+
+    try:
+        TicTacToe(size=args.size, win_length=args.win_length)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+
+    config = TournamentConfig(
+        players=players,
+        games=args.games,
+        size=args.size,
+        win_length=args.win_length,
+        seed=args.seed,
+        mcts_iterations=args.mcts_iterations,
+        minimax_depth=args.minimax_depth,
+        minimax_time=args.minimax_time or None,
+    )
+
+    def report(completed: int, total: int) -> None:
+        if completed == total or completed % 100 == 0:
+            print(f"\r{completed}/{total} games", end="", flush=True)
+
+    ratings = RatingStore(args.ratings) if args.ratings else None
+    try:
+        standings = run_tournament(
+            config,
+            workers=args.workers,
+            shard_size=args.shard_size,
+            checkpoint=args.checkpoint,
+            progress=None if args.quiet else report,
+            ratings=ratings,
+        )
+        if ratings is not None:
+            ratings.update()
+    finally:
+        if ratings is not None:
+            ratings.close()
+    if not args.quiet:
+        print()
+    print(standings.format())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
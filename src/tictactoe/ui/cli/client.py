@@ -0,0 +1,222 @@
+"""Thin client for the resident ``serve-cli`` daemon.
+
+``python -m tictactoe cli-client`` takes the same flags as the CLI's script
+and batch modes, but forwards the work to a running ``serve-cli`` daemon
+instead of importing the engine. ``--script`` jobs print exactly what
+``python -m tictactoe cli --script`` would. ``--batch`` streams one job per
+input line over a single connection, keeping a window of requests in
+flight, and writes the same CSV/JSON-lines rows as ``cli --batch``::
+
+    python -m tictactoe serve-cli &
+    python -m tictactoe cli-client --script 0,4,8
+    python -m tictactoe cli-client --batch games.txt --format jsonl
+
+The wire format is one JSON object per line in each direction; see
+:mod:`tictactoe.ui.cli.daemon`. This module only imports the standard
+library so it starts about as fast as the interpreter does.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import sys
+from collections import deque
+from typing import (
+    Any,
+    BinaryIO,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+from tictactoe.ui.cli.output import batch_writer
+
+SOCKET_ENV_VAR = "TICTACTOE_CLI_SOCKET"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+# Requests sent before the client waits for the oldest response.
+DEFAULT_WINDOW = 64
+
+Address = Tuple[Optional[str], Optional[int]]  # (socket path, TCP port)
+
+
+def unix_sockets_supported() -> bool:
+    """Return whether the daemon can listen on a Unix socket here."""
+
+    return hasattr(socket, "AF_UNIX") and sys.platform != "win32"
+
+
+def default_socket_path() -> str:
+    """Return the per-user socket path used when none is given."""
+
+    configured = os.environ.get(SOCKET_ENV_VAR)
+    if configured:
+        return configured
+    directory = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    user = os.getuid() if hasattr(os, "getuid") else os.getpid()
+    return os.path.join(directory, f"tictactoe-cli-{user}.sock")
+
+
+def resolve_address(path: Optional[str], port: Optional[int]) -> Address:
+    """Pick the Unix socket *path*, TCP *port*, or the platform default."""
+
+    if port is not None:
+        return None, port
+    if path is not None or unix_sockets_supported():
+        return path or default_socket_path(), None
+    return None, DEFAULT_PORT
+
+
+def describe_address(address: Address) -> str:
+    path, port = address
+    return path if path is not None else f"{DEFAULT_HOST}:{port}"
+
+
+class CliClient:
+    """One connection to a ``serve-cli`` daemon."""
+
+    def __init__(self, address: Address, timeout: Optional[float] = None) -> None:
+        path, port = address
+        if path is not None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            target: Any = path
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            target = (DEFAULT_HOST, port)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(target)
+        except OSError:
+            sock.close()
+            raise
+        self._socket = sock
+        self._stream = cast(BinaryIO, sock.makefile("rwb"))
+
+    def __enter__(self) -> CliClient:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._stream.close()
+        self._socket.close()
+
+    def send(self, argv: Sequence[str]) -> None:
+        """Queue a job; call :meth:`receive` for its response, in order."""
+
+        self._stream.write(json.dumps({"argv": list(argv)}).encode() + b"\n")
+
+    def receive(self) -> Dict[str, Any]:
+        self._stream.flush()
+        line = self._stream.readline()
+        if not line:
+            raise ConnectionError("The serve-cli daemon closed the connection.")
+        response: Dict[str, Any] = json.loads(line)
+        return response
+
+    def run(self, argv: Sequence[str]) -> Dict[str, Any]:
+        """Run one job and return the daemon's response."""
+
+        self.send(argv)
+        return self.receive()
+
+    def run_batch(
+        self,
+        lines: Iterable[str],
+        argv: Sequence[str] = (),
+        window: int = DEFAULT_WINDOW,
+    ) -> Iterable[Tuple[int, Dict[str, Any]]]:
+        """Yield ``(line number, response)`` for each game line, in order.
+
+        Blank lines and ``#`` comments are skipped, as in ``cli --batch``.
+        Up to *window* requests are in flight at once.
+        """
+
+        pending: Deque[int] = deque()
+        common = [*argv, "--quiet"]
+        for number, line in enumerate(lines, start=1):
+            text = line.strip()
+            if not text or text.startswith("#"):
+                continue
+            self.send([*common, f"--script={text}"])
+            pending.append(number)
+            if len(pending) >= window:
+                yield pending.popleft(), self.receive()
+        while pending:
+            yield pending.popleft(), self.receive()
+
+
+def _batch_row(number: int, response: Dict[str, Any]) -> Dict[str, object]:
+    if response.get("status"):
+        error = str(response.get("stderr", "")).strip()
+        return {"line": number, "result": "error", "error": error}
+    return {"line": number, "result": response["result"], "moves": response["moves"]}
+
+
+def _run_batch(
+    client: CliClient, path: str, forwarded: List[str], fmt: str, quiet: bool
+) -> int:
+    try:
+        source = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    except OSError as exc:
+        raise SystemExit(f"Cannot read {path}: {exc.strerror}") from exc
+    write = batch_writer(sys.stdout, fmt)
+    games = errors = 0
+    try:
+        for number, response in client.run_batch(source, forwarded):
+            row = _batch_row(number, response)
+            games += 1
+            errors += row["result"] == "error"
+            write(row)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    if not quiet:
+        print(f"Replayed {games} games ({errors} with errors).", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tictactoe cli-client",
+        description=(
+            "Run CLI --script or --batch jobs on a resident serve-cli daemon. "
+            "Other CLI flags (--size, --ai, ...) are forwarded."
+        ),
+    )
+    parser.add_argument("--socket", help="Daemon Unix socket path.")
+    parser.add_argument("--port", type=int, help="Daemon TCP port on 127.0.0.1.")
+    parser.add_argument("--batch", metavar="PATH", help="Replay one game per line.")
+    parser.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+    parser.add_argument("--quiet", action="store_true")
+    args, forwarded = parser.parse_known_args(argv)
+
+    address = resolve_address(args.socket, args.port)
+    try:
+        client = CliClient(address)
+    except OSError as exc:
+        raise SystemExit(
+            f"No serve-cli daemon at {describe_address(address)} ({exc}); "
+            "start one with 'python -m tictactoe serve-cli'."
+        ) from exc
+    with client:
+        if args.batch:
+            return _run_batch(client, args.batch, forwarded, args.format, args.quiet)
+        response = client.run([*forwarded, *(["--quiet"] if args.quiet else [])])
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    return int(response.get("status", 0))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,486 @@
+"""Resident daemon that runs CLI script jobs on pre-warmed engines.
+
+Launching ``python -m tictactoe cli --script ...`` once per game pays for
+interpreter start-up, imports and engine construction every time.
+``python -m tictactoe serve-cli`` pays that cost once. It listens on a local
+Unix socket (TCP on 127.0.0.1 where Unix sockets are unavailable) and runs
+each job on an engine borrowed from a :class:`EnginePool`, which keeps reset
+engines, and the computer player seated with them, per board configuration.
+
+Requests and responses are one JSON object per line::
+
+    -> {"argv": ["--script", "0,4,8", "--ai", "O"]}
+    <- {"status": 0, "stdout": "...", "stderr": "", "state": "Winner: X",
+        "result": "X", "moves": 5}
+
+``argv`` takes the CLI's script-mode flags; ``stdout``, ``stderr`` and
+``status`` are what ``cli --script`` would have printed and returned, and
+``state`` is its final status line even for ``--quiet`` jobs. Use
+``python -m tictactoe cli-client`` (:mod:`tictactoe.ui.cli.client`) as a
+drop-in replacement for the CLI in shell pipelines.
+
+Jobs run on a small thread pool, off the event loop, so a slow job (say a
+``--size 4 --ai O`` game thinking a second per move) does not hold up other
+clients. Each connection still gets its responses in request order.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import socket
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from tictactoe.ai import ComputerPlayer
+from tictactoe.domain.logic import TicTacToe
+from tictactoe.ui.cli.client import (
+    DEFAULT_HOST,
+    Address,
+    describe_address,
+    resolve_address,
+    unix_sockets_supported,
+)
+from tictactoe.ui.cli.main import (
+    _build_computer,
+    _build_parser,
+    _format_state_line,
+    _parse_script,
+    _result_label,
+    _run_script,
+)
+
+# Idle engines kept per board configuration.
+DEFAULT_POOL_SIZE = 8
+# Distinct flag sets whose parsed arguments are remembered.
+_PARSED_CACHE_SIZE = 256
+# Requests are a short argv list; a small limit bounds per-client buffering.
+DEFAULT_MAX_LINE = 64 * 1024
+# Only wait for a client to read its responses once this many bytes queue up.
+_WRITE_HIGH_WATER = 64 * 1024
+# Threads running jobs; more only help while jobs wait on their time budget.
+DEFAULT_WORKERS = 4
+# Reads (each run as one job) a connection may have queued before pausing.
+_MAX_IN_FLIGHT = 64
+_READ_SIZE = 64 * 1024
+
+Response = Dict[str, Any]
+_PoolKey = Tuple[int, Optional[int], Optional[str], Optional[int], float]
+_Seat = Tuple[TicTacToe, Optional[ComputerPlayer]]
+
+
+class EnginePool:
+    """Reusable engines (and their computer players) per configuration.
+
+    A computer player keeps its search caches between games, so reusing it
+    also keeps them warm.
+    """
+
+    def __init__(self, max_idle: int = DEFAULT_POOL_SIZE) -> None:
+        self.max_idle = max_idle
+        self.created = 0
+        self.reused = 0
+        self._idle: Dict[_PoolKey, List[_Seat]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(args: argparse.Namespace) -> _PoolKey:
+        return (args.size, args.win_length, args.ai, args.ai_depth, args.ai_time)
+
+    def acquire(self, args: argparse.Namespace) -> _Seat:
+        """Return a reset engine and computer player for *args*.
+
+        Raises:
+            ValueError: If the board configuration is invalid.
+        """
+
+        with self._lock:
+            idle = self._idle.get(self.key(args))
+            if idle:
+                self.reused += 1
+                return idle.pop()
+        game = TicTacToe(size=args.size, win_length=args.win_length)
+        computer = _build_computer(args)
+        with self._lock:
+            self.created += 1
+        return game, computer
+
+    def release(self, args: argparse.Namespace, seat: _Seat) -> None:
+        seat[0].reset()
+        with self._lock:
+            idle = self._idle.setdefault(self.key(args), [])
+            if len(idle) < self.max_idle:
+                idle.append(seat)
+
+    def warm(self, args: argparse.Namespace, count: int) -> None:
+        """Build *count* engines for *args* ahead of the first job."""
+
+        seats = [self.acquire(args) for _ in range(count)]
+        for seat in seats:
+            self.release(args, seat)
+
+
+class _ThreadOutput:
+    """``sys.stdout``/``sys.stderr`` stand-in with a buffer per job thread.
+
+    ``redirect_stdout`` swaps the stream for the whole process, which would
+    mix up the output of jobs running at the same time.
+    """
+
+    def __init__(self, fallback: IO[str]) -> None:
+        self.fallback = fallback
+        self._local = threading.local()
+
+    def capture(self, buffer: Optional[io.StringIO]) -> None:
+        self._local.buffer = buffer
+
+    def _target(self) -> IO[str]:
+        buffer: Optional[io.StringIO] = getattr(self._local, "buffer", None)
+        return self.fallback if buffer is None else buffer
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.fallback, name)
+
+
+class _OutputCapture:
+    """Install the per-thread streams while any job is running."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._active = 0
+        self._streams: Optional[Tuple[_ThreadOutput, _ThreadOutput]] = None
+
+    @contextmanager
+    def job(self, stdout: io.StringIO, stderr: io.StringIO) -> Iterator[None]:
+        with self._lock:
+            if self._active == 0:
+                self._streams = (_ThreadOutput(sys.stdout), _ThreadOutput(sys.stderr))
+                sys.stdout, sys.stderr = self._streams  # type: ignore[assignment]
+            self._active += 1
+            streams = self._streams
+        assert streams is not None
+        streams[0].capture(stdout)
+        streams[1].capture(stderr)
+        try:
+            yield
+        finally:
+            streams[0].capture(None)
+            streams[1].capture(None)
+            with self._lock:
+                self._active -= 1
+                if self._active == 0:
+                    sys.stdout, sys.stderr = streams[0].fallback, streams[1].fallback
+                    self._streams = None
+
+
+class ScriptRunner:
+    """Run CLI ``--script`` jobs on pooled engines, capturing their output.
+
+    :meth:`run` may be called from several threads at once.
+    """
+
+    def __init__(self, pool: Optional[EnginePool] = None) -> None:
+        self.pool = pool if pool is not None else EnginePool()
+        self.jobs = 0
+        self._capture = _OutputCapture()
+        self._parser = _build_parser()
+        self._parser.prog = "tictactoe cli"
+        self._parsed: Dict[Tuple[str, ...], argparse.Namespace] = {}
+
+    def warm(self, count: int) -> None:
+        """Pre-build engines for the default board, plus the computer's table."""
+
+        self.pool.warm(self._parser.parse_args([]), count)
+        self.pool.warm(self._parser.parse_args(["--ai", "O"]), 1)
+
+    def run(self, argv: Sequence[str]) -> Response:
+        """Run one job as ``cli`` would and return its response."""
+
+        self.jobs += 1  # approximate under concurrent jobs
+        stdout, stderr = io.StringIO(), io.StringIO()
+        response: Response = {"status": 0}
+        with self._capture.job(stdout, stderr):
+            try:
+                self._run(argv, response)
+            except SystemExit as exc:
+                response["status"] = _exit_status(exc, stderr)
+        response["stdout"] = stdout.getvalue()
+        response["stderr"] = stderr.getvalue()
+        return response
+
+    def _parse(self, argv: Sequence[str]) -> argparse.Namespace:
+        """Parse *argv*, reusing the result for jobs differing only in the script.
+
+        Batch clients send the same flags with a new ``--script`` each time;
+        argparse would otherwise cost as much as playing the game.
+        """
+
+        flags: List[str] = []
+        script: Optional[str] = None
+        arguments = iter(argv)
+        for argument in arguments:
+            if argument.startswith("--script="):
+                script = argument[len("--script=") :]
+            elif argument == "--script":
+                script = next(arguments, None)
+                if script is None:
+                    flags.append(argument)  # let argparse report it
+            else:
+                flags.append(argument)
+        key = tuple(flags)
+        parsed = self._parsed.get(key)
+        if parsed is None:
+            parsed = self._parser.parse_args(flags)
+            if len(self._parsed) >= _PARSED_CACHE_SIZE:
+                self._parsed.clear()
+            self._parsed[key] = parsed
+        args = argparse.Namespace(**vars(parsed))
+        if script is not None:
+            args.script = script
+        return args
+
+    def _run(self, argv: Sequence[str], response: Response) -> None:
+        args = self._parse(argv)
+        if args.batch or not args.script:
+            self._parser.error(
+                "serve-cli runs --script jobs; use cli-client --batch for files"
+            )
+        try:
+            seat = self.pool.acquire(args)
+        except ValueError as exc:
+            raise SystemExit(str(exc)) from exc
+        game, computer = seat
+        try:
+            try:
+                moves = _parse_script(args.script, game.cell_count)
+            except ValueError as exc:
+                raise SystemExit(str(exc)) from exc
+            _run_script(game, moves, args.quiet, computer)
+        finally:
+            response["state"] = _format_state_line(game.snapshot)
+            response["result"] = _result_label(game)
+            response["moves"] = len(game.history)
+            self.pool.release(args, seat)
+
+
+def _exit_status(exc: SystemExit, stderr: io.StringIO) -> int:
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    stderr.write(f"{exc.code}\n")
+    return 1
+
+
+class CliDaemon:
+    """Serve :class:`ScriptRunner` jobs over a local socket."""
+
+    def __init__(
+        self,
+        runner: Optional[ScriptRunner] = None,
+        max_line: int = DEFAULT_MAX_LINE,
+        workers: int = DEFAULT_WORKERS,
+    ) -> None:
+        self.runner = runner if runner is not None else ScriptRunner()
+        self.max_line = max_line
+        self.address: Optional[Address] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="serve-cli"
+        )
+
+    async def start(self, address: Address) -> None:
+        """Listen on ``(socket path, None)`` or ``(None, TCP port)``."""
+
+        path, port = address
+        if path is not None:
+            _remove_stale_socket(path)
+            self._server = await asyncio.start_unix_server(
+                self._handle_client, path, limit=self.max_line
+            )
+            os.chmod(path, 0o600)
+        else:
+            self._server = await asyncio.start_server(
+                self._handle_client, DEFAULT_HOST, port, limit=self.max_line
+            )
+            server: Any = self._server
+            port = int(server.sockets[0].getsockname()[1])
+        self.address = (path, port)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            raise RuntimeError("The daemon has not been started.")
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self.address is not None and self.address[0] is not None:
+            with suppress(FileNotFoundError):
+                os.unlink(self.address[0])
+        self._executor.shutdown(wait=False)
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        # Jobs in request order; the queue bound pauses reading when full.
+        results: asyncio.Queue[Optional[asyncio.Future[bytes]]] = asyncio.Queue(
+            _MAX_IN_FLIGHT
+        )
+        sender = asyncio.ensure_future(self._send_results(results, writer))
+        pending = b""
+        try:
+            while True:
+                try:
+                    chunk = await reader.read(_READ_SIZE)
+                except ConnectionError:
+                    break
+                # At EOF, a last line without its newline still counts.
+                *lines, pending = (pending + (chunk or b"\n")).split(b"\n")
+                if len(pending) > self.max_line:
+                    break
+                # Every line read together is one job: a pipelining client
+                # pays for one thread hand-off per read, not per request.
+                lines = [line for line in lines if line.strip()]
+                if lines:
+                    job = loop.run_in_executor(self._executor, self.handle_lines, lines)
+                    await results.put(job)
+                if not chunk:
+                    break
+        finally:
+            await results.put(None)
+            await sender
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    @staticmethod
+    async def _send_results(
+        results: asyncio.Queue[Optional[asyncio.Future[bytes]]],
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        transport: Any = writer.transport
+        while True:
+            job = await results.get()
+            if job is None:
+                return
+            response = await job
+            if writer.is_closing():
+                continue  # the client left; finish its jobs without replying
+            writer.write(response)
+            if transport.get_write_buffer_size() > _WRITE_HIGH_WATER:
+                with suppress(ConnectionError):
+                    await writer.drain()
+
+    def handle_lines(self, lines: Sequence[bytes]) -> bytes:
+        """Run the jobs of several request lines; return their responses."""
+
+        return b"".join(self.handle_line(line) for line in lines)
+
+    def handle_line(self, line: bytes) -> bytes:
+        """Run the job in one request line and return the encoded response."""
+
+        try:
+            request = json.loads(line)
+            argv = request["argv"]
+            if not isinstance(argv, list) or not all(
+                isinstance(arg, str) for arg in argv
+            ):
+                raise TypeError("argv must be a list of strings.")
+        except (ValueError, KeyError, TypeError) as exc:
+            response: Response = {
+                "status": 2,
+                "stdout": "",
+                "stderr": f"Invalid request: {exc}\n",
+            }
+        else:
+            response = self.runner.run(argv)
+        return json.dumps(response, separators=(",", ":")).encode() + b"\n"
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Unlink *path* if it is a socket nobody is listening on."""
+
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise OSError(f"A serve-cli daemon is already listening on {path}.")
+    finally:
+        probe.close()
+
+
+async def _serve(address: Address, warm: int, workers: int) -> None:
+    runner = ScriptRunner()
+    runner.warm(warm)
+    daemon = CliDaemon(runner, workers=workers)
+    await daemon.start(address)
+    assert daemon.address is not None
+    print(f"Serving CLI jobs on {describe_address(daemon.address)}", flush=True)
+    try:
+        await daemon.serve_forever()
+    finally:
+        await daemon.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tictactoe serve-cli",
+        description="Run CLI script jobs from cli-client on pre-warmed engines.",
+    )
+    parser.add_argument(
+        "--socket",
+        help="Unix socket to listen on (default: $TICTACTOE_CLI_SOCKET or a "
+        "per-user path in $XDG_RUNTIME_DIR or /tmp).",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        help="Listen on this TCP port on 127.0.0.1 instead"
+        + ("" if unix_sockets_supported() else " (the default here)")
+        + ".",
+    )
+    parser.add_argument(
+        "--warm",
+        type=int,
+        default=DEFAULT_POOL_SIZE,
+        help="3x3 engines to build before accepting jobs "
+        f"(default: {DEFAULT_POOL_SIZE}).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Threads running jobs (default: {DEFAULT_WORKERS}).",
+    )
+    args = parser.parse_args(argv)
+    address = resolve_address(args.socket, args.port)
+    try:
+        asyncio.run(_serve(address, args.warm, args.workers))
+    except KeyboardInterrupt:
+        pass
+    except OSError as exc:
+        raise SystemExit(str(exc)) from exc
+    return 0
+
+
+__all__ = ["CliDaemon", "EnginePool", "ScriptRunner", "main"]
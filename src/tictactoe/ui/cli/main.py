@@ -3,11 +3,18 @@
 from __future__ import annotations
 
 import argparse
-from typing import Iterable, Sequence
+import sys
+from typing import TYPE_CHECKING, Callable, Iterable, Optional, Sequence, TextIO, Tuple
 
-from tictactoe.domain.logic import GameSnapshot, GameState, TicTacToe
+from tictactoe.domain.logic import GameSnapshot, GameState, Player, TicTacToe
+from tictactoe.ui.cli.output import batch_writer
+
+if TYPE_CHECKING:  # pragma: no cover - loaded on demand by --ai and scripts
+    from tictactoe.ai import ComputerPlayer
 
 _QUIT_COMMANDS = {"q", "quit", "exit"}
+_UNDO_COMMANDS = {"u", "undo"}
+_REDO_COMMANDS = {"r", "redo"}
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -24,26 +31,71 @@ def _build_parser() -> argparse.ArgumentParser:
             "prompts (e.g. 0,4,8)."
         ),
     )
+    parser.add_argument(
+        "--batch",
+        metavar="PATH",
+        help=(
+            "Replay one comma separated game per line from PATH ('-' for stdin) "
+            "and print one result line per game."
+        ),
+    )
+    parser.add_argument(
+        "--format",
+        choices=("csv", "jsonl"),
+        default="csv",
+        help="Result format for --batch (default: csv).",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=3,
+        help="Number of rows and columns on the board (default: 3).",
+    )
+    parser.add_argument(
+        "--win-length",
+        type=int,
+        help="Marks in a row needed to win (defaults to the board size).",
+    )
+    parser.add_argument(
+        "--ai",
+        choices=[player.value for player in Player],
+        type=str.upper,
+        help="Let the computer play this side (X or O).",
+    )
+    parser.add_argument(
+        "--ai-depth",
+        type=int,
+        help="Limit the computer's search depth in plies.",
+    )
+    parser.add_argument(
+        "--ai-time",
+        type=float,
+        default=1.0,
+        help="Seconds the computer may think per move (default: 1.0).",
+    )
     parser.add_argument(
         "--quiet",
         action="store_true",
-        help="Suppress board rendering for scripted runs.",
+        help="Suppress board rendering (and the --batch summary) for scripted runs.",
     )
     return parser
 
 
 def _format_board(snapshot: GameSnapshot) -> str:
     board = snapshot.board
+    size = snapshot.size
+    width = len(str(len(board) - 1))
     rows = []
-    for base in range(0, 9, 3):
+    for base in range(0, len(board), size):
         cells = []
-        for offset in range(3):
+        for offset in range(size):
             idx = base + offset
             cell = board[idx]
             value = cell.value if cell is not None else str(idx)
-            cells.append(value)
+            cells.append(value.rjust(width))
         rows.append(" | ".join(cells))
-    return "\n---------\n".join(rows)
+    separator = "-" * len(rows[0])
+    return f"\n{separator}\n".join(rows)
 
 
 def _format_state_line(snapshot: GameSnapshot) -> str:
@@ -60,41 +112,166 @@ def _print_snapshot(snapshot: GameSnapshot) -> None:
     print(_format_state_line(snapshot))
 
 
-def _parse_script(script: str) -> list[int]:
-    tokens = [token.strip() for token in script.split(",") if token.strip()]
-    if not tokens:
-        raise ValueError("Script must contain at least one move.")
-    moves: list[int] = []
-    for token in tokens:
-        value = int(token)
-        if value < 0 or value > 8:
-            raise ValueError("Moves must be between 0 and 8.")
-        moves.append(value)
-    return moves
+def _parse_script(script: str, cell_count: int = 9) -> list[int]:
+    from tictactoe.records import parse_script
+
+    return list(parse_script(script, cell_count))
+
+
+def _build_computer(args: argparse.Namespace) -> Optional[ComputerPlayer]:
+    if not args.ai:
+        return None
+    from tictactoe.ai import ComputerPlayer, default_strategy
+
+    strategy = default_strategy(
+        args.size,
+        args.win_length,
+        max_depth=args.ai_depth,
+        time_budget=args.ai_time,
+    )
+    return ComputerPlayer(Player(args.ai), strategy)
+
+
+def _play_computer_turns(
+    game: TicTacToe, computer: Optional[ComputerPlayer], quiet: bool = False
+) -> None:
+    while computer is not None and computer.wants_move(game):
+        position = computer.play(game)
+        if not quiet:
+            print(f"Computer ({computer.player.value}) plays {position}.")
 
 
-def _run_script(game: TicTacToe, moves: Iterable[int], quiet: bool) -> None:
+def _run_script(
+    game: TicTacToe,
+    moves: Iterable[int],
+    quiet: bool,
+    computer: Optional[ComputerPlayer] = None,
+) -> None:
+    try:
+        _play_moves(game, moves, computer, quiet)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    if not quiet:
+        _print_snapshot(game.snapshot)
+
+
+def _play_moves(
+    game: TicTacToe,
+    moves: Iterable[int],
+    computer: Optional[ComputerPlayer],
+    quiet: bool,
+) -> None:
+    _play_computer_turns(game, computer, quiet)
     for move in moves:
         if not game.make_move(move):
-            raise SystemExit(f"Move {move} is invalid for the current board state.")
+            raise ValueError(f"Move {move} is invalid for the current board state.")
+        _play_computer_turns(game, computer, quiet)
+
+
+def _result_label(game: TicTacToe) -> str:
+    if game.state == GameState.DRAW:
+        return "draw"
+    if game.state == GameState.PLAYING:
+        return "unfinished"
+    winner = game.get_winner()
+    return winner.value if winner else "?"
+
+
+def _run_batch(
+    game: TicTacToe,
+    lines: Iterable[str],
+    output: TextIO,
+    fmt: str = "csv",
+    computer: Optional[ComputerPlayer] = None,
+) -> Tuple[int, int]:
+    """Replay one game per input line, reusing *game* between lines.
+
+    Blank lines and ``#`` comments are skipped. A line that cannot be parsed
+    or contains an illegal move produces an ``error`` result and the run
+    continues. Returns ``(games, errors)``.
+    """
+
+    write = batch_writer(output, fmt)
+    games = errors = 0
+    for number, line in enumerate(lines, start=1):
+        text = line.strip()
+        if not text or text.startswith("#"):
+            continue
+        games += 1
+        game.reset()
+        try:
+            _play_moves(game, _parse_script(text, game.cell_count), computer, True)
+        except ValueError as exc:
+            errors += 1
+            write({"line": number, "result": "error", "error": str(exc)})
+            continue
+        write(
+            {"line": number, "result": _result_label(game), "moves": len(game.history)}
+        )
+    return games, errors
+
+
+def _batch_session(
+    game: TicTacToe,
+    path: str,
+    fmt: str,
+    computer: Optional[ComputerPlayer],
+    quiet: bool,
+) -> int:
+    try:
+        source = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    except OSError as exc:
+        raise SystemExit(f"Cannot read {path}: {exc.strerror}") from exc
+    try:
+        games, errors = _run_batch(game, source, sys.stdout, fmt, computer)
+    finally:
+        if source is not sys.stdin:
+            source.close()
     if not quiet:
-        _print_snapshot(game.snapshot)
+        print(f"Replayed {games} games ({errors} with errors).", file=sys.stderr)
+    return 1 if errors else 0
 
 
-def _interactive_session(game: TicTacToe) -> int:
-    print("Press Q to quit at any time.")
+def _step_history(
+    game: TicTacToe, step: Callable[[], bool], computer: Optional[ComputerPlayer]
+) -> bool:
+    """Undo or redo moves until it is a human's turn again."""
+
+    if not step():
+        return False
+    while computer is not None and computer.wants_move(game) and step():
+        pass
+    return True
+
+
+def _interactive_session(
+    game: TicTacToe, computer: Optional[ComputerPlayer] = None
+) -> int:
+    print("Press Q to quit at any time, U to undo or R to redo.")
+    last_cell = game.cell_count - 1
     while game.state == GameState.PLAYING:
+        if computer is not None and computer.wants_move(game):
+            _play_computer_turns(game, computer)
+            continue
         _print_snapshot(game.snapshot)
         user_input = input(
-            f"Player {game.current_player.value}, choose a cell (0-8): "
+            f"Player {game.current_player.value}, choose a cell (0-{last_cell}): "
         ).strip()
         if user_input.lower() in _QUIT_COMMANDS:
             print("Exiting CLI – goodbye!")
             return 0
+        if user_input.lower() in _UNDO_COMMANDS:
+            if not _step_history(game, game.undo_move, computer):
+                print("Nothing to undo.")
+            continue
+        if user_input.lower() in _REDO_COMMANDS:
+            if not _step_history(game, game.redo_move, computer):
+                print("Nothing to redo.")
+            continue
         try:
             position = int(user_input)
         except ValueError:
-            print("Please enter a number between 0 and 8, or Q to quit.")
+            print(f"Please enter a number between 0 and {last_cell}, or Q to quit.")
             continue
         if not game.make_move(position):
             print("Move rejected – cell occupied or out of range. Try again.")
@@ -106,16 +283,24 @@ def main(argv: Sequence[str] | None = None) -> int:
     parser = _build_parser()
     args = parser.parse_args(argv)
 
-    game = TicTacToe()
+    try:
+        game = TicTacToe(size=args.size, win_length=args.win_length)
+        computer = _build_computer(args)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    if args.batch:
+        if args.script:
+            parser.error("--batch and --script cannot be combined")
+        return _batch_session(game, args.batch, args.format, computer, args.quiet)
     if args.script:
         try:
-            moves = _parse_script(args.script)
+            moves = _parse_script(args.script, game.cell_count)
         except ValueError as exc:
             raise SystemExit(str(exc)) from exc
-        _run_script(game, moves, args.quiet)
+        _run_script(game, moves, args.quiet, computer)
         return 0
 
-    return _interactive_session(game)
+    return _interactive_session(game, computer)
 
 
 __all__ = ["main"]
@@ -0,0 +1,32 @@
+"""Batch result rows shared by the CLI and its ``serve-cli`` client.
+
+Kept free of engine imports so the thin client stays quick to start.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from typing import Callable, Dict, TextIO
+
+BATCH_FIELDS = ("line", "result", "moves", "error")
+
+BatchWriter = Callable[[Dict[str, object]], None]
+
+
+def batch_writer(stream: TextIO, fmt: str) -> BatchWriter:
+    """Return a function writing one batch result row to *stream*.
+
+    ``fmt`` is ``"csv"`` (a header is written immediately) or ``"jsonl"``.
+    """
+
+    if fmt == "jsonl":
+
+        def write(row: Dict[str, object]) -> None:
+            stream.write(json.dumps(row, separators=(",", ":")) + "\n")
+
+        return write
+
+    writer = csv.DictWriter(stream, fieldnames=BATCH_FIELDS, lineterminator="\n")
+    writer.writeheader()
+    return writer.writerow
@@ -1,19 +1,21 @@
-"""Bootstrap helpers for the CustomTkinter GUI layer."""
+"""Bootstrap helpers for the CustomTkinter GUI layer.
+
+Nothing here runs at import time, and ``tkinter`` is only imported on the
+paths that talk to a real Tk backend, so the headless frontend never loads it.
+"""
 
 from __future__ import annotations
 
 import logging
 import os
 import platform
-import shutil
-import tempfile
 from dataclasses import dataclass
-from importlib import resources
 from pathlib import Path
-from tkinter import TclError
 from types import ModuleType
 from typing import Any, Callable, Optional, Tuple
 
+from tictactoe.resources import locate_asset
+
 
 def _import_headless_module() -> ModuleType:
     from tictactoe.ui.gui import headless as headless_ctk
@@ -66,79 +68,26 @@ def configure_windows_app_model(app_id: str = "TicTacToe.Game.v0.1.0") -> None:
 def create_root(env: CtkEnvironment) -> Tuple[ModuleType, Any, CtkEnvironment]:
     """Create the CTk root window, retrying in headless mode if needed."""
 
+    if env.headless:
+        return env.module, env.module.CTk(), env
+
+    from tkinter import TclError
+
     try:
         return env.module, env.module.CTk(), env
     except TclError:
-        if env.headless:
-            raise
         fallback_env = load_customtkinter(force_headless=True)
         return fallback_env.module, fallback_env.module.CTk(), fallback_env
 
 
-_ICON_CACHE: Optional[Path] = None
+_ICON_NAME = "favicon.ico"
 _LOGGER = logging.getLogger(__name__)
 
 
 def locate_icon_file() -> Optional[Path]:
     """Resolve the favicon path from source or installed package data."""
 
-    global _ICON_CACHE
-
-    if _ICON_CACHE and _ICON_CACHE.exists():
-        return _ICON_CACHE
-
-    source_candidate = (
-        Path(__file__).resolve().parent.parent.parent / "assets" / "favicon.ico"
-    )
-    if source_candidate.exists():
-        _ICON_CACHE = source_candidate
-        return source_candidate
-
-    package_candidate = _locate_package_icon()
-    if package_candidate is not None:
-        _ICON_CACHE = package_candidate
-        return package_candidate
-
-    return None
-
-
-def _locate_package_icon() -> Optional[Path]:
-    """Locate the icon via importlib.resources for installed packages."""
-
-    files_fn = getattr(resources, "files", None)
-    if files_fn is None:
-        return None
-
-    try:
-        icon_resource = files_fn("tictactoe") / "assets" / "favicon.ico"
-    except ModuleNotFoundError:
-        return None
-
-    try:
-        icon_path = Path(icon_resource)
-        if icon_path.exists():
-            return icon_path
-    except TypeError:
-        pass
-
-    as_file_fn = getattr(resources, "as_file", None)
-    if as_file_fn is None:
-        return None
-
-    try:
-        with as_file_fn(icon_resource) as extracted_path:
-            extracted = Path(extracted_path)
-            if not extracted.exists():
-                return None
-            temp_dir = Path(tempfile.gettempdir()) / "tictactoe"
-            temp_dir.mkdir(parents=True, exist_ok=True)
-            temp_path = temp_dir / "favicon.ico"
-            shutil.copyfile(extracted, temp_path)
-            return temp_path
-    except FileNotFoundError:
-        return None
-
-    return None
+    return locate_asset(_ICON_NAME)
 
 
 def apply_window_icon(
@@ -155,6 +104,8 @@ def apply_window_icon(
             _emit_icon_warning("Icon file not found", warning_handler)
         return
 
+    from tkinter import TclError
+
     try:
         root.iconbitmap(default=str(icon_path))
     except TclError as exc:
@@ -179,6 +130,8 @@ def schedule_icon_refresh(
     if headless or icon_path is None:
         return
 
+    from tkinter import TclError
+
     try:
         root.after(10, lambda: root.iconbitmap(str(icon_path)))
     except (TclError, AttributeError):
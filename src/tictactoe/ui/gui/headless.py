@@ -66,6 +66,9 @@ class CTk(_Widget):
     def after(self, _delay: int, callback: Callable[[], None]) -> None:
         callback()
 
+    def after_idle(self, callback: Callable[[], None]) -> None:
+        callback()
+
     def mainloop(self) -> None:  # pragma: no cover - no GUI loop in tests
         return None
 
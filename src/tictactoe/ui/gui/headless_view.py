@@ -10,7 +10,11 @@ from tictactoe.ui.gui.contracts import GameViewPort
 
 
 class HeadlessGameView(GameViewPort):
-    """Pure-Python implementation that mirrors the CustomTk view behavior."""
+    """Pure-Python implementation that mirrors the CustomTk view behavior.
+
+    Like ``GameView`` it only updates cells whose content changed;
+    ``widget_updates`` counts the cell and status updates it performed.
+    """
 
     def __init__(
         self,
@@ -20,16 +24,26 @@ class HeadlessGameView(GameViewPort):
         on_cell_click: Callable[[int], None],
         on_reset: Callable[[], None],
         view_config: GameViewConfig | None = None,
+        board_size: int = 3,
+        on_undo: Callable[[], None] | None = None,
+        on_redo: Callable[[], None] | None = None,
     ) -> None:
         del ctk_module, root  # unused but kept for signature compatibility
         self._on_cell_click = on_cell_click
         self._on_reset = on_reset
+        self._on_undo = on_undo
+        self._on_redo = on_redo
         self.config = view_config or GameViewConfig()
+        self.board_size = board_size
 
         self._built = False
-        self._cells: List[dict[str, str]] = [self._make_empty_cell() for _ in range(9)]
+        self._cells: List[dict[str, str]] = [
+            self._make_empty_cell() for _ in range(board_size * board_size)
+        ]
         self._status_text = ""
         self._reset_label = self.config.text.reset_button
+        self._shown: List[object] = [None] * (board_size * board_size)
+        self.widget_updates = 0
 
     def build(self) -> None:
         self._built = True
@@ -42,7 +56,10 @@ class HeadlessGameView(GameViewPort):
             return
 
         self._render_board(snapshot.board)
-        self._status_text = self._status_message(snapshot)
+        text = self._status_message(snapshot)
+        if text != self._status_text:
+            self._status_text = text
+            self.widget_updates += 1
 
     def cell_count(self) -> int:
         self._ensure_built()
@@ -75,8 +92,13 @@ class HeadlessGameView(GameViewPort):
     # Helpers mirrored from the CustomTk view
     # ------------------------------------------------------------------
     def _render_board(self, board: Sequence) -> None:
+        shown = self._shown
         for position in range(len(self._cells)):
             cell_value = board[position]
+            if cell_value is shown[position]:
+                continue
+            shown[position] = cell_value
+            self.widget_updates += 1
             target = self._cells[position]
             if cell_value is None:
                 target.update(text="", state="normal")
@@ -1,18 +1,50 @@
 """GUI implementation for Tic Tac Toe using CustomTkinter."""
 
-from typing import Any, Callable, Optional, Protocol
+import os
+import sys
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Dict, Optional, Protocol, Union
 
+from tictactoe.ai import ComputerPlayer, default_strategy
 from tictactoe.config import GameViewConfig, WindowConfig
-from tictactoe.domain.logic import GameSnapshot, TicTacToe
+from tictactoe.domain.logic import GameSnapshot, Player, TicTacToe
 from tictactoe.ui.gui import bootstrap
 from tictactoe.ui.gui.contracts import GameViewPort
 from tictactoe.ui.gui.theme import apply_default_theme
 from tictactoe.ui.gui.view import GameView
 
-bootstrap.configure_windows_app_model()
+GameFactory = Callable[[], TicTacToe]
 
+_AI_ENV_VAR = "TICTACTOE_AI"
+_AI_TIME_BUDGET = 1.0
 
-GameFactory = Callable[[], TicTacToe]
+
+def _startup_phase(name: str) -> ContextManager[None]:
+    """Time a phase of GUI start-up when metrics are enabled.
+
+    Enabling metrics imports :mod:`tictactoe.metrics`, so an uninstrumented
+    run never has to load it.
+    """
+
+    metrics = sys.modules.get("tictactoe.metrics")
+    if metrics is None:
+        return nullcontext()
+    phase: ContextManager[None] = metrics.phase("gui", name)
+    return phase
+
+
+class LegacyViewFactory(Protocol):
+    """View factory signature from before N x N boards and undo/redo."""
+
+    def __call__(
+        self,
+        *,
+        ctk_module: Any,
+        root: Any,
+        on_cell_click: Callable[[int], None],
+        on_reset: Callable[[], None],
+        view_config: GameViewConfig,
+    ) -> GameViewPort: ...
 
 
 class ViewFactory(Protocol):
@@ -24,9 +56,28 @@ class ViewFactory(Protocol):
         on_cell_click: Callable[[int], None],
         on_reset: Callable[[], None],
         view_config: GameViewConfig,
+        board_size: int,
+        on_undo: Callable[[], None],
+        on_redo: Callable[[], None],
     ) -> GameViewPort: ...
 
 
+def _accepted_keywords(
+    factory: Callable[..., Any], keywords: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Return the entries of *keywords* that *factory* takes as parameters."""
+
+    import inspect
+
+    try:
+        parameters = inspect.signature(factory).parameters
+    except (TypeError, ValueError):  # pragma: no cover - uninspectable builtins
+        return keywords
+    if any(p.kind is p.VAR_KEYWORD for p in parameters.values()):
+        return keywords
+    return {name: value for name, value in keywords.items() if name in parameters}
+
+
 def _build_default_view(
     *,
     ctk_module: Any,
@@ -34,6 +85,9 @@ def _build_default_view(
     on_cell_click: Callable[[int], None],
     on_reset: Callable[[], None],
     view_config: GameViewConfig,
+    board_size: int,
+    on_undo: Callable[[], None],
+    on_redo: Callable[[], None],
 ) -> GameView:
     """Create the default GameView instance."""
 
@@ -43,6 +97,9 @@ def _build_default_view(
         on_cell_click=on_cell_click,
         on_reset=on_reset,
         view_config=view_config,
+        board_size=board_size,
+        on_undo=on_undo,
+        on_redo=on_redo,
     )
 
 
@@ -53,45 +110,71 @@ class TicTacToeGUI:
         self,
         *,
         game_factory: Optional[GameFactory] = None,
-        view_factory: Optional[ViewFactory] = None,
+        view_factory: Optional[Union[ViewFactory, LegacyViewFactory]] = None,
         window_config: Optional[WindowConfig] = None,
         view_config: Optional[GameViewConfig] = None,
+        computer: Optional[ComputerPlayer] = None,
+        computer_delay_ms: int = 250,
     ):
-        """Initialize the GUI application with injectable hooks."""
+        """Initialize the GUI application with injectable hooks.
+
+        *view_factory* may also have the older :class:`LegacyViewFactory`
+        signature; it then gets no undo/redo callbacks and only 3x3 boards.
+        """
 
         self._game_factory = game_factory or TicTacToe
         self._view_factory = view_factory or _build_default_view
         self.window_config = window_config or WindowConfig()
         self.view_config = view_config or GameViewConfig()
-
-        self.game = self._game_factory()
-        self._ctk_env = bootstrap.load_customtkinter()
-        self.ctk = self._ctk_env.module
-        self._ctk_headless = self._ctk_env.headless
-        self.root = self._create_root()
-
-        self.root.title(self.window_config.title)
-        self.root.geometry(self.window_config.geometry)
-        self.root.resizable(*self.window_config.resizable)
-
-        apply_default_theme(self.ctk)
-
-        self.icon_path = bootstrap.locate_icon_file()
-        bootstrap.apply_window_icon(
-            self.root, self.icon_path, headless=self._ctk_headless
-        )
-
-        self.view = self._view_factory(
-            ctk_module=self.ctk,
-            root=self.root,
-            on_cell_click=self._on_cell_click,
-            on_reset=self._reset_game,
-            view_config=self.view_config,
-        )
-        self.view.build()
-
-        self.game.add_listener(self._on_game_updated)
-        self._on_game_updated(self.game.snapshot)
+        self.computer = computer
+        self.computer_delay_ms = computer_delay_ms
+        self._computer_pending = False
+
+        with _startup_phase("create_game"):
+            self.game = self._game_factory()
+        with _startup_phase("load_customtkinter"):
+            self._ctk_env = bootstrap.load_customtkinter()
+            self.ctk = self._ctk_env.module
+            self._ctk_headless = self._ctk_env.headless
+        with _startup_phase("create_root"):
+            self.root = self._create_root()
+
+        with _startup_phase("configure_window"):
+            self.root.title(self.window_config.title)
+            self.root.geometry(self.window_config.geometry)
+            self.root.resizable(*self.window_config.resizable)
+            apply_default_theme(self.ctk)
+
+        with _startup_phase("window_icon"):
+            self.icon_path = bootstrap.locate_icon_file()
+            bootstrap.apply_window_icon(
+                self.root, self.icon_path, headless=self._ctk_headless
+            )
+
+        with _startup_phase("build_view"):
+            extras = _accepted_keywords(
+                self._view_factory,
+                {
+                    "board_size": self.game.size,
+                    "on_undo": self._undo_move,
+                    "on_redo": self._redo_move,
+                },
+            )
+            if "board_size" not in extras and self.game.size != 3:
+                raise TypeError("The view factory only supports 3x3 boards.")
+            self.view = self._view_factory(
+                ctk_module=self.ctk,
+                root=self.root,
+                on_cell_click=self._on_cell_click,
+                on_reset=self._reset_game,
+                view_config=self.view_config,
+                **extras,
+            )
+            self.view.build()
+
+        with _startup_phase("first_render"):
+            self.game.add_listener(self._on_game_updated)
+            self._on_game_updated(self.game.snapshot)
 
     def _create_root(self):
         """Create the root window with fallback to headless widgets."""
@@ -104,6 +187,8 @@ class TicTacToeGUI:
 
     def _on_cell_click(self, position: int):
         """Handle cell button click."""
+        if self._is_computer_turn():
+            return
         self.game.make_move(position)
 
     def _on_game_updated(self, snapshot: GameSnapshot) -> None:
@@ -113,6 +198,46 @@ class TicTacToeGUI:
             return
 
         self.view.render(snapshot)
+        self._schedule_computer_move()
+
+    def _schedule_computer_move(self) -> None:
+        """Queue the computer's reply when it is its turn to play."""
+
+        if self.computer is None or self._computer_pending:
+            return
+        if not self.computer.wants_move(self.game):
+            return
+        self._computer_pending = True
+        self.root.after(self.computer_delay_ms, self._play_computer_move)
+
+    def _play_computer_move(self) -> None:
+        self._computer_pending = False
+        if self.computer is not None and self.computer.wants_move(self.game):
+            self.computer.play(self.game)
+
+    def _undo_move(self) -> None:
+        """Take back the last move, or the last full turn against the computer.
+
+        Listeners see one update once the position is back on the human's
+        turn, so the computer is not prompted to replay in between.
+        """
+        with self.game.suppress_notifications(notify_on_exit=True):
+            if not self.game.undo_move():
+                return
+            while self._is_computer_turn() and self.game.can_undo:
+                self.game.undo_move()
+
+    def _redo_move(self) -> None:
+        """Replay undone moves up to the human's next turn."""
+
+        with self.game.suppress_notifications(notify_on_exit=True):
+            if not self.game.redo_move():
+                return
+            while self._is_computer_turn() and self.game.can_redo:
+                self.game.redo_move()
+
+    def _is_computer_turn(self) -> bool:
+        return self.computer is not None and self.computer.wants_move(self.game)
 
     def _reset_game(self):
         """Reset the game to initial state."""
@@ -127,9 +252,25 @@ class TicTacToeGUI:
         self.root.mainloop()
 
 
+def _computer_from_env() -> Optional[ComputerPlayer]:
+    """Seat the negamax AI when TICTACTOE_AI names a side (X or O)."""
+
+    side = os.environ.get(_AI_ENV_VAR, "").strip().upper()
+    if not side:
+        return None
+    try:
+        player = Player(side)
+    except ValueError as exc:
+        message = f"{_AI_ENV_VAR} must be X or O, not {side!r}."
+        raise SystemExit(message) from exc
+
+    return ComputerPlayer(player, default_strategy(time_budget=_AI_TIME_BUDGET))
+
+
 def main():
     """Entry point for the GUI application."""
-    app = TicTacToeGUI()
+    bootstrap.configure_windows_app_model()
+    app = TicTacToeGUI(computer=_computer_from_env())
     app.run()
 
 
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, Optional, Sequence, cast
+from typing import Any, Callable, Dict, List, Optional, Sequence, cast
 
 from tictactoe.config import FontSpec, GameViewConfig
 from tictactoe.domain.logic import GameSnapshot, GameState, Player
@@ -13,9 +13,18 @@ from tictactoe.ui.gui.contracts import (
     SupportsText,
 )
 
+# Marks a cell or label whose content has not been rendered yet.
+_UNRENDERED: Any = object()
+
 
 class GameView(GameViewPort):
-    """Responsible for building and updating the widget tree."""
+    """Responsible for building and updating the widget tree.
+
+    Rendering is differential: the view remembers what each widget shows and
+    only reconfigures the ones whose content changed. Snapshots are rendered
+    from ``root.after_idle``, so a burst of updates within one frame is drawn
+    once, from the latest snapshot.
+    """
 
     def __init__(
         self,
@@ -25,19 +34,31 @@ class GameView(GameViewPort):
         on_cell_click: Callable[[int], None],
         on_reset: Callable[[], None],
         view_config: GameViewConfig | None = None,
+        board_size: int = 3,
+        on_undo: Callable[[], None] | None = None,
+        on_redo: Callable[[], None] | None = None,
     ) -> None:
         self.ctk: Any = ctk_module
         self.root: Any = root
         self._on_cell_click = on_cell_click
         self._on_reset = on_reset
+        self._on_undo = on_undo
+        self._on_redo = on_redo
         self.config = view_config or GameViewConfig()
+        self.board_size = board_size
 
         self.title_label: SupportsText | None = None
         self.status_label: SupportsText | None = None
         self.board_frame: Any | None = None
         self.reset_button: ResetControl | None = None
+        self.undo_button: ResetControl | None = None
+        self.redo_button: ResetControl | None = None
         self.buttons: list[CellButton] = []
         self._built = False
+        self._shown_cells: List[Any] = []
+        self._shown_status: Any = _UNRENDERED
+        self._pending: Optional[GameSnapshot] = None
+        self._frame_scheduled = False
 
     def build(self) -> None:
         """Construct all widgets for the application."""
@@ -47,10 +68,10 @@ class GameView(GameViewPort):
         title_label = cast(
             SupportsText,
             self.ctk.CTkLabel(
-            self.root,
-            text=self.config.text.title,
-            font=fonts["title"],
-            **self._text_color_kwargs(self.config.colors.title_text),
+                self.root,
+                text=self.config.text.title,
+                font=fonts["title"],
+                **self._text_color_kwargs(self.config.colors.title_text),
             ),
         )
         self.title_label = title_label
@@ -59,10 +80,10 @@ class GameView(GameViewPort):
         status_label = cast(
             SupportsText,
             self.ctk.CTkLabel(
-            self.root,
-            text="",
-            font=fonts["status"],
-            **self._text_color_kwargs(self.config.colors.status_text),
+                self.root,
+                text="",
+                font=fonts["status"],
+                **self._text_color_kwargs(self.config.colors.status_text),
             ),
         )
         self.status_label = status_label
@@ -74,14 +95,19 @@ class GameView(GameViewPort):
         self.board_frame.pack(pady=pady, padx=padx)
 
         self._build_board(fonts["cell"])
-        self._build_reset_button(fonts["reset"])
+        if self._on_undo is None and self._on_redo is None:
+            self._build_reset_button(fonts["reset"])
+        else:
+            self._build_history_controls(fonts["reset"])
         self._built = True
 
     def _build_board(self, font_button: Any) -> None:
-        """Create the 3x3 grid of buttons."""
+        """Create the board_size x board_size grid of buttons."""
 
         self.buttons = []
-        for position in range(9):
+        size = self.board_size
+        self._shown_cells = [_UNRENDERED] * (size * size)
+        for position in range(size * size):
             button_kwargs = self._cell_button_color_kwargs()
             button = self.ctk.CTkButton(
                 self.board_frame,
@@ -93,8 +119,8 @@ class GameView(GameViewPort):
                 **button_kwargs,
             )
             button.grid(
-                row=position // 3,
-                column=position % 3,
+                row=position // size,
+                column=position % size,
                 padx=self.config.layout.cell_spacing,
                 pady=self.config.layout.cell_spacing,
             )
@@ -105,24 +131,68 @@ class GameView(GameViewPort):
         reset_button = cast(
             ResetControl,
             self.ctk.CTkButton(
-            self.root,
-            text=self.config.text.reset_button,
-            font=font_reset,
-            command=self._on_reset,
-            **reset_kwargs,
+                self.root,
+                text=self.config.text.reset_button,
+                font=font_reset,
+                command=self._on_reset,
+                **reset_kwargs,
             ),
         )
         self.reset_button = reset_button
         reset_button.pack(pady=self.config.layout.reset_padding)
 
+    def _build_history_controls(self, font_reset: Any) -> None:
+        """Lay out Undo, New Game and Redo side by side below the board."""
+
+        layout = self.config.layout
+        text = self.config.text
+        controls = self.ctk.CTkFrame(self.root, fg_color="transparent")
+        controls.pack(pady=layout.reset_padding)
+
+        reset_kwargs = self._reset_button_color_kwargs()
+        entries = (
+            ("undo_button", text.undo_button, self._on_undo),
+            ("reset_button", text.reset_button, self._on_reset),
+            ("redo_button", text.redo_button, self._on_redo),
+        )
+        for column, (attribute, label, command) in enumerate(entries):
+            button = self.ctk.CTkButton(
+                controls,
+                text=label,
+                width=layout.control_width,
+                font=font_reset,
+                command=command,
+                state="normal" if command else "disabled",
+                **reset_kwargs,
+            )
+            button.grid(row=0, column=column, padx=layout.cell_spacing)
+            setattr(self, attribute, cast(ResetControl, button))
+
     def render(self, snapshot: GameSnapshot) -> None:
-        """Update the widget state to reflect the game snapshot."""
+        """Queue *snapshot* to be drawn on the next idle frame."""
 
         if not self.is_ready():
             return
 
         self._ensure_built()
 
+        self._pending = snapshot
+        if self._frame_scheduled:
+            return
+        after_idle = getattr(self.root, "after_idle", None)
+        if after_idle is None:
+            self.flush()
+            return
+        self._frame_scheduled = True
+        after_idle(self.flush)
+
+    def flush(self) -> None:
+        """Draw the queued snapshot now, if there is one."""
+
+        self._frame_scheduled = False
+        snapshot, self._pending = self._pending, None
+        if snapshot is None:
+            return
         self._render_board(snapshot.board)
         self._render_status(snapshot)
 
@@ -146,6 +216,7 @@ class GameView(GameViewPort):
     def status_text(self) -> str:
         if not self.status_label:
             return ""
+        self.flush()
         return self.status_label.cget("text")
 
     def reset_button_label(self) -> str:
@@ -154,8 +225,12 @@ class GameView(GameViewPort):
         return self.reset_button.cget("text")
 
     def _render_board(self, board: Sequence[Optional[Player]]) -> None:
+        shown = self._shown_cells
         for position, button in enumerate(self.buttons):
             cell = board[position]
+            if cell is shown[position]:
+                continue
+            shown[position] = cell
             if cell is None:
                 button.configure(text="", state="normal")
             else:
@@ -165,7 +240,9 @@ class GameView(GameViewPort):
         text = self._status_message(snapshot)
         if self.status_label is None:
             raise RuntimeError("status label is not initialized")
-        self.status_label.configure(text=text)
+        if text != self._shown_status:
+            self._shown_status = text
+            self.status_label.configure(text=text)
 
     def _build_fonts(self) -> Dict[str, Any]:
         """Instantiate the CustomTkinter fonts from the config."""
@@ -239,6 +316,7 @@ class GameView(GameViewPort):
 
     def _button_at(self, position: int) -> CellButton:
         self._ensure_built()
+        self.flush()
         if position < 0 or position >= len(self.buttons):
             raise IndexError(position)
         return self.buttons[position]
@@ -0,0 +1,103 @@
+"""Tests for the negamax computer opponent."""
+
+from __future__ import annotations
+
+import pytest
+
+from tictactoe.ai import ComputerPlayer, NegamaxSearcher
+from tictactoe.ai.negamax import move_order
+from tictactoe.ai.zobrist import zobrist_hash
+from tictactoe.domain.logic import GameState, Player, TicTacToe
+
+
+def _game(moves, **kwargs) -> TicTacToe:
+    game = TicTacToe(**kwargs)
+    for move in moves:
+        assert game.make_move(move)
+    return game
+
+
+def test_empty_board_solves_to_draw_quickly():
+    result = NegamaxSearcher().search(TicTacToe())
+    assert result.complete
+    assert result.score == 0
+    assert result.move == 4
+    assert result.elapsed < 1.0
+
+
+def test_takes_immediate_win():
+    result = NegamaxSearcher().search(_game([0, 3, 1, 4]))
+    assert result.move == 2
+    assert result.is_win
+
+
+def test_blocks_opponent_threat():
+    assert NegamaxSearcher().choose_move(_game([0, 4, 1])) == 2
+
+
+def test_detects_forced_loss():
+    # X holds a fork (two open lines) so O cannot avoid losing.
+    result = NegamaxSearcher().search(_game([0, 1, 4, 8, 6]))
+    assert result.is_loss
+    assert result.complete
+
+
+def test_perfect_self_play_is_a_draw():
+    game = TicTacToe()
+    searcher = NegamaxSearcher()
+    while game.state == GameState.PLAYING:
+        assert game.make_move(searcher.choose_move(game))
+    assert game.state == GameState.DRAW
+    assert searcher.table_size > 0
+
+
+def test_node_budget_limits_search():
+    game = _game([112], size=15, win_length=5)
+    result = NegamaxSearcher(node_budget=500).search(game)
+    assert not result.complete
+    assert result.nodes <= 500 + 256
+    assert game.board[result.move] is None
+
+
+def test_depth_limited_search_on_large_board():
+    game = _game([112, 113, 96], size=15, win_length=5)
+    result = NegamaxSearcher(max_depth=2).search(game)
+    assert result.depth == 2
+    assert game.board[result.move] is None
+
+
+def test_zero_depth_is_not_a_full_search():
+    game = _game([])
+    result = NegamaxSearcher(max_depth=0).search(game)
+    assert result.depth == 0 and result.nodes == 0
+    assert not result.complete
+    with pytest.raises(ValueError):
+        NegamaxSearcher(max_depth=-1)
+
+
+def test_searcher_rejects_finished_game():
+    with pytest.raises(ValueError):
+        NegamaxSearcher().search(_game([0, 3, 1, 4, 2]))
+
+
+def test_move_order_prefers_centre_then_corners():
+    order = move_order(3, 3)
+    assert order[0] == 4
+    assert set(order[1:5]) == {0, 2, 6, 8}
+
+
+def test_zobrist_hash_depends_on_marks():
+    first = zobrist_hash(_game([0, 4]).board)
+    swapped = zobrist_hash(_game([4, 0]).board)
+    assert first != swapped
+    assert zobrist_hash(TicTacToe().board) == 0
+
+
+def test_computer_player_only_moves_on_its_turn():
+    computer = ComputerPlayer(Player.O, NegamaxSearcher())
+    game = TicTacToe()
+    assert not computer.wants_move(game)
+    game.make_move(0)
+    assert computer.wants_move(game)
+    assert computer.play(game) == 4
+    assert game.current_player == Player.X
@@ -0,0 +1,99 @@
+"""Tests for the game analysis engine."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from tictactoe.__main__ import main as launcher
+from tictactoe.ai import GameValue
+from tictactoe.analysis import (
+    AnalysisSummary,
+    MoveQuality,
+    PositionEvaluator,
+    analyze_game,
+    analyze_stream,
+    shared_evaluator,
+)
+from tictactoe.domain.logic import Player, TicTacToe
+from tictactoe.records import RecordWriter
+
+BEST, INACCURATE, BLUNDER = (
+    MoveQuality.BEST,
+    MoveQuality.INACCURATE,
+    MoveQuality.BLUNDER,
+)
+
+
+def test_edge_reply_to_corner_opening_is_a_blunder():
+    analysis = analyze_game(1, (0, 1, 2), shared_evaluator())
+
+    assert analysis.grades == (BEST, BLUNDER, INACCURATE)
+    assert analysis.count(BLUNDER, Player.O) == 1
+    assert analysis.count(BLUNDER, Player.X) == 0
+    assert analysis.annotated() == "0 1?? 2?"
+    assert analysis.result == "unfinished"
+
+
+def test_perfect_game_has_only_best_moves():
+    analysis = analyze_game(1, (4, 0, 8, 2, 1, 7, 6, 3, 5), shared_evaluator())
+
+    assert analysis.result == "draw"
+    assert set(analysis.grades) == {BEST}
+
+
+def test_illegal_moves_raise():
+    with pytest.raises(ValueError, match="invalid"):
+        analyze_game(1, (0, 0), shared_evaluator())
+
+
+def test_searched_values_match_table_and_are_memoized():
+    searched = PositionEvaluator(use_table=False)
+    tabled = shared_evaluator()
+    game = TicTacToe()
+    for move in (0, 1):
+        game.make_move(move)
+
+    assert searched.value(game) == tabled.value(game) == GameValue.WIN
+    for moves in ((0, 3, 1, 4, 2), (0, 3, 1, 4, 2)):
+        assert analyze_game(1, moves, searched) == analyze_game(1, moves, tabled)
+    assert searched.cache.hits > 0
+
+
+def test_larger_boards_are_graded_within_the_time_budget():
+    evaluator = PositionEvaluator(4, time_budget=0.05)
+    analysis = analyze_game(1, (0, 5, 1, 6, 2), evaluator)
+
+    assert not evaluator.exact
+    assert shared_evaluator().exact
+    assert len(analysis.grades) == 5
+
+
+def test_stream_keeps_input_order_across_workers():
+    games = [(1, "0,3,1,4,2"), (2, "0,0"), (3, (4, 0)), (4, "x")] * 3
+    inline = list(analyze_stream(games, chunk_size=2))
+    pooled = list(analyze_stream(games, workers=2, chunk_size=2))
+
+    assert inline == pooled
+    assert [analysis.number for analysis in pooled] == [1, 2, 3, 4] * 3
+    summary = AnalysisSummary()
+    for analysis in pooled:
+        summary.add(analysis)
+    assert (summary.games, summary.errors) == (6, 6)
+    assert summary.moves(Player.X) == 12
+
+
+def test_analyze_frontend_reads_record_files(tmp_path, capsys):
+    archive = tmp_path / "games.ttr"
+    with RecordWriter(archive) as writer:
+        writer.extend([(0, 1, 2), (4, 0, 8, 2, 1, 7, 6, 3, 5)])
+
+    result = launcher(["analyze", str(archive), "--format", "jsonl", "--workers", "1"])
+
+    captured = capsys.readouterr()
+    rows = [json.loads(line) for line in captured.out.splitlines()]
+    assert rows[0]["grades"] == ["best", "blunder", "inaccurate"]
+    assert rows[1]["result"] == "draw" and rows[1]["blunders"] == 0
+    assert "Analysed 2 games" in captured.err
+    assert result == 0
@@ -0,0 +1,69 @@
+"""Tests for the vectorized batch simulator."""
+
+from __future__ import annotations
+
+import pytest
+
+from tictactoe.domain.logic import GameState, Player, TicTacToe
+
+np = pytest.importorskip("numpy")
+
+from tictactoe.batch import BatchSimulator, line_matrix, simulate  # noqa: E402
+
+
+def _replay(moves) -> TicTacToe:
+    game = TicTacToe()
+    for move in moves:
+        if move < 0:
+            break
+        assert game.make_move(int(move))
+    return game
+
+
+def test_line_matrix_marks_every_win_line():
+    matrix = line_matrix()
+    assert matrix.shape == (8, 9)
+    assert matrix.dtype == np.int8
+    assert (matrix.sum(axis=1) == 3).all()
+
+
+def test_random_games_match_scalar_engine():
+    simulator = BatchSimulator(2_000, seed=7)
+    simulator.play_random()
+
+    expected = {GameState.X_WON: 1, GameState.O_WON: -1, GameState.DRAW: 0}
+    for row in range(simulator.batch_size):
+        game = _replay(simulator.moves[row])
+        assert game.state != GameState.PLAYING
+        assert expected[game.state] == simulator.winners[row]
+        assert len(game.history) == simulator.lengths[row]
+        marks = [{Player.X: 1, Player.O: -1, None: 0}[cell] for cell in game.board]
+        assert marks == simulator.boards[row].tolist()
+
+
+def test_simulate_aggregates_all_games():
+    result = simulate(25_000, batch_size=10_000, seed=3)
+
+    assert result.games == 25_000
+    assert result.x_wins + result.o_wins + result.draws == result.games
+    assert sum(result.length_histogram) == result.games
+    assert result.length_histogram[:5] == (0, 0, 0, 0, 0)
+    # Uniform random play: X wins ~58.5%, O ~28.8%, draws ~12.7%.
+    assert result.x_win_rate == pytest.approx(0.585, abs=0.02)
+    assert result.draw_rate == pytest.approx(0.127, abs=0.02)
+    assert simulate(25_000, batch_size=10_000, seed=3) == result
+
+
+def test_opening_is_forced_in_every_game():
+    simulator = BatchSimulator(100, seed=1)
+    simulator.play_random(opening=(4,))
+    assert (simulator.moves[:, 0] == 4).all()
+
+
+def test_illegal_moves_are_rejected():
+    simulator = BatchSimulator(2)
+    simulator.apply_moves([0, 1])
+    with pytest.raises(ValueError, match="empty cells"):
+        simulator.apply_moves([0, 2])
+    with pytest.raises(ValueError, match="between 0 and 8"):
+        simulator.apply_moves([9, 2])
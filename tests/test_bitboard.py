@@ -0,0 +1,108 @@
+"""Parity tests between the list-backed and bitboard engines."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+import pytest
+
+from tictactoe.domain.bitboard import BitboardTicTacToe
+from tictactoe.domain.logic import GameState, Player, TicTacToe
+
+CANDIDATE_MOVES = tuple(range(-1, 10))
+
+
+def _replay(factory, moves: Tuple[int, ...]):
+    game = factory()
+    for move in moves:
+        assert game.make_move(move)
+    return game
+
+
+def _reachable_positions() -> Dict[tuple, Tuple[int, ...]]:
+    """Map every reachable board to one move sequence that produces it."""
+
+    positions: Dict[tuple, Tuple[int, ...]] = {}
+    frontier: List[Tuple[int, ...]] = [()]
+    while frontier:
+        moves = frontier.pop()
+        game = _replay(TicTacToe, moves)
+        if game.board in positions:
+            continue
+        positions[game.board] = moves
+        if game.state != GameState.PLAYING:
+            continue
+        for position in range(9):
+            if game.board[position] is None:
+                frontier.append(moves + (position,))
+    return positions
+
+
+REACHABLE = _reachable_positions()
+
+
+def test_reachable_position_count():
+    assert len(REACHABLE) == 5478
+
+
+def test_engines_agree_on_every_reachable_position():
+    for moves in REACHABLE.values():
+        reference = _replay(TicTacToe, moves)
+        bitboard = _replay(BitboardTicTacToe, moves)
+        assert bitboard.snapshot == reference.snapshot
+
+        for candidate in CANDIDATE_MOVES:
+            reference = _replay(TicTacToe, moves)
+            bitboard = _replay(BitboardTicTacToe, moves)
+            accepted = reference.make_move(candidate)
+            assert bitboard.make_move(candidate) is accepted
+            assert bitboard.snapshot == reference.snapshot
+
+
+def test_bitboard_masks_track_moves():
+    game = BitboardTicTacToe()
+    for move in (0, 4, 8):
+        assert game.make_move(move)
+    assert game.masks == (0b100000001, 0b000010000)
+
+
+def test_bitboard_listeners_receive_snapshots():
+    game = BitboardTicTacToe()
+    received = []
+    game.add_listener(received.append)
+
+    game.make_move(4)
+    game.reset()
+    game.remove_listener(received.append)
+    game.make_move(0)
+
+    assert [snapshot.board[4] for snapshot in received] == [Player.X, None]
+    assert received[-1].state == GameState.PLAYING
+
+
+@pytest.mark.parametrize(
+    ("moves", "state"),
+    [
+        ((0, 3, 1, 4, 2), GameState.X_WON),
+        ((0, 2, 3, 5, 4, 8), GameState.O_WON),
+        ((0, 1, 2, 4, 3, 5, 7, 6, 8), GameState.DRAW),
+    ],
+)
+def test_bitboard_terminal_states(moves, state):
+    game = _replay(BitboardTicTacToe, moves)
+    assert game.state == state
+    assert not any(game.make_move(position) for position in range(9))
+
+
+def test_undo_redo_matches_reference_engine():
+    reference = TicTacToe()
+    bitboard = BitboardTicTacToe()
+    for move in (0, 3, 1, 4, 2):
+        reference.make_move(move)
+        bitboard.make_move(move)
+    assert bitboard.state == GameState.X_WON
+
+    for step in ("undo_move", "undo_move", "redo_move", "undo_move"):
+        assert getattr(reference, step)() == getattr(bitboard, step)()
+        assert bitboard.snapshot == reference.snapshot
+    assert bitboard.history == reference.history
@@ -1,5 +1,7 @@
 """Tests for the CLI entry point."""
 
+import io
+import json
 import os
 from importlib import import_module, reload
 
@@ -102,3 +104,91 @@ def test_cli_script_quiet_suppresses_output(capsys):
     cli_main.main(["--script", "0,3,4,6,8", "--quiet"])
     output = capsys.readouterr().out
     assert output.strip() == ""
+
+
+def test_cli_script_supports_larger_boards(capsys):
+    result = cli_main.main(["--size", "4", "--script", "0,4,1,5,2,6,3"])
+
+    output = capsys.readouterr().out
+    assert "Winner: X" in output
+    assert " X |  X |  X |  X" in output
+    assert result == 0
+
+
+def test_cli_script_move_range_follows_board_size():
+    with pytest.raises(SystemExit) as excinfo:
+        cli_main.main(["--size", "4", "--script", "16"])
+
+    assert "between 0 and 15" in str(excinfo.value)
+
+
+def test_cli_script_with_computer_opponent(capsys):
+    result = cli_main.main(["--ai", "o", "--script", "0"])
+
+    output = capsys.readouterr().out
+    assert "Computer (O) plays 4." in output
+    assert "Next player: X" in output
+    assert result == 0
+
+
+def test_cli_interactive_undo_rewinds_computer_reply(monkeypatch, capsys):
+    answers = iter(["0", "u", "u", "q"])
+    monkeypatch.setattr("builtins.input", lambda _prompt: next(answers))
+
+    assert cli_main.main(["--ai", "O"]) == 0
+
+    output = capsys.readouterr().out
+    assert output.count("Computer (O) plays 4.") == 1
+    assert "Nothing to undo." in output
+
+
+def test_cli_frontend_receives_forwarded_arguments(monkeypatch):
+    console_module = import_module("tictactoe.ui.cli.main")
+    received = {}
+
+    def fake_main(argv=None):
+        received["argv"] = argv
+        return 0
+
+    monkeypatch.setattr(console_module, "main", fake_main)
+    cli_module = _reload_cli_module()
+
+    cli_module.main(["--ui", "cli", "--script", "0,4"])
+    assert received["argv"] == ["--script", "0,4"]
+
+    cli_module.main(["cli", "--quiet"])
+    assert received["argv"] == ["--quiet"]
+
+    with pytest.raises(SystemExit):
+        cli_module.main(["--ui", "gui", "--script", "0"])
+
+
+def test_cli_batch_streams_csv_results_and_reports_errors(tmp_path, capsys):
+    games = tmp_path / "games.txt"
+    games.write_text("0,3,1,4,2\n\n# comment\n0,0\n4,0\nnine\n", encoding="utf-8")
+
+    result = cli_main.main(["--batch", str(games)])
+
+    captured = capsys.readouterr()
+    assert captured.out.splitlines() == [
+        "line,result,moves,error",
+        "1,X,5,",
+        "4,error,,Move 0 is invalid for the current board state.",
+        "5,unfinished,2,",
+        "6,error,,Move 'nine' is not a number.",
+    ]
+    assert "Replayed 4 games (2 with errors)." in captured.err
+    assert result == 1
+
+
+def test_cli_batch_reads_stdin_as_jsonl(monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.StringIO("0,4,8,2,6,3,5,7,1\n"))
+
+    result = cli_main.main(["--batch", "-", "--format", "jsonl", "--quiet"])
+
+    captured = capsys.readouterr()
+    assert [json.loads(line) for line in captured.out.splitlines()] == [
+        {"line": 1, "result": "draw", "moves": 9}
+    ]
+    assert captured.err == ""
+    assert result == 0
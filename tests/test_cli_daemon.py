@@ -0,0 +1,129 @@
+"""Tests for the resident serve-cli daemon and its thin client."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from tictactoe.ui.cli import client as cli_client
+from tictactoe.ui.cli import main as cli_main
+from tictactoe.ui.cli.client import CliClient, unix_sockets_supported
+from tictactoe.ui.cli.daemon import CliDaemon, ScriptRunner
+
+
+class _GatedRunner(ScriptRunner):
+    """Runner whose ``--script 8`` jobs print, then wait for ``gate``."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.gate = threading.Event()
+
+    def _run(self, argv, response):
+        if argv == ["--script", "8"]:
+            print("slow job output")
+            assert self.gate.wait(5)
+        super()._run(argv, response)
+
+
+@pytest.fixture
+def runner():
+    return _GatedRunner()
+
+
+@pytest.fixture
+def daemon_address(tmp_path, runner):
+    """Run a CliDaemon on its own event loop thread; yield its address."""
+
+    if unix_sockets_supported():
+        address = (str(tmp_path / "cli.sock"), None)
+    else:  # pragma: no cover - Windows falls back to TCP
+        address = (None, 0)
+    daemon = CliDaemon(runner)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(daemon.start(address))
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert started.wait(5)
+    yield daemon.address
+    asyncio.run_coroutine_threadsafe(daemon.close(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+def test_script_jobs_match_the_cli_and_reuse_engines(capsys):
+    runner = ScriptRunner()
+    argv = ["--script", "0", "--ai", "O"]
+    cli_main.main(argv)
+    expected = capsys.readouterr().out
+
+    for _ in range(3):
+        response = runner.run(argv)
+        assert response["status"] == 0
+        assert response["stdout"] == expected
+    assert response["state"] == "Next player: X"
+    assert (response["result"], response["moves"]) == ("unfinished", 2)
+    assert (runner.pool.created, runner.pool.reused) == (1, 2)
+
+    quiet = runner.run(["--script", "0,4,8", "--quiet"])
+    assert quiet["stdout"] == "" and quiet["state"] == "Next player: O"
+
+
+def test_failed_jobs_report_like_the_cli():
+    runner = ScriptRunner()
+    invalid = runner.run(["--script", "0,0"])
+    assert invalid["status"] == 1
+    assert invalid["stderr"] == "Move 0 is invalid for the current board state.\n"
+    assert (invalid["result"], invalid["moves"]) == ("unfinished", 1)
+
+    assert runner.run(["--win-length", "5", "--script", "0"])["status"] == 1
+    interactive = runner.run([])
+    assert interactive["status"] == 2
+    assert "serve-cli runs --script jobs" in interactive["stderr"]
+    # A failed job still returns its engine, reset, to the pool.
+    assert runner.run(["--script", "4"])["stdout"].endswith("Next player: O\n")
+
+
+def test_client_streams_batches_with_cli_output(daemon_address, tmp_path, capsys):
+    games = tmp_path / "games.txt"
+    games.write_text("0,4,8\n# comment\n\n0,3,1,4,2\n0,0\n-1,2\n")
+
+    assert cli_main.main(["--batch", str(games), "--quiet"]) == 1
+    expected = capsys.readouterr().out
+
+    path, port = daemon_address
+    argv = ["--batch", str(games), "--quiet"]
+    argv += ["--socket", path] if path is not None else ["--port", str(port)]
+    assert cli_client.main(argv) == 1
+    assert capsys.readouterr().out == expected
+
+    with CliClient(daemon_address) as client:
+        response = client.run(["--script", "0,4,8"])
+        assert response["stdout"].endswith("Next player: O\n")
+        results = list(client.run_batch(["0,1", "2"] * 100, window=8))
+    assert [number for number, _ in results] == list(range(1, 201))
+    assert all(response["status"] == 0 for _, response in results)
+
+
+def test_slow_jobs_do_not_hold_up_other_clients(daemon_address, runner):
+    with CliClient(daemon_address, timeout=5) as slow:
+        slow.send(["--script", "8"])
+        with CliClient(daemon_address, timeout=5) as fast:
+            response = fast.run(["--script", "0,4"])
+        runner.gate.set()
+        assert "slow job output" not in response["stdout"]
+        assert slow.receive()["stdout"].startswith("slow job output\n")
+
+
+def test_client_reports_a_missing_daemon(tmp_path):
+    with pytest.raises(SystemExit, match="No serve-cli daemon"):
+        cli_client.main(["--socket", str(tmp_path / "absent.sock"), "--script", "0"])
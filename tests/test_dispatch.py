@@ -0,0 +1,115 @@
+"""Tests for off-thread, coalescing listener dispatch."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+
+import pytest
+
+from tictactoe.domain import (
+    AsyncioDispatcher,
+    BitboardTicTacToe,
+    GameState,
+    ThreadedDispatcher,
+    TicTacToe,
+)
+from tictactoe.domain.dispatch import CoalescingDispatcher
+
+
+def test_threaded_dispatch_coalesces_for_slow_listeners():
+    dispatcher = ThreadedDispatcher()
+    game = TicTacToe(dispatcher=dispatcher)
+    release = threading.Event()
+    seen = []
+
+    def slow(snapshot):
+        release.wait(5)
+        seen.append(snapshot)
+
+    game.add_listener(slow)
+    game.make_move(0)  # picked up by the worker, which then blocks
+    for move in (3, 1, 4, 2):
+        assert game.make_move(move)
+    release.set()
+    assert dispatcher.flush(5)
+    dispatcher.close()
+
+    assert seen[-1] == game.snapshot
+    assert seen[-1].state == GameState.X_WON
+    assert len(seen) < 5
+    stats = dispatcher.stats
+    assert stats.delivered == len(seen)
+    assert stats.coalesced == 5 - len(seen)
+    assert stats.max_latency >= stats.mean_latency > 0
+
+
+def test_failing_listener_is_isolated(caplog):
+    dispatcher = ThreadedDispatcher()
+    game = BitboardTicTacToe(dispatcher=dispatcher)
+    seen = []
+
+    def broken(snapshot):
+        raise RuntimeError("boom")
+
+    game.add_listener(broken)
+    game.add_listener(seen.append)
+    with caplog.at_level(logging.ERROR, logger="tictactoe.domain.dispatch"):
+        assert game.make_move(4)
+        assert dispatcher.flush(5)
+    dispatcher.close()
+
+    assert seen == [game.snapshot]
+    assert dispatcher.stats.errors == 1
+    assert "boom" in caplog.text
+    # Once closed, the dispatcher delivers inline.
+    assert game.make_move(0)
+    assert seen[-1] == game.snapshot
+
+
+def test_asyncio_dispatch_delivers_latest_snapshot_on_the_loop():
+    async def main():
+        game = TicTacToe(dispatcher=AsyncioDispatcher())
+        seen = []
+        game.add_listener(seen.append)
+        for move in (0, 4, 8):
+            game.make_move(move)
+        assert seen == [] and game._dispatcher.depth == 1
+        await asyncio.sleep(0)
+        assert seen == [game.snapshot]
+        assert game.copy()._dispatcher is None
+
+    asyncio.run(main())
+
+
+def test_games_sharing_a_dispatcher_keep_separate_slots():
+    dispatcher = ThreadedDispatcher()
+    first = TicTacToe(dispatcher=dispatcher)
+    second = BitboardTicTacToe(dispatcher=dispatcher)
+    release = threading.Event()
+    seen = []
+
+    def slow(snapshot):
+        release.wait(5)
+        seen.append(snapshot)
+
+    first.add_listener(slow)
+    second.add_listener(slow)
+    first.make_move(0)  # picked up by the worker, which then blocks
+    first.make_move(4)
+    second.make_move(8)
+    release.set()
+    assert dispatcher.flush(5)
+    dispatcher.close()
+
+    assert seen[-2:] == [first.snapshot, second.snapshot]
+    assert dispatcher.stats.coalesced == 0
+
+
+def test_dispatchers_must_schedule():
+    class Incomplete(CoalescingDispatcher):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -10,10 +10,13 @@ os.environ.setdefault("TICTACTOE_HEADLESS", "1")
 
 import pytest
 
+from tictactoe.ai import ComputerPlayer, NegamaxSearcher
 from tictactoe.config import WindowConfig
-from tictactoe.domain.logic import GameState, TicTacToe
+from tictactoe.domain.logic import GameState, Player, TicTacToe
+from tictactoe.ui.gui import headless
 from tictactoe.ui.gui.headless_view import HeadlessGameView
 from tictactoe.ui.gui.main import TicTacToeGUI
+from tictactoe.ui.gui.view import GameView
 
 NEEDS_DISPLAY = platform.system() != "Windows" and not os.environ.get("DISPLAY")
 
@@ -169,3 +172,148 @@ def test_gui_accepts_custom_factories_and_window_config():
         assert app.window_config == custom_config
     finally:
         app.root.destroy()
+
+
+@pytest.mark.gui
+def test_gui_accepts_view_factories_with_the_original_signature():
+    def legacy_factory(*, ctk_module, root, on_cell_click, on_reset, view_config):
+        return HeadlessGameView(
+            ctk_module=ctk_module,
+            root=root,
+            on_cell_click=on_cell_click,
+            on_reset=on_reset,
+            view_config=view_config,
+        )
+
+    app = _create_app_or_skip(view_factory=legacy_factory)
+    try:
+        app._on_cell_click(4)
+        assert app.view.cell_text(4) == "X"
+    finally:
+        app.root.destroy()
+
+    with pytest.raises(TypeError):
+        _create_app_or_skip(
+            view_factory=legacy_factory, game_factory=lambda: TicTacToe(size=4)
+        )
+
+
+@pytest.mark.gui
+def test_gui_builds_board_from_engine_dimensions():
+    app = _create_app_or_skip(game_factory=lambda: TicTacToe(size=4))
+    try:
+        assert app.view.cell_count() == 16
+        for move in (0, 4, 1, 5, 2, 6, 3):
+            app._on_cell_click(move)
+        assert app.view.cell_text(3) == "X"
+        assert "wins" in app.view.status_text()
+    finally:
+        app.root.destroy()
+
+
+@pytest.mark.gui
+def test_gui_computer_replies_to_human_move():
+    computer = ComputerPlayer(Player.O, NegamaxSearcher())
+    app = _create_app_or_skip(computer=computer)
+    try:
+        app._on_cell_click(0)
+        assert app.view.cell_text(4) == "O"
+        assert app.game.current_player == Player.X
+
+        app.game.reset()
+        app._on_cell_click(4)
+        app._on_cell_click(4)  # ignored: cell already taken
+        assert app.game.current_player == Player.X
+    finally:
+        app.root.destroy()
+
+
+@pytest.mark.gui
+def test_gui_undo_takes_back_full_turn_against_computer():
+    computer = ComputerPlayer(Player.O, NegamaxSearcher())
+    app = _create_app_or_skip(computer=computer)
+    try:
+        app._on_cell_click(0)
+        assert app.view.cell_text(4) == "O"
+
+        app._undo_move()
+        assert app.game.history == ()
+        assert app.view.cell_text(0) == ""
+        assert app.view.status_text() == "Player X's turn"
+
+        app._redo_move()
+        assert app.game.history == (0, 4)
+        assert app.view.cell_text(4) == "O"
+    finally:
+        app.root.destroy()
+
+
+class _IdleRoot(headless.CTk):
+    """Root whose idle callbacks wait until the test runs them."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.idle: list = []
+
+    def after_idle(self, callback) -> None:
+        self.idle.append(callback)
+
+    def run_idle(self) -> None:
+        callbacks, self.idle = self.idle, []
+        for callback in callbacks:
+            callback()
+
+
+def _counting_configure(widget, counts: list) -> None:
+    original = widget.configure
+
+    def configure(**kwargs):
+        counts.append(kwargs)
+        original(**kwargs)
+
+    widget.configure = configure
+
+
+def test_game_view_renders_only_changed_widgets_once_per_frame():
+    root = _IdleRoot()
+    view = GameView(
+        ctk_module=headless,
+        root=root,
+        on_cell_click=lambda _: None,
+        on_reset=lambda: None,
+    )
+    view.build()
+    game = TicTacToe()
+    view.render(game.snapshot)
+    root.run_idle()
+
+    calls: list = []
+    for widget in (*view.buttons, view.status_label):
+        _counting_configure(widget, calls)
+    for move in (0, 4, 8):
+        game.make_move(move)
+        view.render(game.snapshot)
+    assert len(root.idle) == 1 and calls == []  # one frame for the burst
+    root.run_idle()
+    assert len(calls) == 4  # three cells and the status label
+    assert view.cell_text(8) == "X"
+
+    calls.clear()
+    view.render(game.snapshot)
+    root.run_idle()
+    assert calls == []
+
+
+def test_headless_view_counts_only_changed_widgets():
+    view = HeadlessGameView(
+        ctk_module=None, root=None, on_cell_click=lambda _: None, on_reset=lambda: None
+    )
+    view.build()
+    game = TicTacToe()
+    view.render(game.snapshot)
+    assert view.widget_updates == 1  # status only; the board starts empty
+    game.make_move(4)
+    view.render(game.snapshot)
+    view.render(game.snapshot)
+    assert view.widget_updates == 3
+    assert view.cell_text(4) == "X"
@@ -1,6 +1,8 @@
 """Unit tests for tictactoe.domain.logic."""
 
-from tictactoe.domain.logic import GameState, Player, TicTacToe
+import pytest
+
+from tictactoe.domain.logic import GameState, Player, TicTacToe, line_index
 
 
 def test_initial_state():
@@ -68,3 +70,195 @@ def test_reset_restores_initial_state():
     assert game.state == GameState.PLAYING
     assert game.current_player == Player.X
     assert all(cell is None for cell in game.board)
+
+
+def test_win_on_final_move_is_not_a_draw():
+    game = TicTacToe()
+    for move in [0, 1, 2, 3, 4, 5, 7, 6, 8]:
+        assert game.make_move(move)
+    assert game.state == GameState.X_WON
+    assert game.get_winner() == Player.X
+
+
+def test_reset_clears_line_counters():
+    game = TicTacToe()
+    for move in [0, 3, 1, 4]:
+        game.make_move(move)
+    game.reset()
+    for move in [2, 0, 5, 1, 8]:
+        assert game.make_move(move)
+    assert game.state == GameState.X_WON
+
+
+def test_line_index_is_shared_between_games():
+    first = TicTacToe(size=15, win_length=5)
+    second = TicTacToe(size=15, win_length=5)
+    assert first._lines is second._lines
+    assert line_index(15, 5) is first._lines
+    assert line_index(3) is line_index(3, 3)
+
+
+def test_line_index_counts_every_window():
+    index = line_index(15, 5)
+    # 11 horizontal + 11 vertical windows per row/column, 11x11 per diagonal.
+    assert len(index.lines) == 2 * 15 * 11 + 2 * 11 * 11
+    assert max(len(lines) for lines in index.cell_lines) == 4 * 5
+
+
+def test_invalid_board_configuration_is_rejected():
+    with pytest.raises(ValueError):
+        TicTacToe(size=0)
+    with pytest.raises(ValueError):
+        TicTacToe(size=3, win_length=4)
+
+
+def test_four_by_four_requires_full_row():
+    game = TicTacToe(size=4)
+    assert game.cell_count == 16
+    for move in [0, 4, 1, 5, 2, 6]:
+        assert game.make_move(move)
+    assert game.state == GameState.PLAYING
+    assert game.make_move(3)
+    assert game.state == GameState.X_WON
+    assert game.snapshot.size == 4
+
+
+def test_gomoku_diagonal_five_in_a_row():
+    game = TicTacToe(size=15, win_length=5)
+    x_moves = [16 * step + 20 for step in range(5)]
+    o_moves = [200, 201, 202, 203]
+    for x_move, o_move in zip(x_moves, o_moves):
+        assert game.make_move(x_move)
+        assert game.make_move(o_move)
+    assert game.state == GameState.PLAYING
+    assert game.make_move(x_moves[-1])
+    assert game.state == GameState.X_WON
+    assert not game.make_move(0)
+
+
+def test_copy_is_independent_and_drops_listeners():
+    game = TicTacToe(size=4)
+    calls = []
+    game.add_listener(calls.append)
+    game.make_move(5)
+
+    clone = game.copy()
+    assert clone.snapshot == game.snapshot
+    assert clone.make_move(6)
+    assert game.board[6] is None
+    assert len(calls) == 1
+
+
+def test_undo_restores_previous_position():
+    game = TicTacToe()
+    for move in (0, 3, 1, 4):
+        game.make_move(move)
+    before = game.snapshot
+    assert game.make_move(2)
+    assert game.state == GameState.X_WON
+
+    assert game.undo_move()
+    assert game.snapshot == before
+    assert game.history == (0, 3, 1, 4)
+    # The line counters were rolled back too, so O can still win instead.
+    assert game.make_move(8)
+    assert game.make_move(5)
+    assert game.state == GameState.O_WON
+
+
+def test_undo_and_redo_walk_the_history():
+    game = TicTacToe()
+    assert game.undo_move() is False
+    assert game.redo_move() is False
+    for move in (4, 0, 8):
+        game.make_move(move)
+
+    assert game.undo_move() and game.undo_move()
+    assert game.history == (4,)
+    assert game.current_player == Player.O
+    assert game.can_redo
+
+    assert game.redo_move()
+    assert game.history == (4, 0)
+    assert game.make_move(2)
+    assert not game.can_redo  # a new move discards the redo stack
+
+    game.reset()
+    assert not game.can_undo and game.history == ()
+
+
+def test_suppressed_notifications_can_notify_once_on_exit():
+    game = TicTacToe()
+    calls = []
+    game.add_listener(calls.append)
+
+    with game.suppress_notifications():
+        game.make_move(4)
+        game.undo_move()
+    assert calls == []
+
+    with game.suppress_notifications(notify_on_exit=True):
+        game.make_move(0)
+        game.make_move(1)
+    assert len(calls) == 1
+    assert calls[0].board[1] == Player.O
+
+
+def test_compact_round_trip_keeps_position_and_history():
+    game = TicTacToe()
+    for move in (4, 0, 8, 2):
+        game.make_move(move)
+    game.add_listener(lambda snapshot: None)
+
+    compact = game.to_compact()
+    assert compact.board == 3**4 * 1 + 3**0 * 2 + 3**8 * 1 + 3**2 * 2
+    restored = TicTacToe.from_compact(compact)
+    assert restored.snapshot == game.snapshot
+    assert restored.history == game.history
+    assert restored._listeners == []
+    # Line counters are rebuilt too, so O completes the top row.
+    assert restored.make_move(6) and restored.make_move(1)
+    assert restored.state == GameState.O_WON
+    assert restored.undo_move() and restored.history == (4, 0, 8, 2, 6)
+
+
+def test_compact_round_trip_on_large_boards():
+    game = TicTacToe(size=17, win_length=5)
+    for move in (288, 0, 287, 1):
+        game.make_move(move)
+    restored = TicTacToe.from_compact(game.to_compact())
+    assert restored.history == (288, 0, 287, 1)
+    assert restored.board == game.board
+
+
+def test_from_compact_rejects_inconsistent_history():
+    compact = TicTacToe().to_compact()._replace(history=b"\x04")
+    with pytest.raises(ValueError):
+        TicTacToe.from_compact(compact)
+
+
+def test_board_and_snapshot_are_cached_per_version():
+    game = TicTacToe()
+    first = game.snapshot
+    assert game.snapshot is first and game.board is first.board
+    version = game.version
+
+    game.make_move(4)
+    assert game.version > version
+    assert game.snapshot is not first and game.board[4] == Player.X
+    assert game.snapshot is game.snapshot
+    assert game.copy().snapshot is game.snapshot
+
+    game.undo_move()
+    assert game.snapshot == first and game.snapshot is not first
+    # A direct attribute change is not missed.
+    game.state = GameState.DRAW
+    assert game.snapshot.state == GameState.DRAW
+
+
+def test_allocation_benchmark_shows_cached_reads_are_cheaper():
+    from tictactoe.domain.bench import UncachedTicTacToe, measure
+
+    cached, _ = measure(TicTacToe, 500, seed=1)
+    uncached, _ = measure(UncachedTicTacToe, 500, seed=1)
+    assert cached < uncached
@@ -0,0 +1,79 @@
+"""Tests for the matchmaking queue."""
+
+from __future__ import annotations
+
+import pytest
+
+from tictactoe.server.matchmaking import Matchmaker, QueueFullError, WaitHistogram
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_same_bucket_pairs_immediately_oldest_first():
+    clock = FakeClock()
+    matchmaker = Matchmaker(clock=clock)
+    first, pair = matchmaker.enqueue("a", rating=1500)
+    assert pair is None and len(matchmaker) == 1
+    matchmaker.enqueue("b", rating=1610)
+    clock.now = 0.25
+    ticket, pair = matchmaker.enqueue("c", rating=1450)
+    assert pair == (first, ticket)
+    assert len(matchmaker) == 1  # "b" is still waiting
+    stats = matchmaker.stats()
+    assert stats["matches"] == 1
+    assert stats["wait_ms"]["<=500"] == 1 and stats["wait_ms"]["<=1"] == 1
+
+
+def test_boards_and_distant_ratings_do_not_mix_until_widened():
+    clock = FakeClock()
+    matchmaker = Matchmaker(bucket_width=100, widen_after=1.0, clock=clock)
+    matchmaker.enqueue("3x3", rating=1000)
+    assert matchmaker.enqueue("4x4", size=4, rating=1000)[1] is None
+    assert matchmaker.enqueue("strong", rating=1250)[1] is None
+    assert matchmaker.sweep() == []
+
+    clock.now = 1.5  # one bucket of reach: 1000 and 1250 are two apart
+    assert matchmaker.sweep() == []
+    clock.now = 2.5
+    ((older, newer),) = matchmaker.sweep()
+    assert (older.client, newer.client) == ("3x3", "strong")
+    assert len(matchmaker) == 1
+
+
+def test_cancelled_tickets_are_skipped():
+    matchmaker = Matchmaker()
+    ticket, _ = matchmaker.enqueue("a")
+    assert matchmaker.cancel(ticket)
+    assert not matchmaker.cancel(ticket)
+    assert len(matchmaker) == 0
+    assert matchmaker.enqueue("b")[1] is None
+
+
+def test_queue_capacity_is_enforced_but_matches_still_happen():
+    matchmaker = Matchmaker(max_queue=1)
+    matchmaker.enqueue("a", rating=1000)
+    with pytest.raises(QueueFullError):
+        matchmaker.enqueue("b", rating=2000)
+    assert matchmaker.enqueue("c", rating=1000)[1] is not None
+
+
+def test_wait_histogram_buckets_by_upper_bound():
+    histogram = WaitHistogram((1, 10))
+    for seconds in (0.0005, 0.001, 0.005, 0.5):
+        histogram.record(seconds)
+    assert histogram.as_dict() == {"<=1": 2, "<=10": 1, ">10": 1}
+    assert histogram.total == 4 and histogram.max_ms == 500
+
+
+def test_pairs_many_clients_without_backlog():
+    matchmaker = Matchmaker()
+    for index in range(20_000):
+        matchmaker.enqueue(index, rating=1000 + index % 1000)
+    assert matchmaker.matches == 10_000 - len(matchmaker) // 2
+    assert len(matchmaker) <= 5  # at most one leftover per rating bucket
@@ -0,0 +1,75 @@
+"""Tests for the Monte Carlo Tree Search player."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from tictactoe.ai.mcts import MCTSSearcher
+from tictactoe.domain.logic import GameState, TicTacToe
+
+
+def _game(moves, **kwargs) -> TicTacToe:
+    game = TicTacToe(**kwargs)
+    for move in moves:
+        assert game.make_move(move)
+    return game
+
+
+def test_seeded_search_is_deterministic():
+    game = _game([0, 4])
+    first = MCTSSearcher(iterations=300, seed=7).search(game)
+    second = MCTSSearcher(iterations=300, seed=7).search(game)
+    assert first.move == second.move
+    assert first.visits == second.visits
+
+
+def test_finds_immediate_win():
+    result = MCTSSearcher(iterations=2_000, seed=1).search(_game([0, 3, 1, 4]))
+    assert result.move == 2
+    assert result.win_rate > 0.9
+
+
+def test_iteration_budget_is_respected():
+    result = MCTSSearcher(iterations=250, seed=3).search(TicTacToe())
+    assert result.iterations == 250
+    assert sum(result.visits.values()) == 250
+    assert result.iterations_per_second > 0
+
+
+def test_time_budget_on_large_board():
+    game = _game([112], size=15, win_length=5)
+    result = MCTSSearcher(time_budget=0.05, seed=5).search(game)
+    assert result.iterations > 0
+    assert game.board[result.move] is None
+
+
+def test_search_leaves_game_untouched():
+    game = _game([4])
+    before = game.snapshot
+    MCTSSearcher(iterations=100, seed=2).search(game)
+    assert game.snapshot == before
+
+
+def test_root_parallel_search_merges_workers():
+    game = _game([0, 4])
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        searcher = MCTSSearcher(iterations=200, seed=11, workers=2, executor=executor)
+        result = searcher.search(game)
+    assert result.workers == 2
+    assert result.iterations == 400
+    assert game.board[result.move] is None
+
+
+def test_rejects_finished_game():
+    with pytest.raises(ValueError):
+        MCTSSearcher(iterations=10).search(_game([0, 3, 1, 4, 2]))
+
+
+def test_mcts_self_play_completes():
+    game = TicTacToe()
+    searcher = MCTSSearcher(iterations=400, seed=9)
+    while game.state == GameState.PLAYING:
+        assert game.make_move(searcher.choose_move(game))
+    assert game.state != GameState.PLAYING
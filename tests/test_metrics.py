@@ -0,0 +1,206 @@
+"""Tests for the opt-in instrumentation layer."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import urllib.request
+
+os.environ.setdefault("TICTACTOE_HEADLESS", "1")
+
+import pytest
+
+from tictactoe import metrics
+from tictactoe.domain.bitboard import BitboardTicTacToe
+from tictactoe.domain.logic import TicTacToe
+from tictactoe.ui.gui.headless_view import HeadlessGameView
+from tictactoe.ui.gui.main import TicTacToeGUI
+from tictactoe.ui.gui.view import GameView
+
+
+@pytest.fixture
+def registry():
+    active = metrics.enable(metrics.Registry())
+    yield active
+    metrics.disable()
+
+
+def _value(registry, name, **labels):
+    return (
+        registry.histogram(name, **labels)
+        if name.endswith("seconds")
+        else (registry.counter(name, **labels))
+    )
+
+
+def test_disabled_metrics_leave_the_engine_untouched():
+    def patched():
+        return (TicTacToe.make_move, TicTacToe._notify_listeners, GameView.flush)
+
+    originals = patched()
+    metrics.enable()
+    assert TicTacToe.make_move is not originals[0]
+    metrics.disable()
+    assert patched() == originals
+    assert not metrics.enabled()
+    with pytest.raises(RuntimeError):
+        metrics.registry()
+
+
+def test_moves_checks_and_listeners_are_recorded(registry):
+    game = TicTacToe()
+    seen = []
+
+    def slow_listener(snapshot):
+        seen.append(snapshot)
+
+    game.add_listener(seen.append)
+    game.add_listener(slow_listener)
+    for move in (0, 4, 4, 8):
+        game.make_move(move)
+    with game.suppress_notifications():
+        game.make_move(1)
+
+    engine = {"engine": "TicTacToe"}
+    assert _value(registry, "tictactoe_make_move_seconds", **engine).count == 5
+    moves = "tictactoe_moves_total"
+    assert _value(registry, moves, result="accepted", **engine).value == 4
+    assert _value(registry, moves, result="rejected", **engine).value == 1
+    checks = _value(registry, "tictactoe_check_game_state_seconds", **engine)
+    assert checks.count == 4
+    # Muted notifications are timed too.
+    assert _value(registry, "tictactoe_notify_seconds", **engine).count >= 3
+    assert _value(registry, "tictactoe_listener_calls_total").value == 6
+    test_name = test_moves_checks_and_listeners_are_recorded.__name__
+    name = f"{__name__}.{test_name}.<locals>.slow_listener"
+    assert _value(registry, "tictactoe_listener_seconds", listener=name).count == 3
+    assert len(seen) == 6
+
+
+def test_bitboard_games_are_recorded_under_their_engine(registry):
+    game = BitboardTicTacToe()
+    seen = []
+    game.add_listener(seen.append)
+    for move in (0, 4, 4):
+        game.make_move(move)
+
+    engine = {"engine": "BitboardTicTacToe"}
+    assert _value(registry, "tictactoe_make_move_seconds", **engine).count == 3
+    moves = "tictactoe_moves_total"
+    assert _value(registry, moves, result="rejected", **engine).value == 1
+    # The constructor's reset() notifies too, before any listener is added.
+    assert _value(registry, "tictactoe_notify_seconds", **engine).count >= 2
+    assert _value(registry, "tictactoe_listener_calls_total").value == len(seen) == 2
+    untouched = _value(registry, "tictactoe_make_move_seconds", engine="TicTacToe")
+    assert untouched.count == 0
+
+
+def test_histograms_and_counters_can_be_updated_from_many_threads():
+    histogram, counter = metrics.Histogram(), metrics.Counter()
+
+    def work():
+        for _ in range(2_000):
+            histogram.record(1e-3)
+            counter.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counts, count, total, largest = histogram.totals()
+    assert count == sum(counts) == counter.value == 16_000
+    assert total == pytest.approx(16.0) and largest == 1e-3
+
+
+class _Session:
+    def __init__(self):
+        self.seen = 0
+
+    def on_change(self, snapshot):
+        self.seen += 1
+
+
+def test_listener_timings_are_shared_by_name_and_removable(registry):
+    sessions = [_Session() for _ in range(3)]
+    games = [TicTacToe() for _ in sessions]
+    for game, session in zip(games, sessions):
+        game.add_listener(session.on_change)
+        game.make_move(4)
+        game.remove_listener(session.on_change)
+        game.make_move(0)
+
+    assert [session.seen for session in sessions] == [1, 1, 1]
+    assert all(not game._listeners for game in games)
+    name = f"{__name__}._Session.on_change"
+    assert _value(registry, "tictactoe_listener_seconds", listener=name).count == 3
+    listener_metrics = [
+        labels
+        for metric, labels, _ in registry.items()
+        if metric == "tictactoe_listener_seconds"
+    ]
+    assert listener_metrics == [(("listener", name),)]
+
+
+def test_gui_startup_phases_and_renders_are_recorded(registry):
+    app = TicTacToeGUI(view_factory=HeadlessGameView)
+    app.game.make_move(4)
+
+    phases = {
+        dict(labels)["phase"]
+        for name, labels, _ in registry.items()
+        if name == "tictactoe_startup_phase_seconds"
+    }
+    assert {"create_root", "build_view", "first_render"} <= phases
+    renders = _value(registry, "tictactoe_render_seconds", view="HeadlessGameView")
+    assert renders.count == 2
+
+
+def test_exports_are_valid_prometheus_and_json(registry, tmp_path):
+    histogram = registry.histogram("demo_seconds", "Demo latency.", kind='a"b')
+    for value in (5e-7, 3e-6, 2.0):
+        histogram.record(value)
+    registry.counter("demo_total").inc(3)
+
+    text = registry.to_prometheus()
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{kind="a\\"b",le="1e-06"} 1' in text
+    assert 'demo_seconds_bucket{kind="a\\"b",le="1"} 2' in text
+    assert 'demo_seconds_bucket{kind="a\\"b",le="+Inf"} 3' in text
+    assert "demo_total 3" in text
+
+    metrics.write(tmp_path / "metrics.json")
+    document = json.loads((tmp_path / "metrics.json").read_text())
+    assert document["metrics"]["demo_total"] == [{"labels": {}, "value": 3}]
+    assert document["metrics"]["demo_seconds"][0]["value"]["max"] == 2.0
+    metrics.write(tmp_path / "metrics.prom")
+    assert (tmp_path / "metrics.prom").read_text() == registry.to_prometheus()
+
+
+def test_configure_from_env_writes_at_exit_or_serves(monkeypatch, tmp_path):
+    exits = []
+    monkeypatch.setattr(metrics.atexit, "register", lambda *call: exits.append(call))
+    assert metrics.configure_from_env("") is None
+    try:
+        active = metrics.configure_from_env(str(tmp_path / "out.prom"))
+        TicTacToe().make_move(0)
+        function, *args = exits[0]
+        function(*args)
+        assert "tictactoe_moves_total" in (tmp_path / "out.prom").read_text()
+    finally:
+        metrics.disable()
+
+    with pytest.raises(ValueError):
+        metrics.configure_from_env("localhost:http")
+    server = metrics.serve(0, target=active)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(f"{url}/metrics", timeout=5) as response:
+            body = response.read()
+            assert b'tictactoe_make_move_seconds_count{engine="TicTacToe"} 1' in body
+        with urllib.request.urlopen(f"{url}/metrics.json", timeout=5) as response:
+            assert "tictactoe_moves_total" in json.load(response)["metrics"]
+    finally:
+        server.shutdown()
+        server.server_close()
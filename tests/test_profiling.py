@@ -0,0 +1,148 @@
+"""Tests for the frontend profiling mode."""
+
+from __future__ import annotations
+
+import io
+import os
+import pstats
+import signal
+import tracemalloc
+from importlib import import_module, reload
+
+os.environ.setdefault("TICTACTOE_HEADLESS", "1")
+
+import pytest
+
+from tictactoe import profiling
+from tictactoe.domain.logic import TicTacToe
+from tictactoe.ui.gui.headless_view import HeadlessGameView
+from tictactoe.ui.gui.main import TicTacToeGUI
+
+
+def _play_gui_game():
+    app = TicTacToeGUI(view_factory=HeadlessGameView)
+    for position in (0, 4, 8, 2, 6, 3, 7):
+        app._on_cell_click(position)
+    return app.game.snapshot.winner
+
+
+def test_cpu_profile_writes_pstats_and_samples_handlers(tmp_path):
+    output = tmp_path / "gui.pstats"
+    stream = io.StringIO()
+    originals = (
+        TicTacToeGUI._on_cell_click,
+        TicTacToeGUI._on_game_updated,
+        HeadlessGameView.render,
+    )
+
+    profiler = profiling.Profiler("cpu", output, stream=stream)
+    winner = profiler.run(_play_gui_game)
+
+    assert winner is not None
+    functions = {name for _, _, name in pstats.Stats(str(output)).stats}
+    assert "make_move" in functions
+    report = stream.getvalue()
+    assert "TicTacToeGUI._on_cell_click calls=7" in report
+    assert "TicTacToeGUI._on_game_updated calls=8" in report
+    # The view draws each frame, so its time is reported too.
+    assert "HeadlessGameView.render     calls=8" in report
+    assert f"Wrote CPU profile to {output}" in report
+    assert (
+        TicTacToeGUI._on_cell_click,
+        TicTacToeGUI._on_game_updated,
+        HeadlessGameView.render,
+    ) == originals
+
+
+def test_alloc_report_shows_growth_and_handler_memory(tmp_path):
+    output = tmp_path / "alloc.txt"
+    kept = []
+
+    def leak():
+        for _ in range(200):
+            kept.append(bytearray(1024))
+        _play_gui_game()
+
+    profiling.Profiler("alloc", output, stream=io.StringIO()).run(leak)
+
+    report = output.read_text()
+    assert "Largest live allocations:" in report
+    growth = report.split("Growth since start:")[1]
+    assert "test_profiling.py" in growth.splitlines()[1]
+    assert "memory=" in report
+    assert not tracemalloc.is_tracing()
+
+
+def test_report_is_written_when_the_frontend_fails(tmp_path):
+    output = tmp_path / "failed.pstats"
+
+    def fail():
+        TicTacToe().make_move(0)
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        profiling.Profiler("cpu", output, stream=io.StringIO()).run(fail)
+    assert output.exists()
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="needs SIGUSR1")
+def test_sigusr1_writes_a_report_mid_run(tmp_path):
+    output = tmp_path / "live.txt"
+    sizes = []
+
+    def session():
+        signal.raise_signal(signal.SIGUSR1)
+        sizes.append(output.stat().st_size)
+        return 3
+
+    previous = signal.getsignal(signal.SIGUSR1)
+    assert profiling.Profiler("alloc", output, stream=io.StringIO()).run(session) == 3
+    assert sizes and sizes[0] > 0
+    assert signal.getsignal(signal.SIGUSR1) == previous
+
+
+def test_slow_handler_calls_are_listed():
+    stats = profiling.HandlerStats("GameView.flush")
+    for seconds in (0.001, 0.05, 0.02, 0.002):
+        stats.record(seconds)
+
+    lines = stats.describe(memory=False)
+    assert "calls=4" in lines[0] and "slow=2" in lines[0]
+    assert lines[1] == "    slowest frames: #2 50.0 ms, #3 20.0 ms"
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        profiling.Profiler("wall")
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--profile", "cli", "--script", "0,4,8", "--quiet"],
+        ["--profile", "cpu", "cli", "--script", "0,4,8", "--quiet"],
+        ["--ui", "cli", "--profile=cpu", "--script", "0,4,8", "--quiet"],
+    ],
+)
+def test_entry_point_profiles_the_selected_frontend(argv, tmp_path, capsys):
+    output = tmp_path / "cli.pstats"
+    entry = reload(import_module("tictactoe.__main__"))
+
+    assert entry.main(["--profile-output", str(output), *argv]) == 0
+    assert "Wrote CPU profile" in capsys.readouterr().err
+    functions = {name for _, _, name in pstats.Stats(str(output)).stats}
+    assert "_run_script" in functions
+
+
+def test_sampler_wraps_the_view_method_that_draws_frames():
+    from tictactoe.ui.gui.view import GameView
+
+    original = GameView.flush
+    sampler = profiling.HandlerSampler()
+    sampler.install_loaded()
+    try:
+        assert GameView.flush is not original
+        assert GameView.flush.__wrapped__ is original
+    finally:
+        sampler.uninstall()
+    assert GameView.flush is original
@@ -0,0 +1,84 @@
+"""Tests for the SQLite-backed Elo rating store."""
+
+from __future__ import annotations
+
+import pytest
+
+from tictactoe.domain.logic import Player
+from tictactoe.ratings import (
+    INITIAL_RATING,
+    RatingStore,
+    expected_score,
+    import_tournament,
+    run_benchmark,
+)
+from tictactoe.tournament import TournamentConfig, run_tournament
+
+
+def test_expected_score_is_symmetric():
+    assert expected_score(1500, 1500) == 0.5
+    assert expected_score(1900, 1500) == pytest.approx(10 / 11)
+    assert expected_score(1500, 1900) + expected_score(1900, 1500) == 1
+
+
+def test_results_are_buffered_then_written_in_batches():
+    store = RatingStore(batch_size=3)
+    store.record("ann", "bob", Player.X)
+    store.record("bob", "ann", None)
+    assert store.pending == 2 and len(store) == 0
+    store.record("cy", "ann", Player.O)
+    assert store.pending == 0 and len(store) == 3
+    # Logged results do not change ratings until the next update.
+    assert store.rating("ann") == INITIAL_RATING
+    assert store.rating("nobody") is None
+
+
+def test_update_applies_one_rating_period():
+    store = RatingStore(k_factor=32)
+    store.record("ann", "bob", Player.X)
+    store.record("bob", "ann", Player.O)
+    store.record("ann", "cy", None)
+    assert store.update() == 3
+
+    # Expected scores come from the ratings at the start of the period.
+    assert store.rating("ann") == pytest.approx(1532)
+    assert store.rating("bob") == pytest.approx(1468)
+    assert store.rating("cy") == pytest.approx(1500)
+    assert store.update() == 0
+
+    store.record("bob", "ann", Player.X)
+    assert store.update() == 1
+    assert store.rating("bob") > 1468
+    assert [row.name for row in store.leaderboard()] == ["ann", "cy", "bob"]
+
+
+def test_periods_are_bounded_and_ratings_persist(tmp_path):
+    database = tmp_path / "ratings.db"
+    with RatingStore(database) as store:
+        for _ in range(5):
+            store.record("ann", "bob", Player.X)
+        assert store.update(period=2) == 5
+
+    with RatingStore(database) as store:
+        board = store.leaderboard(limit=1)
+        assert board[0].name == "ann" and board[0].games == 5
+        assert store.rank("bob") == 2 and store.rank("nobody") is None
+        assert store.leaderboard(limit=5, offset=1)[0].rank == 2
+        assert store.update() == 0
+
+
+def test_tournament_checkpoint_can_be_imported(tmp_path):
+    checkpoint = tmp_path / "run.jsonl"
+    config = TournamentConfig(players=("random", "greedy"), games=4, seed=3)
+    run_tournament(config, checkpoint=checkpoint)
+
+    store = RatingStore()
+    assert import_tournament(store, checkpoint) == config.total_games
+    store.update()
+    assert store.leaderboard()[0].name == "greedy"
+
+
+def test_benchmark_reports_leaderboard_latency():
+    report = run_benchmark(200, 500, seed=1)
+    assert "Rated 500 results for 200 players" in report
+    assert "Leaderboard page" in report
@@ -0,0 +1,109 @@
+"""Tests for the binary game-record format."""
+
+from __future__ import annotations
+
+import pytest
+
+from tictactoe.records import (
+    RecordFormatError,
+    RecordReader,
+    RecordWriter,
+    encode_record,
+    format_script,
+    main,
+    parse_script,
+)
+
+GAMES = [(0, 3, 1, 4, 2), (4, 0, 8, 2, 6, 3, 5, 7, 1), (8,), ()]
+
+
+def test_three_by_three_games_pack_into_nibbles():
+    assert encode_record((0, 3, 1, 4, 2), 9) == bytes((5, 0x30, 0x41, 0x02))
+    assert len(encode_record(GAMES[1], 9)) == 6
+
+
+def test_round_trip_with_random_access(tmp_path):
+    path = tmp_path / "games.ttr"
+    with RecordWriter(path) as writer:
+        writer.append(GAMES[0])
+        assert writer.extend(GAMES[1:]) == 3
+
+    with RecordReader(path) as reader:
+        assert list(reader) == GAMES
+        assert len(reader) == 4
+        assert reader[1] == GAMES[1]
+        assert reader[-2] == (8,)
+        with pytest.raises(IndexError):
+            reader[4]
+
+
+def test_closing_while_views_are_held(tmp_path):
+    path = tmp_path / "games.ttr"
+    with RecordWriter(path) as writer:
+        writer.extend(GAMES)
+
+    with RecordReader(path) as reader:
+        raw = reader.iter_raw()
+        kept = next(raw)
+    raw.close()
+    assert bytes(kept) == encode_record(GAMES[0], 9)
+
+    with RecordReader(path) as reader:
+        games = iter(reader)
+        # The abandoned iterator still holds a view of the mapping.
+        assert next(games) == GAMES[0]
+
+
+def test_appending_reuses_header_and_rejects_other_boards(tmp_path):
+    path = tmp_path / "games.ttr"
+    with RecordWriter(path) as writer:
+        writer.append((4,))
+    with RecordWriter(path) as writer:
+        writer.append((0, 1))
+    with RecordReader(path) as reader:
+        assert list(reader) == [(4,), (0, 1)]
+
+    with pytest.raises(RecordFormatError, match="different board"):
+        RecordWriter(path, size=4)
+
+
+def test_large_boards_use_a_byte_per_move(tmp_path):
+    path = tmp_path / "gomoku.ttr"
+    game = (112, 0, 224, 17)
+    with RecordWriter(path, size=15, win_length=5) as writer:
+        writer.append(game)
+    with RecordReader(path) as reader:
+        assert (reader.size, reader.win_length) == (15, 5)
+        assert list(reader) == [game]
+
+
+def test_invalid_files_and_moves_are_rejected(tmp_path):
+    bogus = tmp_path / "bogus.ttr"
+    bogus.write_bytes(b"not a record file")
+    with pytest.raises(RecordFormatError):
+        RecordReader(bogus)
+
+    truncated = tmp_path / "truncated.ttr"
+    with RecordWriter(truncated) as writer:
+        writer.append((0, 1, 2))
+    truncated.write_bytes(truncated.read_bytes()[:-1])
+    with RecordReader(truncated) as reader:
+        with pytest.raises(RecordFormatError, match="truncated"):
+            list(reader)
+
+    with pytest.raises(ValueError, match="between 0 and 8"):
+        encode_record((9,), 9)
+
+
+def test_script_conversion_round_trips(tmp_path, capsys):
+    assert parse_script(" 0, 4 ,8 ") == (0, 4, 8)
+    assert format_script((0, 4, 8)) == "0,4,8"
+    with pytest.raises(ValueError, match="not a number"):
+        parse_script("0,x")
+
+    scripts = tmp_path / "games.txt"
+    scripts.write_text("0,3,1,4,2\n\n8\n", encoding="utf-8")
+    archive = tmp_path / "games.ttr"
+    assert main(["pack", str(scripts), str(archive)]) == 0
+    assert main(["unpack", str(archive)]) == 0
+    assert capsys.readouterr().out == "0,3,1,4,2\n8\n"
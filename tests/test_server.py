@@ -0,0 +1,424 @@
+"""Tests for the asyncio game server and its protocol."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from tictactoe.domain.logic import Player, TicTacToe
+from tictactoe.ratings import RatingStore
+from tictactoe.server import GameServer, SessionLimitError, SessionStore
+from tictactoe.server.bench import run_benchmark
+from tictactoe.server.loadgen import run_load
+from tictactoe.server.protocol import ProtocolError, decode, snapshot_message
+from tictactoe.server.server import MAX_WRITE_BUFFER, Connection
+
+
+class Client:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def send(self, **message):
+        self.writer.write(json.dumps(message).encode() + b"\n")
+
+    async def receive(self):
+        line = await asyncio.wait_for(self.reader.readline(), timeout=5)
+        return json.loads(line)
+
+    async def request(self, **message):
+        await self.send(**message)
+        return await self.receive()
+
+    def close(self):
+        self.writer.close()
+
+
+def serve(scenario):
+    """Run ``scenario(server, connect)`` against a server on a free port."""
+
+    async def main():
+        server = GameServer()
+        await server.start(port=0)
+
+        async def connect():
+            return Client(*await asyncio.open_connection("127.0.0.1", server.port))
+
+        try:
+            return await scenario(server, connect)
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def test_decode_rejects_non_objects():
+    assert decode(b'{"op": "ping"}\n') == {"op": "ping"}
+    with pytest.raises(ProtocolError):
+        decode(b"[1, 2]")
+    with pytest.raises(ProtocolError):
+        decode(b"not json")
+
+
+def test_snapshot_message_describes_board():
+    game = TicTacToe()
+    game.make_move(4)
+    message = snapshot_message("abc", game.snapshot)
+    assert message == {
+        "type": "snapshot",
+        "session": "abc",
+        "board": "....X....",
+        "current": "O",
+        "state": "playing",
+        "winner": None,
+    }
+
+
+def test_playing_a_game_pushes_snapshots():
+    async def scenario(server, connect):
+        client = await connect()
+        session = await client.request(op="new")
+        assert session["type"] == "session"
+        assert (await client.receive())["board"] == "........."
+
+        for position in (0, 3, 1, 4):
+            await client.request(op="move", position=position)
+        final = await client.request(op="move", position=2)
+        assert final["state"] == "x_won" and final["winner"] == "X"
+
+        error = await client.request(op="move", position=5)
+        assert error["type"] == "error"
+        client.close()
+
+    serve(scenario)
+
+
+def test_joined_clients_share_one_game():
+    async def scenario(server, connect):
+        host, guest = await connect(), await connect()
+        session_id = (await host.request(op="new"))["session"]
+        await host.receive()
+        assert (await guest.request(op="join", session=session_id))["type"] == "session"
+        await guest.receive()
+
+        await host.send(op="move", position=4)
+        assert (await host.receive())["board"] == "....X...."
+        assert (await guest.receive())["board"] == "....X...."
+
+        await guest.request(op="leave")
+        await host.request(op="undo")
+        assert (await guest.request(op="ping"))["type"] == "pong"
+        host.close()
+        guest.close()
+
+    serve(scenario)
+
+
+def test_errors_keep_the_connection_open():
+    async def scenario(server, connect):
+        client = await connect()
+        assert (await client.request(op="move", position=0))["type"] == "error"
+        assert (await client.request(op="fly"))["type"] == "error"
+        assert (await client.request(op="join", session="nope"))["type"] == "error"
+        assert (await client.request(op="new", win_length=5))["type"] == "error"
+        for size in (300, 0, True):
+            for op in ("new", "queue"):
+                reply = await client.request(op=op, size=size, win_length=1)
+                assert reply["type"] == "error"
+        assert server.store.stats()["sessions"] == 0
+        client.writer.write(b"{oops\n")
+        assert (await client.receive())["type"] == "error"
+        assert (await client.request(op="ping"))["type"] == "pong"
+        client.close()
+
+    serve(scenario)
+
+
+def test_stats_count_connections_and_disconnects_detach():
+    async def scenario(server, connect):
+        clients = [await connect() for _ in range(3)]
+        await clients[0].request(op="new")
+        await clients[0].receive()
+        stats = await clients[1].request(op="stats")
+        assert stats["connections"] == 3 and stats["sessions"] == 1
+
+        (session,) = server.store.sessions()
+        clients[0].close()
+        for _ in range(100):
+            if not session.subscribers:
+                break
+            await asyncio.sleep(0.01)
+        assert session.subscribers == []
+        for client in clients[1:]:
+            client.close()
+
+    serve(scenario)
+
+
+def test_session_store_ids_are_unique():
+    store = SessionStore()
+    sessions = [store.create() for _ in range(50)]
+    assert len({session.id for session in sessions}) == 50
+    assert sessions[0].id in store
+    store.discard(sessions[0].id)
+    assert len(store) == 49
+    with pytest.raises(KeyError):
+        store.get(sessions[0].id)
+
+
+def test_load_generator_plays_games_alongside_idle_connections():
+    async def scenario(server, connect):
+        return await run_load(
+            "127.0.0.1", server.port, idle=50, games=20, concurrency=4, seed=1
+        )
+
+    report = serve(scenario)
+    assert report.games == 20
+    assert report.idle_connections == 50
+    assert report.server_stats["connections"] >= 51
+    assert "games/s" in report.format()
+
+
+class Sink:
+    def __init__(self):
+        self.pushed = []
+
+    def send(self, data):
+        self.pushed.append(data)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_session_store_parks_least_recently_used_and_rehydrates():
+    store = SessionStore(max_live=2, park_after=None)
+    first, second = store.create(), store.create()
+    first.game.make_move(4)
+    store.touch(first)
+    third = store.create()
+    assert second.parked and not first.parked and not third.parked
+
+    sink = Sink()
+    second.attach(sink)
+    with pytest.raises(RuntimeError):
+        _ = second.game
+    assert store.get(second.id).game.make_move(0)
+    assert b'"board":"X........"' in sink.pushed[-1]
+    assert first.parked  # least recently used once second came back
+    assert store.stats() == {
+        "sessions": 3,
+        "live": 2,
+        "parked": 1,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 2,
+        "dropped": 0,
+    }
+
+
+def test_session_store_parks_idle_sessions_after_ttl():
+    clock = FakeClock()
+    store = SessionStore(max_live=None, park_after=10, clock=clock)
+    idle, busy = store.create(), store.create()
+    busy.game.make_move(4)
+    clock.now = 8
+    store.touch(busy)
+    clock.now = 15
+    assert store.sweep() == 1
+    assert idle.parked and not busy.parked
+    assert store.touch(busy).game.history == (4,)
+    assert store.live_count == 1
+
+
+def test_session_store_drops_unattached_sessions_at_the_cap():
+    store = SessionStore(max_sessions=2)
+    kept, dropped = store.create(), store.create()
+    kept.attach(Sink())
+    store.create()
+    assert kept.id in store and dropped.id not in store
+    assert store.stats()["dropped"] == 1
+
+    store = SessionStore(max_sessions=1)
+    store.create().attach(Sink())
+    with pytest.raises(SessionLimitError):
+        store.create()
+
+
+def test_sessions_become_droppable_when_their_last_client_leaves():
+    store = SessionStore(max_sessions=3)
+    sink = Sink()
+    left, idle, watched = store.create(), store.create(), store.create()
+    left.attach(sink)
+    watched.attach(sink)
+    left.detach(sink)
+    store.create()  # drops the session unattached the longest
+    assert idle.id not in store
+    assert left.id in store and watched.id in store and len(store) == 3
+
+
+def test_server_reports_parked_sessions():
+    async def scenario(server, connect):
+        server.store.max_live = 1
+        client, other = await connect(), await connect()
+        await client.request(op="new")
+        await client.receive()
+        await client.request(op="move", position=4)
+        await other.request(op="new")
+        await other.receive()
+        stats = await other.request(op="stats")
+        assert stats["sessions"] == 2 and stats["parked"] == 1
+
+        reply = await client.request(op="move", position=0)
+        assert reply["board"] == "O...X...."
+        client.close()
+        other.close()
+
+    serve(scenario)
+
+
+def test_memory_benchmark_reports_parked_sessions_smaller():
+    report = run_benchmark(200, sample=50, seed=3)
+    assert 0 < report.parked_bytes < report.live_bytes
+    assert "per million" in report.format()
+
+
+def test_matchmaking_seats_two_clients_in_a_room():
+    async def scenario(server, connect):
+        first, second = await connect(), await connect()
+        assert (await first.request(op="queue"))["type"] == "queued"
+        matched = await second.request(op="queue")
+        assert matched["seat"] == "O"
+        assert (await first.receive())["seat"] == "X"
+        await first.receive()
+        await second.receive()
+
+        assert (await second.request(op="move", position=0))["type"] == "error"
+        assert (await first.request(op="undo"))["type"] == "error"
+        for player, position in ((first, 0), (second, 3), (first, 1), (second, 4)):
+            await player.send(op="move", position=position)
+            await first.receive()
+            await second.receive()
+        await first.send(op="move", position=2)
+        for client in (first, second):
+            assert (await client.receive())["winner"] == "X"
+            closed = await client.receive()
+            assert closed == {
+                "type": "closed",
+                "session": matched["session"],
+                "reason": "finished",
+            }
+        stats = await first.request(op="stats")
+        assert stats["rooms"] == 0 and stats["sessions"] == 0
+        assert stats["matches"] == 1 and stats["queued"] == 0
+        first.close()
+        second.close()
+
+    serve(scenario)
+
+
+def test_room_closes_when_a_player_disconnects():
+    async def scenario(server, connect):
+        first, second = await connect(), await connect()
+        await first.request(op="queue")
+        await second.request(op="queue")
+        await first.receive()
+        await second.receive()
+        first.close()
+        assert (await second.receive())["reason"] == "opponent_left"
+
+        # Unqueueing works, and a disconnected waiter leaves the queue.
+        assert (await second.request(op="queue"))["type"] == "queued"
+        assert (await second.request(op="unqueue"))["type"] == "unqueued"
+        assert (await second.request(op="unqueue"))["type"] == "error"
+        third = await connect()
+        await third.request(op="queue", rating=1400)
+        third.close()
+        for _ in range(100):
+            if not server.matchmaker.depth:
+                break
+            await asyncio.sleep(0.01)
+        assert server.matchmaker.depth == 0
+        second.close()
+
+    serve(scenario)
+
+
+def test_load_generator_plays_matched_games():
+    async def scenario(server, connect):
+        return await run_load(
+            "127.0.0.1", server.port, games=10, concurrency=3, seed=2, matched=True
+        )
+
+    report = serve(scenario)
+    assert report.games >= 10
+    assert report.server_stats["rooms"] == 0
+    assert "Matchmaking:" in report.format()
+
+
+def test_named_matched_games_are_rated():
+    async def main():
+        ratings = RatingStore()
+        ratings.record("ann", "bob", Player.X)
+        ratings.update()
+        server = GameServer(ratings=ratings, sweep_interval=0.01)
+        await server.start(port=0)
+        try:
+            clients = [
+                Client(*await asyncio.open_connection("127.0.0.1", server.port))
+                for _ in range(2)
+            ]
+            await clients[0].request(op="queue", name="bob")
+            await clients[1].request(op="queue", name="ann")
+            await clients[0].receive()
+            await clients[1].receive()
+            for index, position in enumerate((0, 3, 1, 4, 2)):
+                await clients[index % 2].send(op="move", position=position)
+                await clients[0].receive()
+                await clients[1].receive()
+            await asyncio.sleep(0.1)
+            for client in clients:
+                client.close()
+        finally:
+            await server.close()
+        # The server hands the store back once its rating thread has stopped.
+        assert ratings.leaderboard()[0].games == 2
+        assert ratings.rating("bob") > ratings.rating("ann")
+
+    asyncio.run(main())
+
+
+def test_clients_that_stop_reading_are_dropped():
+    class Transport:
+        def __init__(self):
+            self.buffered = 0
+            self.aborted = False
+
+        def get_write_buffer_size(self):
+            return self.buffered
+
+        def abort(self):
+            self.aborted = True
+
+    class Writer:
+        def __init__(self):
+            self.transport = Transport()
+
+        def is_closing(self):
+            return self.transport.aborted
+
+        def write(self, data):
+            self.transport.buffered += len(data)
+
+    writer = Writer()
+    connection = Connection(writer)
+    line = b"x" * 1000 + b"\n"
+    while not writer.is_closing():
+        connection.send(line)
+    assert writer.transport.buffered <= MAX_WRITE_BUFFER
@@ -0,0 +1,68 @@
+"""Tests for which modules each frontend loads at cold start.
+
+Only the deterministic import sets are checked here; the wall-clock budgets
+are enforced by ``benchmarks/bench_startup.py`` (see docs/TESTING.md).
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from tictactoe.startup import parse_importtime, profile_frontend
+
+_ON_DEMAND = ("tictactoe.ai", "tictactoe.records")
+_HEAVY = ("tkinter", "_tkinter", "customtkinter", "PIL", "darkdetect", "asyncio")
+
+REPORT = """\
+import time: self [us] | cumulative | imported package
+import time:        50 |         50 | site
+-- tictactoe.startup --
+import time:       100 |        100 |   typing
+import time:       300 |        400 | tictactoe.__main__
+import time:        20 |         20 | json
+"""
+
+
+def test_parse_importtime_sums_top_level_imports_after_the_marker():
+    profile = parse_importtime("list", REPORT)
+    assert profile.total_us == 420
+    assert "site" not in profile.modules
+    assert profile.slowest(1) == [("tictactoe.__main__", 300)]
+    assert profile.imported("tictactoe") == ["tictactoe.__main__"]
+    with pytest.raises(ValueError):
+        parse_importtime("list", "import time: 1 | 1 | site")
+
+
+def test_cli_client_imports_no_engine_code():
+    profile = profile_frontend("cli-client", repeat=1)
+    assert sorted(profile.imported("tictactoe")) == [
+        "tictactoe",
+        "tictactoe.__main__",
+        "tictactoe.ui",
+        "tictactoe.ui.cli",
+        "tictactoe.ui.cli.client",
+        "tictactoe.ui.cli.output",
+    ]
+
+
+def test_cli_loads_players_and_records_only_on_demand():
+    loaded = profile_frontend("cli", repeat=1).imported("tictactoe")
+    assert [name for name in loaded if name.startswith(_ON_DEMAND)] == []
+
+
+def test_list_frontends_imports_no_frontend_code():
+    profile = profile_frontend("list", repeat=1)
+    assert profile.imported("tictactoe") == ["tictactoe", "tictactoe.__main__"]
+
+
+@pytest.mark.parametrize(
+    ("frontend", "forbidden"),
+    [
+        ("cli", _HEAVY + ("concurrent", "multiprocessing", "sqlite3")),
+        ("headless", _HEAVY + ("concurrent", "multiprocessing", "sqlite3")),
+        ("analyze", _HEAVY),
+        ("tournament", ("tkinter", "_tkinter", "customtkinter", "asyncio")),
+    ],
+)
+def test_frontend_cold_start_skips_heavy_packages(frontend, forbidden):
+    assert profile_frontend(frontend, repeat=1).imported(*forbidden) == []
@@ -0,0 +1,116 @@
+"""Tests for D4 board canonicalization and the canonical-position cache."""
+
+from __future__ import annotations
+
+import pytest
+
+from tictactoe.ai import NegamaxSearcher
+from tictactoe.ai.symmetry import (
+    CanonicalCache,
+    apply_transform,
+    board_key,
+    canonicalize,
+    transforms,
+)
+from tictactoe.domain.logic import GameState, TicTacToe
+
+
+def _board(moves, size=3):
+    game = TicTacToe(size=size)
+    for move in moves:
+        assert game.make_move(move)
+    return game.board
+
+
+def _reachable_boards():
+    seen = set()
+    frontier = [()]
+    while frontier:
+        moves = frontier.pop()
+        game = TicTacToe()
+        for move in moves:
+            game.make_move(move)
+        if game.board in seen:
+            continue
+        seen.add(game.board)
+        if game.state == GameState.PLAYING:
+            for position in range(9):
+                if game.board[position] is None:
+                    frontier.append(moves + (position,))
+    return seen
+
+
+def test_transforms_are_distinct_permutations():
+    permutations = transforms(3)
+    assert len(set(permutations)) == 8
+    for permutation in permutations:
+        assert sorted(permutation) == list(range(9))
+    assert permutations[1][0] == 2  # rotating 90 degrees moves top-left to top-right
+
+
+@pytest.mark.parametrize("transform", range(8))
+def test_symmetric_boards_share_canonical_form(transform):
+    board = _board([0, 5, 4])
+    variant = apply_transform(board, transform)
+    assert canonicalize(variant).key == canonicalize(board).key
+
+
+def test_canonical_board_has_minimal_key():
+    board = _board([8, 1])
+    canonical = canonicalize(board)
+    assert canonical.key == board_key(canonical.board)
+    assert canonical.key == min(
+        board_key(apply_transform(board, transform)) for transform in range(8)
+    )
+    assert canonicalize(canonical.board).board == canonical.board
+
+
+def test_positions_round_trip_through_canonical_frame():
+    board = _board([8, 1, 3], size=4)
+    canonical = canonicalize(board)
+    for position in range(16):
+        mapped = canonical.to_canonical(position)
+        assert canonical.board[mapped] == board[position]
+        assert canonical.from_canonical(mapped) == position
+
+
+def test_reachable_positions_reduce_roughly_eightfold():
+    boards = _reachable_boards()
+    canonical = {canonicalize(board).key for board in boards}
+    assert len(boards) == 5478
+    assert len(canonical) == 765
+
+
+def test_cache_shares_entries_between_symmetries():
+    cache: CanonicalCache[str] = CanonicalCache(maxsize=2)
+    cache.put(_board([0]), "corner")
+    assert cache.get(_board([8])) == "corner"
+    assert _board([2]) in cache
+    assert cache.get(_board([4])) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_evicts_least_recently_used():
+    cache: CanonicalCache[int] = CanonicalCache(maxsize=2)
+    cache.put(_board([0]), 1)
+    cache.put(_board([1]), 2)
+    cache.get(_board([0]))
+    cache.put(_board([4]), 3)
+    assert len(cache) == 2
+    assert _board([1]) not in cache
+    assert cache.get_or_compute(_board([6]), lambda canonical: 99) == 1
+
+
+def test_searcher_table_shrinks_with_symmetry():
+    plain = NegamaxSearcher(symmetry=False)
+    reduced = NegamaxSearcher(symmetry=True)
+    assert plain.search(TicTacToe()).score == reduced.search(TicTacToe()).score
+    assert reduced.table_size * 4 < plain.table_size
+
+
+def test_symmetric_table_moves_are_legal():
+    searcher = NegamaxSearcher()
+    game = TicTacToe()
+    while game.state == GameState.PLAYING:
+        assert game.make_move(searcher.choose_move(game))
+    assert game.state == GameState.DRAW
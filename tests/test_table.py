@@ -0,0 +1,113 @@
+"""Tests for the precomputed perfect-play table asset."""
+
+from __future__ import annotations
+
+import pytest
+
+from tictactoe.ai import NegamaxSearcher, default_strategy
+from tictactoe.ai.table import (
+    GameValue,
+    PerfectPlayTable,
+    TableFormatError,
+    build_table,
+    load_default_table,
+    write_table,
+)
+from tictactoe.domain.logic import GameState, Player, TicTacToe
+from tictactoe.resources import locate_asset
+
+
+def _reachable_games():
+    seen = set()
+    frontier = [()]
+    while frontier:
+        moves = frontier.pop()
+        game = TicTacToe()
+        for move in moves:
+            game.make_move(move)
+        if game.board in seen:
+            continue
+        seen.add(game.board)
+        yield game
+        if game.state == GameState.PLAYING:
+            for position in range(9):
+                if game.board[position] is None:
+                    frontier.append(moves + (position,))
+
+
+@pytest.fixture(scope="module")
+def table():
+    loaded = load_default_table()
+    assert loaded is not None
+    return loaded
+
+
+def test_bundled_asset_is_up_to_date():
+    path = locate_asset("perfect_play.bin")
+    assert path is not None
+    assert path.read_bytes() == build_table()
+
+
+def test_empty_board_is_a_draw(table):
+    solved = table.lookup(TicTacToe().board)
+    assert solved.value == GameValue.DRAW
+    assert solved.best_moves == tuple(range(9))
+
+
+def test_table_agrees_with_search_on_every_position(table):
+    searcher = NegamaxSearcher(symmetry=True)
+    positions = 0
+    for game in _reachable_games():
+        positions += 1
+        solved = table.lookup(game.board)
+        assert solved is not None
+        if game.state != GameState.PLAYING:
+            expected = (
+                GameValue.DRAW if game.state == GameState.DRAW else GameValue.LOSS
+            )
+            assert solved.value == expected
+            assert solved.best_moves == ()
+            continue
+        result = searcher.search(game)
+        expected = (
+            GameValue.WIN
+            if result.is_win
+            else GameValue.LOSS if result.is_loss else GameValue.DRAW
+        )
+        assert solved.value == expected
+        assert result.move in solved.best_moves
+    assert positions == 5478
+
+
+def test_unreachable_positions_are_absent(table):
+    assert table.lookup((Player.X,) * 9) is None
+    with pytest.raises(ValueError):
+        table.lookup(TicTacToe(size=4).board)
+
+
+def test_table_strategy_plays_perfectly(table):
+    game = TicTacToe()
+    while game.state == GameState.PLAYING:
+        assert game.make_move(table.choose_move(game))
+    assert game.state == GameState.DRAW
+
+
+def test_default_strategy_uses_table_for_classic_board(table):
+    assert default_strategy() is table
+    assert isinstance(default_strategy(max_depth=2), NegamaxSearcher)
+    assert isinstance(default_strategy(4), NegamaxSearcher)
+
+
+def test_rejects_foreign_files(tmp_path):
+    bogus = tmp_path / "bogus.bin"
+    bogus.write_bytes(b"not a table at all")
+    with pytest.raises(TableFormatError):
+        PerfectPlayTable(bogus)
+
+
+def test_written_table_round_trips(tmp_path):
+    path = tmp_path / "table.bin"
+    size = write_table(path)
+    assert size == path.stat().st_size
+    with PerfectPlayTable(path) as table:
+        assert table.lookup(TicTacToe().board).value == GameValue.DRAW
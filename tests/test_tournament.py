@@ -0,0 +1,163 @@
+"""Tests for the tournament runner."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from tictactoe.ai import GreedyStrategy, RandomStrategy
+from tictactoe.domain.logic import TicTacToe
+from tictactoe.tournament import (
+    STRATEGIES,
+    GameRecord,
+    Standings,
+    TournamentConfig,
+    main,
+    play_game,
+    play_shard,
+    run_tournament,
+    wilson_interval,
+)
+
+CONFIG = TournamentConfig(players=("random", "greedy"), games=6, seed=11)
+
+
+class _Interrupted(Exception):
+    pass
+
+
+def test_greedy_takes_wins_and_blocks():
+    game = TicTacToe()
+    for move in (0, 3, 1):
+        game.make_move(move)
+    assert GreedyStrategy().choose_move(game) == 2  # block X's top row
+
+    game.make_move(4)
+    game.make_move(8)
+    assert GreedyStrategy().choose_move(game) == 5  # O completes middle row
+
+
+def test_minimax_on_larger_boards_is_time_budgeted():
+    config = TournamentConfig(players=("minimax", "random"), size=4, minimax_time=0.05)
+    searcher = STRATEGIES["minimax"](config, 0)
+    assert getattr(searcher, "time_budget", None) == 0.05
+
+    game = TicTacToe(size=4)
+    assert game.make_move(searcher.choose_move(game))
+
+
+def test_every_player_of_every_game_has_its_own_seed():
+    seeds = [
+        seed
+        for config in (CONFIG, TournamentConfig(players=CONFIG.players, games=6))
+        for index in range(config.total_games)
+        for seed in config.seeds_for(index)
+    ]
+    assert len(set(seeds)) == len(seeds)
+
+
+def test_play_game_reports_result_and_moves():
+    result, moves = play_game(GreedyStrategy(), RandomStrategy(seed=3))
+    assert result in ("X", "O", "D")
+    replay = TicTacToe()
+    for move in moves:
+        assert replay.make_move(move)
+    assert replay.state.name != "PLAYING"
+
+
+def test_shards_are_reproducible_regardless_of_split():
+    whole = play_shard(CONFIG, range(CONFIG.total_games))
+    split = play_shard(CONFIG, range(0, 5)) + play_shard(CONFIG, range(5, 12))
+    assert whole == split
+    assert {record.x for record in whole} == {"random", "greedy"}
+
+
+def test_records_round_trip_through_json():
+    record = GameRecord(4, "mcts", "random", "X", (4, 0, 8))
+    assert GameRecord.from_json(record.to_json()) == record
+
+
+def test_standings_merge_both_perspectives():
+    standings = Standings(("a", "b"))
+    standings.add(GameRecord(0, "a", "b", "X", ()))
+    standings.add(GameRecord(1, "b", "a", "X", ()))
+    standings.add(GameRecord(2, "a", "b", "D", ()))
+
+    tally = standings.matrix[("a", "b")]
+    assert (tally.wins, tally.draws, tally.losses) == (1, 1, 1)
+    assert standings.total("b").score == pytest.approx(0.5)
+    assert "1-1-1" in standings.format()
+
+
+def test_wilson_interval_brackets_rate():
+    low, high = wilson_interval(50, 100)
+    assert low < 0.5 < high
+    assert wilson_interval(0, 10)[0] == 0.0
+
+
+def test_checkpoint_resumes_interrupted_run(tmp_path):
+    checkpoint = tmp_path / "run.jsonl"
+
+    def stop_after_five(completed, total):
+        if completed == 5:
+            raise _Interrupted
+
+    with pytest.raises(_Interrupted):
+        run_tournament(
+            CONFIG, checkpoint=checkpoint, shard_size=4, progress=stop_after_five
+        )
+    with open(checkpoint, "a", encoding="utf-8") as handle:
+        handle.write('{"g": 7, "x"')  # torn line from a crash
+
+    played = []
+    resumed = run_tournament(
+        CONFIG, checkpoint=checkpoint, progress=lambda done, _: played.append(done)
+    )
+
+    assert played[0] == 6 and played[-1] == CONFIG.total_games
+    lines = checkpoint.read_text(encoding="utf-8").splitlines()
+    indices = [json.loads(line)["g"] for line in lines[1:]]
+    assert sorted(indices) == list(range(CONFIG.total_games))
+    assert resumed == run_tournament(CONFIG)
+
+
+def test_checkpoint_rejects_other_tournament(tmp_path):
+    checkpoint = tmp_path / "run.jsonl"
+    run_tournament(CONFIG, checkpoint=checkpoint)
+    other = TournamentConfig(players=("random", "greedy"), games=7)
+    with pytest.raises(SystemExit, match="different tournament"):
+        run_tournament(other, checkpoint=checkpoint)
+
+
+def test_process_pool_matches_inline_run():
+    assert run_tournament(CONFIG, workers=2, shard_size=3) == run_tournament(CONFIG)
+
+
+def test_tournament_frontend_is_launched_with_arguments(capsys):
+    from tictactoe.__main__ import main as launcher
+
+    result = launcher(
+        ["tournament", "--players", "random", "greedy", "--games", "2", "--quiet"]
+    )
+
+    output = capsys.readouterr().out
+    assert result == 0
+    assert "Standings" in output
+
+
+def test_tournament_needs_two_players():
+    with pytest.raises(SystemExit):
+        main(["--players", "random", "random"])
+
+
+def test_tournament_games_are_logged_for_rating(tmp_path):
+    from tictactoe.ratings import RatingStore
+
+    database = tmp_path / "ratings.db"
+    args = ["--players", "random", "greedy", "--games", "3", "--workers", "1"]
+    main([*args, "--ratings", str(database), "--quiet"])
+    with RatingStore(database) as store:
+        board = store.leaderboard()
+        assert {row.name for row in board} == {"random", "greedy"}
+        assert all(row.games == 6 for row in board)